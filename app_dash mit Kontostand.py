@@ -22,7 +22,8 @@ import dash
 # - callback: Dekorator um Funktionen als Callback zu markieren
 # - ctx: Context-Objekt um herauszufinden, welches Element geklickt wurde
 # - dash_table: Zum Erstellen von interaktiven Tabellen
-from dash import dcc, html, Input, Output, State, callback, ctx, dash_table
+# - Patch: Schickt nur Änderungen an den Browser statt der kompletten Daten
+from dash import dcc, html, Input, Output, State, callback, ctx, dash_table, Patch
 
 # DASH BOOTSTRAP COMPONENTS - Schöne, vorgefertigte UI-Komponenten
 # Bootstrap ist ein CSS-Framework für ansprechende Designs
@@ -32,37 +33,63 @@ import dash_bootstrap_components as dbc
 # graph_objects gibt uns volle Kontrolle über die Diagramm-Erstellung
 import plotly.graph_objects as go
 
-# make_subplots erlaubt mehrere Diagramme in einem Bild
-from plotly.subplots import make_subplots
-
 # YFINANCE - Yahoo Finance API zum Abrufen von Aktiendaten
 # Ermöglicht kostenlosen Zugriff auf Aktienkurse, historische Daten etc.
 import yfinance as yf
 
 # REQUESTS - Bibliothek für HTTP-Anfragen (z.B. API-Aufrufe, Webseiten abrufen)
 import requests
+# HTTPAdapter/Retry: Verbindungs-Pool und automatische Wiederholung für die Session
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # JSON - Zum Lesen und Schreiben von JSON-Dateien (ein Datenformat)
 import json
 
-# RE (Regular Expressions) - Zum Suchen von Mustern in Texten
-# Wird hier für das Parsen von RSS-Feeds verwendet
-import re
+# ORJSON - Optionale, deutlich schnellere JSON-Bibliothek (in C/Rust geschrieben)
+# Falls nicht installiert, wird automatisch das eingebaute json-Modul verwendet
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# SQLITE3 - Eingebaute SQL-Datenbank (eine einzige Datei, kein Server nötig)
+# Wird für die Transaktionshistorie verwendet
+import sqlite3
 
 # PATHLIB - Modernes Modul für Dateipfad-Operationen
 # Path macht das Arbeiten mit Dateien und Ordnern einfacher
 from pathlib import Path
 
+# OS + TEMPFILE - Für "atomares" Speichern (erst Temp-Datei, dann umbenennen)
+import os
+import tempfile
+
 # DATETIME - Zum Arbeiten mit Datum und Uhrzeit
 from datetime import datetime
 
-# UNESCAPE - Zum Dekodieren von HTML-Entities (z.B. &amp; wird zu &)
-from html import unescape
+# TIME - Für Zeitstempel (z.B. Ablaufzeit von zwischengespeicherten Kursen)
+import time
+
+# THREADING - Lock schützt gemeinsame Caches, da Dash Callbacks parallel laufen können
+import threading
+
+# THREADPOOLEXECUTOR - Mehrere Netzwerkanfragen gleichzeitig statt nacheinander
+from concurrent.futures import ThreadPoolExecutor
+
+# ELEMENTTREE + BYTESIO - XML-Parser (in C) zum Lesen von RSS-Feeds
+# iterparse liest den Feed Element für Element und kann früh aufhören
+import xml.etree.ElementTree as ET
+from io import BytesIO
 
 # PANDAS - Mächtige Bibliothek für Datenanalyse und -manipulation
 # Wird oft für Tabellen und Zeitreihen verwendet
 import pandas as pd
 
+# NUMPY - Schnelle Berechnungen auf Zahlen-Arrays (Grundlage von pandas)
+import numpy as np
+
 # ============== SENTIMENT-ANALYSE MODUL IMPORTIEREN ==============
 # Hier importieren wir Funktionen aus unserer eigenen sentiment_analysis.py Datei
 # Diese Funktionen führen KI-gestützte Analysen durch
@@ -95,16 +122,24 @@ DATA_DIR = Path(__file__).parent / "gui"
 # exist_ok=True verhindert einen Fehler, falls der Ordner schon da ist
 DATA_DIR.mkdir(exist_ok=True)
 
-# Hier definieren wir die Pfade zu unseren drei Datendateien:
-# 1. PORTFOLIO_FILE: Speichert welche Aktien der Nutzer besitzt
-PORTFOLIO_FILE = DATA_DIR / "portfolio.json"
+# Hier definieren wir die Pfade zu unseren Datendateien:
+# 1. TRANSACTIONS_DB: SQLite-Datenbank mit allen Nutzerdaten:
+#    Käufe und Verkäufe (Historie), Portfolio und Kontostand
+TRANSACTIONS_DB = DATA_DIR / "transactions.db"
 
-# 2. TRANSACTIONS_FILE: Speichert alle Käufe und Verkäufe (Historie)
+# 2. Alte JSON-Dateien - sie werden beim ersten Start automatisch in die
+#    Datenbank übernommen und bleiben danach als Sicherung liegen:
+#    - PORTFOLIO_FILE: Welche Aktien der Nutzer besitzt
+#    - TRANSACTIONS_FILE: Alle Käufe und Verkäufe
+#    - BALANCE_FILE: Der Kontostand (virtuelles Geld)
+PORTFOLIO_FILE = DATA_DIR / "portfolio.json"
 TRANSACTIONS_FILE = DATA_DIR / "transactions.json"
-
-# 3. BALANCE_FILE: Speichert den aktuellen Kontostand (virtuelles Geld)
 BALANCE_FILE = DATA_DIR / "balance.json"
 
+# 3. NAMES_FILE: Zwischenspeicher für Firmennamen (ändern sich praktisch nie,
+#    deshalb überleben sie auch einen Neustart der App)
+NAMES_FILE = DATA_DIR / "names.json"
+
 # ================================================================================
 # KONFIGURATION: MARKTÜBERSICHT-SYMBOLE
 # ================================================================================
@@ -136,65 +171,516 @@ MARKET_OVERVIEW_SYMBOLS = [
     {"name": "EUR/USD", "symbol": "EURUSD=X", "decimals": 4},  # Euro zu US-Dollar Kurs
 ]
 
+# Nachschlage-Tabelle: Name in der Marktübersicht -> Symbol-Eintrag
+# Wird einmal beim Start erstellt, damit ein Klick direkt (O(1)) zugeordnet
+# werden kann, statt alle Symbole durchzugehen
+_NAME_TO_SYMBOL = {s["name"]: s for s in MARKET_OVERVIEW_SYMBOLS}
+
 # ================================================================================
 # HILFSFUNKTIONEN: DATENVERWALTUNG (Laden & Speichern)
 # ================================================================================
 # Diese Funktionen kümmern sich um das Speichern und Laden von Daten.
-# Wir verwenden JSON-Dateien als einfache "Datenbank".
+# Portfolio und Kontostand liegen in JSON-Dateien, die Transaktionshistorie
+# in einer SQLite-Datenbank.
 # ================================================================================
 
+def _json_dumps(data, indent=False):
+    """
+    Wandelt Python-Daten in JSON um (als UTF-8-Bytes, fertig zum Schreiben).
+    
+    Verwendet orjson (falls installiert), sonst das eingebaute json-Modul.
+    orjson liefert direkt Bytes - der Umweg über einen str entfällt.
+    
+    Parameter:
+    - data: Die zu speichernden Daten (Liste, Dictionary, Zahl, ...)
+    - indent: True = schön formatiert mit 2 Leerzeichen Einrückung
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(data, indent=2 if indent else None).encode("utf-8")
+
+
+def _json_loads(text):
+    """
+    Wandelt einen JSON-String (oder Bytes) in Python-Daten um (orjson falls verfügbar).
+    
+    Wirft bei ungültigem JSON einen ValueError (beide Bibliotheken).
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+def _atomic_write_bytes(path, data):
+    """
+    Schreibt Bytes "atomar" in eine Datei.
+    
+    Problem beim direkten Schreiben: Stürzt das Programm mitten im Schreiben ab,
+    bleibt eine leere oder halbe Datei zurück - das Portfolio wäre weg.
+    
+    Lösung: Erst in eine temporäre Datei im selben Ordner schreiben und diese
+    dann mit os.replace() über die alte Datei schieben. Das Umbenennen ist
+    atomar: Danach existiert entweder die alte oder die neue Datei, nie eine halbe.
+    
+    Parameter:
+    - path: Zielpfad (Path-Objekt)
+    - data: Der zu schreibende Inhalt (bytes, z.B. von _json_dumps())
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except:
+        # Temp-Datei aufräumen und Fehler weiterreichen
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
 def load_portfolio():
     """
-    Lädt das Portfolio (Liste aller gekauften Aktien) aus der JSON-Datei.
+    Lädt das Portfolio (Liste aller gekauften Aktien) aus der Datenbank.
     
-    Funktionsweise:
-    1. Prüft, ob die Datei existiert
-    2. Wenn ja: Liest den Inhalt und wandelt JSON in Python-Liste um
-    3. Wenn nein oder Fehler: Gibt eine leere Liste zurück
+    Die Reihenfolge (Spalte "pos") entspricht der Liste im Browser -
+    die Kauf-/Verkauf-Callbacks ändern Positionen per Index (Patch).
     
     Rückgabe: Eine Liste von Dictionaries, z.B.:
-    [{"symbol": "AAPL", "qty": 10, "buy_price": 150.0}, ...]
+    [{"symbol": "AAPL", "qty": 10, "buy_price": 150.0, "avg_price": 150.0}, ...]
+    Bei Fehlern: Leere Liste
     """
-    # Prüfe ob die Datei existiert
-    if PORTFOLIO_FILE.exists():
+    try:
+        cur = get_db().execute("SELECT symbol, qty, buy_price, avg_price FROM portfolio ORDER BY pos")
+        return [dict(r) for r in cur]
+    except sqlite3.Error:
+        return []
+
+
+def _write_portfolio(conn, data):
+    """
+    Schreibt das Portfolio in die Datenbank (ohne commit).
+    
+    Parameter:
+    - conn: SQLite-Verbindung
+    - data: Liste von Dictionaries mit den Portfolio-Positionen
+    
+    Das Portfolio hat nur wenige Zeilen (eine pro Aktie), deshalb wird
+    es einfach komplett ersetzt - unabhängig von der Länge der Historie.
+    """
+    conn.execute("DELETE FROM portfolio")
+    conn.executemany(
+        "INSERT INTO portfolio (symbol, qty, buy_price, avg_price, pos) VALUES (?, ?, ?, ?, ?)",
+        [
+            (item["symbol"], item["qty"], item.get("buy_price") or item.get("avg_price", 0),
+             item.get("avg_price") or item.get("buy_price", 0), pos)
+            for pos, item in enumerate(data)
+        ]
+    )
+
+
+def find_position(portfolio, symbol):
+    """
+    Sucht die Position einer Aktie in der Portfolio-Liste.
+    
+    Parameter:
+    - portfolio: Liste von Dictionaries (wie von load_portfolio())
+    - symbol: Das gesuchte Aktien-Symbol
+    
+    Rückgabe: Index in der Liste oder None, wenn die Aktie fehlt
+    
+    Die Suche stoppt beim ersten Treffer. Das Portfolio kommt bei jedem Kauf
+    oder Verkauf frisch aus dem Store - ein vorab gebautes Verzeichnis
+    (Symbol -> Position) müsste dafür jedes Mal komplett neu erstellt werden.
+    """
+    return next((i for i, item in enumerate(portfolio) if item["symbol"] == symbol), None)
+
+
+# ============== TRANSAKTIONS-DATENBANK (SQLite) ==============
+# Früher wurde bei jeder Transaktion die komplette JSON-Datei gelesen und neu
+# geschrieben. Bei langer Historie wird das immer langsamer (O(N) pro Kauf).
+# SQLite hängt neue Zeilen einfach an, und Filter (Jahr/Monat/Typ) sowie
+# Summen werden direkt von der Datenbank berechnet.
+#
+# WAL (Write-Ahead-Log): Schreiben blockiert das Lesen nicht mehr,
+# synchronous=NORMAL spart unnötige fsync-Aufrufe (im WAL-Modus sicher).
+
+# SQLite-Verbindungen dürfen nicht zwischen Threads geteilt werden,
+# deshalb bekommt jeder Thread (Dash-Worker) seine eigene Verbindung
+_db_local = threading.local()
+
+
+def get_db():
+    """
+    Liefert die SQLite-Verbindung des aktuellen Threads (wird bei Bedarf erstellt).
+    
+    Rückgabe: sqlite3.Connection
+    """
+    conn = getattr(_db_local, "conn", None)
+    if conn is None:
+        conn = sqlite3.connect(TRANSACTIONS_DB)
+        # Zeilen wie Dictionaries ansprechen: row["symbol"]
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        _db_local.conn = conn
+    return conn
+
+
+def init_db():
+    """
+    Legt Tabellen und Index an und übernimmt einmalig die alten JSON-Dateien
+    (transactions.json, portfolio.json, balance.json).
+    
+    Die Historie wird übernommen, wenn die Tabelle noch leer ist.
+    Portfolio und Kontostand nur einmal (gemerkt in PRAGMA user_version) -
+    ein später leer verkauftes Portfolio darf nicht wieder auftauchen.
+    Die JSON-Dateien bleiben als Sicherung liegen.
+    """
+    conn = get_db()
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS transactions (
+            ts     TEXT    NOT NULL,   -- Zeitpunkt im ISO-Format
+            type   TEXT    NOT NULL,   -- "buy" oder "sell"
+            symbol TEXT    NOT NULL,
+            qty    INTEGER NOT NULL,
+            price  REAL    NOT NULL
+        )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_transactions ON transactions (ts, symbol, type)")
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS portfolio (
+            symbol    TEXT    PRIMARY KEY,
+            qty       INTEGER NOT NULL,
+            buy_price REAL    NOT NULL,   -- Durchschnittlicher Kaufpreis
+            avg_price REAL    NOT NULL,   -- (gleicher Wert, älterer Feldname)
+            pos       INTEGER NOT NULL    -- Reihenfolge wie in der Liste
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS balance (
+            id    INTEGER PRIMARY KEY CHECK (id = 1),   -- Genau eine Zeile
+            value REAL    NOT NULL
+        )
+    """)
+    
+    # Einmalige Migration aus der alten JSON-Datei
+    empty = conn.execute("SELECT COUNT(*) FROM transactions").fetchone()[0] == 0
+    if empty and TRANSACTIONS_FILE.exists():
         try:
-            # Lese die Datei und parse den JSON-Inhalt
-            # encoding="utf-8" stellt sicher, dass Sonderzeichen korrekt gelesen werden
-            return json.loads(PORTFOLIO_FILE.read_text(encoding="utf-8"))
+            txs = _json_loads(TRANSACTIONS_FILE.read_bytes())
+            conn.executemany(
+                "INSERT INTO transactions (ts, type, symbol, qty, price) VALUES (?, ?, ?, ?, ?)",
+                [(t["timestamp"], t["type"], t["symbol"], t["qty"], t["price"]) for t in txs]
+            )
         except:
-            # Bei Fehlern (z.B. ungültiges JSON) gebe leere Liste zurück
-            return []
-    # Wenn Datei nicht existiert, gebe leere Liste zurück
-    return []
+            # Defekte Datei: Mit leerer Historie weitermachen
+            pass
+    
+    # user_version 0 = Portfolio und Kontostand liegen noch in den JSON-Dateien
+    if conn.execute("PRAGMA user_version").fetchone()[0] == 0:
+        if PORTFOLIO_FILE.exists():
+            try:
+                _write_portfolio(conn, _json_loads(PORTFOLIO_FILE.read_bytes()))
+            except:
+                # Defekte Datei: Mit leerem Portfolio weitermachen
+                pass
+        if BALANCE_FILE.exists():
+            try:
+                _write_balance(conn, float(_json_loads(BALANCE_FILE.read_bytes())))
+            except:
+                # Defekte Datei: load_balance() liefert den Startwert
+                pass
+        conn.execute("PRAGMA user_version = 1")
+    conn.commit()
 
 
-def save_portfolio(data):
+def _tx_filter(year=None, month=None, tx_type=None):
     """
-    Speichert das Portfolio in die JSON-Datei.
+    Baut die WHERE-Bedingung für die Transaktions-Filter.
     
     Parameter:
-    - data: Liste von Dictionaries mit den Portfolio-Positionen
+    - year, month, tx_type: Filterwerte aus den Dropdowns ("all" = kein Filter)
     
-    Die Funktion wandelt die Python-Liste in JSON-Format um und speichert sie.
-    indent=2 macht die Datei menschenlesbar (schön formatiert).
+    Rückgabe: (where_sql, parameter) - z.B. ("WHERE type = ?", ["buy"])
     """
-    PORTFOLIO_FILE.write_text(json.dumps(data, indent=2), encoding="utf-8")
+    clauses, params = [], []
+    if year and year != "all":
+        # Bereichsabfrage auf dem ISO-Zeitstempel kann den Index nutzen
+        clauses.append("ts >= ? AND ts < ?")
+        params += [f"{int(year)}-", f"{int(year) + 1}-"]
+    if month and month != "all":
+        # Zeichen 6-7 des ISO-Zeitstempels sind der Monat ("2024-01-...")
+        clauses.append("substr(ts, 6, 2) = ?")
+        params.append(f"{int(month):02d}")
+    if tx_type and tx_type != "all":
+        clauses.append("type = ?")
+        params.append(tx_type)
+    where = ("WHERE " + " AND ".join(clauses)) if clauses else ""
+    return where, params
 
 
-def load_transactions():
+def load_transactions(year=None, month=None, tx_type=None):
     """
-    Lädt alle Transaktionen (Käufe und Verkäufe) aus der JSON-Datei.
+    Lädt Transaktionen (Käufe und Verkäufe) aus der Datenbank.
+    
+    Parameter (optional):
+    - year: Jahr als String (z.B. "2024") oder "all"
+    - month: Monat als String ("1" bis "12") oder "all"
+    - tx_type: "buy", "sell" oder "all"
     
-    Rückgabe: Eine Liste aller vergangenen Transaktionen, z.B.:
+    Rückgabe: Liste der Transaktionen (neueste zuerst), z.B.:
     [{"timestamp": "2024-01-15T10:30:00", "type": "buy", "symbol": "AAPL", 
       "qty": 5, "price": 150.0}, ...]
     """
-    if TRANSACTIONS_FILE.exists():
-        try:
-            return json.loads(TRANSACTIONS_FILE.read_text(encoding="utf-8"))
-        except:
-            return []
-    return []
+    where, params = _tx_filter(year, month, tx_type)
+    try:
+        cur = get_db().execute(
+            f"SELECT ts, type, symbol, qty, price FROM transactions {where} ORDER BY ts DESC",
+            params
+        )
+        return [{"timestamp": r["ts"], "type": r["type"], "symbol": r["symbol"],
+                 "qty": r["qty"], "price": r["price"]} for r in cur]
+    except sqlite3.Error:
+        return []
+
+
+# ============== CACHE FÜR DIE TRANSAKTIONSANSICHT ==============
+# Das Transaktions-Modal fragt bei jedem Öffnen und jeder Filteränderung
+# dieselben Daten ab. Solange keine neue Transaktion dazukommt, ändern sich
+# Jahresliste und Tabellenzeilen nicht - also einmal berechnen und merken.
+# save_transaction() und save_trade() leeren den Cache.
+# Jede Filter-/Sortier-/Seiten-Kombination ist ein eigener Eintrag - damit
+# Tippen in der Filterzeile den Cache nicht endlos wachsen lässt, ist er begrenzt.
+TX_VIEW_MAXSIZE = 256
+_TX_CACHE = {"years": None, "views": {}}
+_TX_CACHE_LOCK = threading.Lock()
+
+
+def _invalidate_tx_cache():
+    """Verwirft alle zwischengespeicherten Transaktionsansichten."""
+    with _TX_CACHE_LOCK:
+        _TX_CACHE["years"] = None
+        _TX_CACHE["views"].clear()
+
+
+def _tx_view_set(key, value):
+    """
+    Merkt sich eine berechnete Ansicht (Summen oder Tabellenseite).
+    
+    Ist der Cache voll, fliegt der älteste Eintrag raus (wie bei _cache_set).
+    """
+    with _TX_CACHE_LOCK:
+        views = _TX_CACHE["views"]
+        views.pop(key, None)
+        if len(views) >= TX_VIEW_MAXSIZE:
+            views.pop(next(iter(views)))
+        views[key] = value
+
+
+def transaction_years():
+    """
+    Gibt alle Jahre zurück, in denen Transaktionen vorhanden sind (neueste zuerst).
+    """
+    with _TX_CACHE_LOCK:
+        if _TX_CACHE["years"] is not None:
+            return _TX_CACHE["years"]
+    try:
+        cur = get_db().execute("SELECT DISTINCT substr(ts, 1, 4) AS y FROM transactions ORDER BY y DESC")
+        years = [int(r["y"]) for r in cur]
+    except sqlite3.Error:
+        return []
+    with _TX_CACHE_LOCK:
+        _TX_CACHE["years"] = years
+    return years
+
+
+# Anzahl Zeilen pro Tabellenseite - nur so viele werden an den Browser geschickt
+TX_PAGE_SIZE = 50
+
+# Tabellenspalten -> SQL-Ausdruck (Whitelist für Filter und Sortierung,
+# Spaltennamen aus dem Browser landen so nie direkt im SQL)
+_TX_COLUMN_SQL = {
+    "Datum": "strftime('%d.%m.%Y', ts)",
+    "Zeit": "strftime('%H:%M', ts)",
+    "Typ": "CASE type WHEN 'buy' THEN 'Kauf' ELSE 'Verkauf' END",
+    "Symbol": "symbol",
+    "Menge": "qty",
+    "Kurs": "price",
+    "Gesamt": "qty * price",
+}
+# Beim Sortieren nach Datum den ISO-Zeitstempel nehmen ("15.01." < "16.12." wäre falsch)
+_TX_SORT_SQL = {**_TX_COLUMN_SQL, "Datum": "ts"}
+
+# Operatoren der DataTable-Filterzeile -> SQL
+# Reihenfolge wichtig: ">=" muss vor ">" geprüft werden
+_TX_FILTER_OPERATORS = [
+    (["ge ", ">="], ">="), (["le ", "<="], "<="), (["lt ", "<"], "<"), (["gt ", ">"], ">"),
+    (["ne ", "!="], "!="), (["eq ", "="], "="), (["contains "], "contains"),
+    (["datestartswith "], "datestartswith"),
+]
+
+
+def _tx_table_filter(filter_query):
+    """
+    Übersetzt die Filterzeile der DataTable in SQL-Bedingungen.
+    
+    Parameter:
+    - filter_query: Filter-String der DataTable, z.B. '{Symbol} contains "AAPL" && {Menge} > 5'
+    
+    Rückgabe: (clauses, params) - Liste von SQL-Bedingungen und deren Parameter
+    Unbekannte Spalten oder Operatoren werden ignoriert.
+    """
+    clauses, params = [], []
+    for part in (filter_query or "").split(" && "):
+        # Aufbau: {Spalte} operator wert - der Operator steht direkt nach der Spalte
+        # (nicht irgendwo im Wert suchen: "{Symbol} contains le " ist kein "le")
+        start = part.find("{")
+        end = part.find("}", start + 1)
+        if start < 0 or end < 0:
+            continue
+        expr = _TX_COLUMN_SQL.get(part[start + 1:end])
+        rest = part[end + 1:].lstrip()
+        for tokens, op in _TX_FILTER_OPERATORS:
+            token = next((t for t in tokens if rest.startswith(t)), None)
+            if token is None:
+                continue
+            value = rest[len(token):].strip()
+            if expr is None or not value:
+                break
+            # Wert in Anführungszeichen -> Text, sonst (bei Vergleichen) wenn möglich Zahl
+            if value[0] == value[-1] and value[0] in ("'", '"', "`") and len(value) > 1:
+                value = value[1:-1].replace("\\" + value[0], value[0])
+            elif op not in ("contains", "datestartswith"):
+                try:
+                    value = float(value)
+                except ValueError:
+                    pass
+            if op in ("contains", "datestartswith"):
+                # % und _ sind bei LIKE Platzhalter - im Suchtext wörtlich nehmen
+                value = str(value).replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+                clauses.append(f"CAST({expr} AS TEXT) LIKE ? ESCAPE '\\'")
+                params.append(f"%{value}%" if op == "contains" else f"{value}%")
+            else:
+                clauses.append(f"{expr} {op} ?")
+                params.append(value)
+            break
+    return clauses, params
+
+
+def _format_tx_rows(df):
+    """
+    Formatiert Transaktionen (DataFrame aus SQLite) als Tabellenzeilen.
+    
+    Alle Spalten werden auf einmal berechnet (vektorisiert, keine Schleife).
+    Datum und Uhrzeit stehen an festen Stellen im ISO-Zeitstempel
+    ("2024-01-15T10:30:00") - Ausschneiden ist schneller als Parsen.
+    """
+    ts = df["ts"].astype(str)
+    table = pd.DataFrame({
+        "Datum": ts.str[8:10] + "." + ts.str[5:7] + "." + ts.str[:4],
+        "Zeit": ts.str[11:16],
+        "Typ": (df["type"] == "buy").map({True: "Kauf", False: "Verkauf"}),
+        "Symbol": df["symbol"],
+        "Menge": df["qty"],
+        "Kurs": df["price"].map("{:.2f}".format),
+        "Gesamt": (df["qty"] * df["price"]).map("{:.2f}".format),
+    })
+    return table.to_dict("records")
+
+
+def get_transaction_totals(year=None, month=None, tx_type=None):
+    """
+    Liefert Anzahl und Summen der Transaktionen für einen Filter.
+    
+    Die Datenbank rechnet die Summen selbst (GROUP BY) - es werden keine
+    einzelnen Zeilen nach Python geladen. Ergebnis wird bis zur nächsten
+    Transaktion zwischengespeichert.
+    
+    Parameter:
+    - year, month, tx_type: Filterwerte aus den Dropdowns ("all" = kein Filter)
+    
+    Rückgabe: {"count": ..., "buy": ..., "sell": ...}
+    """
+    key = ("totals", year or "all", month or "all", tx_type or "all")
+    with _TX_CACHE_LOCK:
+        totals = _TX_CACHE["views"].get(key)
+    if totals is not None:
+        return totals
+    
+    where, params = _tx_filter(year, month, tx_type)
+    totals = {"count": 0, "buy": 0.0, "sell": 0.0}
+    try:
+        cur = get_db().execute(
+            f"SELECT type, COUNT(*) AS n, SUM(qty * price) AS total FROM transactions {where} GROUP BY type",
+            params
+        )
+        for r in cur:
+            totals["count"] += r["n"]
+            if r["type"] in ("buy", "sell"):
+                totals[r["type"]] = float(r["total"] or 0.0)
+    except sqlite3.Error:
+        pass
+    _tx_view_set(key, totals)
+    return totals
+
+
+def get_transaction_page(year=None, month=None, tx_type=None,
+                         page_current=0, sort_by=None, filter_query=""):
+    """
+    Liefert EINE Seite der Transaktionstabelle (Backend-Pagination).
+    
+    Statt alle Transaktionen an den Browser zu schicken, holt die Datenbank
+    nur die sichtbaren TX_PAGE_SIZE Zeilen (LIMIT/OFFSET). Sortierung und
+    Filterzeile der Tabelle werden ebenfalls in SQL übersetzt.
+    
+    Parameter:
+    - year, month, tx_type: Filterwerte aus den Dropdowns ("all" = kein Filter)
+    - page_current: Seitennummer (0 = erste Seite)
+    - sort_by: Sortierung der DataTable, z.B. [{"column_id": "Kurs", "direction": "asc"}]
+    - filter_query: Filterzeile der DataTable
+    
+    Rückgabe: (rows, page_count)
+    - rows: Liste von Dictionaries für die DataTable
+    - page_count: Anzahl Seiten für die aktuelle Filterung
+    """
+    sort_by = sort_by or []
+    key = ("page", year or "all", month or "all", tx_type or "all", page_current or 0,
+           tuple((s.get("column_id"), s.get("direction")) for s in sort_by), filter_query or "")
+    with _TX_CACHE_LOCK:
+        page = _TX_CACHE["views"].get(key)
+    if page is not None:
+        return page
+    
+    # WHERE aus Dropdowns + Filterzeile zusammensetzen
+    where, params = _tx_filter(year, month, tx_type)
+    clauses, filter_params = _tx_table_filter(filter_query)
+    if clauses:
+        where = (where + " AND " if where else "WHERE ") + " AND ".join(clauses)
+        params = params + filter_params
+    
+    # ORDER BY aus der Tabellensortierung (Standard: neueste zuerst)
+    order = [f"{_TX_SORT_SQL[s['column_id']]} {'DESC' if s.get('direction') == 'desc' else 'ASC'}"
+             for s in sort_by if s.get("column_id") in _TX_SORT_SQL]
+    order_sql = ", ".join(order + ["ts DESC"])
+    
+    offset = (page_current or 0) * TX_PAGE_SIZE
+    try:
+        conn = get_db()
+        count = conn.execute(f"SELECT COUNT(*) FROM transactions {where}", params).fetchone()[0]
+        df = pd.read_sql_query(
+            f"SELECT ts, type, symbol, qty, price FROM transactions {where} "
+            f"ORDER BY {order_sql} LIMIT ? OFFSET ?",
+            conn, params=params + [TX_PAGE_SIZE, offset]
+        )
+    except (sqlite3.Error, pd.errors.DatabaseError):
+        count = 0
+        df = pd.DataFrame(columns=["ts", "type", "symbol", "qty", "price"])
+    
+    page = (_format_tx_rows(df), max(1, -(-count // TX_PAGE_SIZE)))
+    _tx_view_set(key, page)
+    return page
 
 
 def save_transaction(tx):
@@ -206,15 +692,54 @@ def save_transaction(tx):
           {"timestamp": "...", "type": "buy/sell", "symbol": "...", 
            "qty": Anzahl, "price": Preis}
     
-    Die Funktion lädt erst alle bestehenden Transaktionen,
-    fügt die neue hinzu und speichert dann alles.
+    Ein einzelnes INSERT - die bestehende Historie wird nicht neu geschrieben.
+    """
+    conn = get_db()
+    with conn:
+        _insert_transaction(conn, tx)
+    # Neue Transaktion -> zwischengespeicherte Ansichten sind veraltet
+    _invalidate_tx_cache()
+
+
+def _insert_transaction(conn, tx):
+    """Fügt eine Transaktion ein (ohne commit)."""
+    conn.execute(
+        "INSERT INTO transactions (ts, type, symbol, qty, price) VALUES (?, ?, ?, ?, ?)",
+        (tx["timestamp"], tx["type"], tx["symbol"], tx["qty"], tx["price"])
+    )
+
+
+def save_trade(portfolio, tx, balance):
+    """
+    Speichert einen Kauf oder Verkauf komplett in EINER Datenbank-Transaktion.
+    
+    Parameter:
+    - portfolio: Das neue Portfolio (Liste von Dictionaries)
+    - tx: Die Transaktion (wie bei save_transaction)
+    - balance: Der neue Kontostand
+    
+    Portfolio, Historie und Kontostand passen so immer zusammen: Bricht das
+    Speichern ab, bleibt alles auf dem alten Stand (statt z.B. Aktien im
+    Portfolio, aber Geld nicht abgebucht).
     """
-    # Lade bestehende Transaktionen
-    txs = load_transactions()
-    # Füge neue Transaktion hinzu
-    txs.append(tx)
-    # Speichere alle Transaktionen
-    TRANSACTIONS_FILE.write_text(json.dumps(txs, indent=2), encoding="utf-8")
+    conn = get_db()
+    with conn:
+        _write_portfolio(conn, portfolio)
+        _insert_transaction(conn, tx)
+        _write_balance(conn, balance)
+    _BALANCE_CACHE["value"] = float(balance)
+    _invalidate_tx_cache()
+
+
+# Kontostand im Arbeitsspeicher: Nur diese App schreibt ihn (über
+# save_balance/save_trade), deshalb muss er nur beim ersten Zugriff gelesen werden.
+# None = noch nicht geladen
+_BALANCE_CACHE = {"value": None}
+
+
+def _write_balance(conn, balance):
+    """Schreibt den Kontostand in die Datenbank (ohne commit)."""
+    conn.execute("INSERT OR REPLACE INTO balance (id, value) VALUES (1, ?)", (float(balance),))
 
 
 def load_balance():
@@ -222,28 +747,48 @@ def load_balance():
     Lädt den aktuellen Kontostand (virtuelles Geld zum Handeln).
     
     Rückgabe: Der Kontostand als Float (Dezimalzahl)
-    Standardwert: 10000.0 USD (wenn keine Datei existiert)
+    Standardwert: 10000.0 USD (wenn noch kein Kontostand gespeichert ist)
     
     Der Nutzer startet also mit 10.000$ virtuellem Geld.
+    
+    Die Datenbank wird nur beim ersten Aufruf gelesen, danach kommt der Wert
+    aus dem Arbeitsspeicher (save_balance/save_trade halten ihn aktuell).
     """
-    if BALANCE_FILE.exists():
-        try:
-            return float(json.loads(BALANCE_FILE.read_text(encoding="utf-8")))
-        except:
-            # Bei Fehlern: Standardwert zurückgeben
-            return 10000.0
-    # Wenn keine Datei existiert: Startwert 10.000$
-    return 10000.0
+    cached = _BALANCE_CACHE["value"]
+    if cached is not None:
+        return cached
+    
+    # Noch nichts gespeichert: Startwert 10.000$
+    balance = 10000.0
+    try:
+        row = get_db().execute("SELECT value FROM balance WHERE id = 1").fetchone()
+        if row is not None:
+            balance = float(row["value"])
+    except sqlite3.Error:
+        # Bei Fehlern: Standardwert verwenden
+        pass
+    _BALANCE_CACHE["value"] = balance
+    return balance
 
 
 def save_balance(balance):
     """
-    Speichert den aktuellen Kontostand in die JSON-Datei.
+    Speichert den aktuellen Kontostand in die Datenbank.
     
     Parameter:
     - balance: Der neue Kontostand als Zahl (int oder float)
+    
+    Erst speichern, dann den Wert im Arbeitsspeicher ersetzen -
+    schlägt das Schreiben fehl, bleibt der alte (gespeicherte) Stand gültig.
     """
-    BALANCE_FILE.write_text(json.dumps(balance), encoding="utf-8")
+    conn = get_db()
+    with conn:
+        _write_balance(conn, balance)
+    _BALANCE_CACHE["value"] = float(balance)
+
+
+# Datenbank beim Start vorbereiten (Tabellen anlegen, ggf. JSON übernehmen)
+init_db()
 
 # ================================================================================
 # HILFSFUNKTIONEN: AKTIENDATEN VON YAHOO FINANCE ABRUFEN
@@ -252,6 +797,123 @@ def save_balance(balance):
 # yfinance ist eine kostenlose Bibliothek für den Zugriff auf Finanzdaten.
 # ================================================================================
 
+# ============== GEMEINSAME HTTP-SESSION ==============
+# requests.get() baut für jede Anfrage eine neue Verbindung auf
+# (TCP + TLS-Handshake, oft ~100ms). Eine Session hält die Verbindungen
+# offen (Keep-Alive) und verwendet sie für weitere Anfragen wieder.
+# - HTTPAdapter: Verbindungs-Pool (mehrere Callbacks gleichzeitig möglich)
+# - Retry: Kurze Netzwerkfehler werden automatisch wiederholt
+# - User-Agent wird einmal für alle Anfragen gesetzt
+_HTTP_SESSION = requests.Session()
+_HTTP_SESSION.headers.update({"User-Agent": "Mozilla/5.0"})
+_HTTP_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=16,
+    max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=[502, 503, 504]),
+))
+
+# ============== CACHE FÜR KURSDATEN ==============
+# Jeder Aufruf von Yahoo Finance ist eine HTTP-Anfrage (oft mehrere 100ms).
+# Wird dieselbe Aktie kurz hintereinander abgefragt (z.B. mehrfacher Klick),
+# liefern wir das Ergebnis aus dem Arbeitsspeicher statt erneut anzufragen.
+#
+# Aufbau der Caches: {schlüssel: (zeitstempel, wert)}
+# - PRICE_CACHE_TTL: Wie lange (Sekunden) ein Kurs gültig bleibt
+# - CACHE_MAXSIZE: Maximale Anzahl Einträge (älteste fliegen zuerst raus)
+# - SEARCH_CACHE_TTL: Wie lange ein Suchergebnis gültig bleibt
+# - HISTORY_CACHE_TTL: Wie lange historische Kursdaten gültig bleiben
+# - NAME_CACHE_TTL: Wie lange ein Firmenname gültig bleibt (1 Tag)
+# - NEWS_CACHE_TTL: Wie lange eine News-Liste gültig bleibt
+PRICE_CACHE_TTL = 30
+SEARCH_CACHE_TTL = 300
+HISTORY_CACHE_TTL = 300
+NAME_CACHE_TTL = 86400
+NEWS_CACHE_TTL = 300
+CACHE_MAXSIZE = 1024
+
+_PRICE_CACHE = {}    # symbol -> (zeitstempel, (preis, vortag))
+_TICKER_CACHE = {}   # symbol -> (zeitstempel, (ticker, fast_info))
+_SEARCH_CACHE = {}   # suchbegriff -> (zeitstempel, ergebnisliste)
+_SEARCH_PENDING = {} # suchbegriff -> threading.Event (Anfrage läuft gerade)
+_CHART_CACHE = {}    # (symbol, zeitraum, intervall) -> (zeitstempel, figure-dict)
+_HISTORY_CACHE = {}  # (symbol, zeitraum, intervall) -> (zeitstempel, DataFrame)
+_NAME_CACHE = {}     # symbol -> (zeitstempel, firmenname)
+_NEWS_CACHE = {}     # (suchbegriff, limit) -> (zeitstempel, news-liste)
+
+# Dash kann Callbacks in mehreren Threads gleichzeitig ausführen,
+# deshalb wird jeder Zugriff auf die Caches mit einem Lock geschützt
+_CACHE_LOCK = threading.Lock()
+
+
+def _cache_get(cache, key, ttl):
+    """
+    Liest einen Wert aus einem Cache, solange er nicht abgelaufen ist.
+    
+    Parameter:
+    - cache: Das Cache-Dictionary
+    - key: Der Schlüssel (z.B. das Symbol)
+    - ttl: Gültigkeitsdauer in Sekunden
+    
+    Rückgabe: Der gespeicherte Wert oder None (nicht vorhanden/abgelaufen)
+    """
+    with _CACHE_LOCK:
+        entry = cache.get(key)
+        if entry is None:
+            return None
+        stamp, value = entry
+        if time.monotonic() - stamp > ttl:
+            # Abgelaufen -> Eintrag entfernen
+            del cache[key]
+            return None
+        return value
+
+
+def _cache_set(cache, key, value, maxsize=CACHE_MAXSIZE):
+    """
+    Speichert einen Wert mit aktuellem Zeitstempel im Cache.
+    
+    Ist der Cache voll, wird der älteste Eintrag entfernt
+    (Dictionaries behalten die Einfügereihenfolge bei).
+    """
+    with _CACHE_LOCK:
+        cache.pop(key, None)
+        if len(cache) >= maxsize:
+            cache.pop(next(iter(cache)))
+        cache[key] = (time.monotonic(), value)
+
+
+def invalidate_price(symbol):
+    """
+    Entfernt den zwischengespeicherten Kurs (und das Ticker-Objekt) eines Symbols.
+    
+    Wird nach einem Kauf/Verkauf aufgerufen: Die Portfolio-Ansicht soll für die
+    gehandelte Aktie den aktuellen Kurs zeigen, nicht einen bis zu
+    PRICE_CACHE_TTL Sekunden alten. Alle anderen Symbole bleiben im Cache.
+    """
+    with _CACHE_LOCK:
+        _PRICE_CACHE.pop(symbol, None)
+        _TICKER_CACHE.pop(symbol, None)
+
+
+def _get_ticker(symbol):
+    """
+    Liefert ein (zwischengespeichertes) yfinance Ticker-Objekt samt fast_info.
+    
+    fast_info lädt seine Werte beim ersten Zugriff und merkt sie sich danach.
+    Deshalb wird das Paar nur PRICE_CACHE_TTL Sekunden wiederverwendet,
+    damit Kurs, High/Low und Volumen nicht veralten.
+    
+    Rückgabe: Tuple (ticker, fast_info) - fast_info kann None sein
+    """
+    cached = _cache_get(_TICKER_CACHE, symbol, PRICE_CACHE_TTL)
+    if cached is not None:
+        return cached
+    t = yf.Ticker(symbol)
+    fast = getattr(t, "fast_info", None)
+    _cache_set(_TICKER_CACHE, symbol, (t, fast))
+    return t, fast
+
+
 def fetch_price(symbol):
     """
     Ruft den aktuellen Kurs und den Schlusskurs des Vortags für eine Aktie ab.
@@ -263,19 +925,27 @@ def fetch_price(symbol):
               Beide Werte können None sein, wenn keine Daten verfügbar sind.
     
     Beispiel: fetch_price("AAPL") könnte (175.50, 174.20) zurückgeben
+    
+    Ergebnisse werden PRICE_CACHE_TTL Sekunden zwischengespeichert.
     """
+    # Zuerst im Cache nachsehen (spart die Anfrage an Yahoo Finance)
+    cached = _cache_get(_PRICE_CACHE, symbol, PRICE_CACHE_TTL)
+    if cached is not None:
+        return cached
+    
     try:
-        # Erstelle ein Ticker-Objekt für das Symbol
+        # Hole das Ticker-Objekt für das Symbol (aus dem Cache oder neu)
         # Ein Ticker ist wie ein "Handle" für alle Daten zu einer Aktie
-        t = yf.Ticker(symbol)
-        
         # fast_info enthält schnell abrufbare Basisdaten
-        fast = getattr(t, "fast_info", None)
+        _, fast = _get_ticker(symbol)
         
         if fast:
             # Hole letzten Preis und vorherigen Schlusskurs
             price = getattr(fast, "last_price", None)
             prev = getattr(fast, "previous_close", None)
+            # Nur gültige Kurse merken, Fehler sollen erneut versucht werden
+            if price is not None:
+                _cache_set(_PRICE_CACHE, symbol, (price, prev))
             return price, prev
     except:
         # Bei Netzwerkfehlern oder ungültigen Symbolen: None zurückgeben
@@ -283,6 +953,99 @@ def fetch_price(symbol):
     return None, None
 
 
+def fetch_prices(symbols, refresh=False):
+    """
+    Ruft aktuelle Kurse und Vortagesschlusskurse für MEHRERE Symbole auf einmal ab.
+    
+    Statt für jedes Symbol eine eigene Anfrage zu stellen (nacheinander!),
+    holt yf.download() die Tageskurse aller Symbole in einem Aufruf
+    (intern parallel mit threads=True).
+    
+    Parameter:
+    - symbols: Liste von Börsensymbolen, z.B. ["^GDAXI", "^DJI", "BTC-USD"]
+    - refresh: True = Cache überspringen und alle Kurse neu abfragen
+    
+    Rückgabe: Dictionary {symbol: (aktueller_preis, vorheriger_schlusskurs)}
+              Symbole ohne Daten werden einzeln über fetch_price() nachgeladen.
+    
+    Die Ergebnisse landen im selben Cache wie bei fetch_price(),
+    ein anschließender fetch_price()-Aufruf braucht also keine Anfrage mehr.
+    """
+    result = {}
+    missing = []
+    
+    # Zuerst im Cache nachsehen - nur fehlende Symbole abfragen
+    for sym in symbols:
+        cached = None if refresh else _cache_get(_PRICE_CACHE, sym, PRICE_CACHE_TTL)
+        if cached is not None:
+            result[sym] = cached
+        else:
+            missing.append(sym)
+    
+    if missing:
+        try:
+            # period="5d": Damit auch am Montag/nach Feiertagen ein Vortag dabei ist
+            data = yf.download(
+                tickers=" ".join(missing), period="5d", interval="1d",
+                group_by="ticker", threads=True, progress=False, auto_adjust=False
+            )
+        except:
+            data = None
+        
+        for sym in missing:
+            try:
+                closes = data[sym]["Close"].dropna()
+                price = float(closes.iloc[-1])
+                prev = float(closes.iloc[-2]) if len(closes) > 1 else None
+                _cache_set(_PRICE_CACHE, sym, (price, prev))
+                result[sym] = (price, prev)
+            except:
+                # Keine Daten im Sammelabruf -> einzeln versuchen
+                result[sym] = fetch_price(sym)
+    
+    return result
+
+
+def _load_names():
+    """
+    Lädt die gespeicherten Firmennamen aus NAMES_FILE in den Namens-Cache.
+    
+    In der Datei steht pro Symbol [unix_zeit, name]. Der Cache rechnet mit
+    time.monotonic(), deshalb wird das Alter des Eintrags umgerechnet.
+    Abgelaufene Einträge werden gar nicht erst übernommen.
+    """
+    if not NAMES_FILE.exists():
+        return
+    try:
+        stored = _json_loads(NAMES_FILE.read_bytes())
+    except:
+        return
+    now_wall, now_mono = time.time(), time.monotonic()
+    with _CACHE_LOCK:
+        for symbol, (saved_at, name) in stored.items():
+            age = now_wall - saved_at
+            if 0 <= age < NAME_CACHE_TTL:
+                _NAME_CACHE[symbol] = (now_mono - age, name)
+
+
+def _save_names():
+    """
+    Schreibt den Namens-Cache nach NAMES_FILE (Alter wieder als Unix-Zeit).
+    """
+    now_wall, now_mono = time.time(), time.monotonic()
+    with _CACHE_LOCK:
+        data = {symbol: [now_wall - (now_mono - stamp), name]
+                for symbol, (stamp, name) in _NAME_CACHE.items()}
+    try:
+        _atomic_write_bytes(NAMES_FILE, _json_dumps(data))
+    except:
+        # Der Cache ist nur eine Beschleunigung - Schreibfehler sind nicht schlimm
+        pass
+
+
+_load_names()
+
+
 def fetch_name(symbol):
     """
     Ruft den vollständigen Firmennamen für ein Aktien-Symbol ab.
@@ -291,15 +1054,48 @@ def fetch_name(symbol):
     - symbol: Das Börsensymbol (z.B. "AAPL")
     
     Rückgabe: Der Firmenname (z.B. "Apple Inc.") oder das Symbol selbst als Fallback
+    
+    Namen werden NAME_CACHE_TTL Sekunden zwischengespeichert und in
+    NAMES_FILE gesichert (t.info ist eine der langsamsten Yahoo-Anfragen).
     """
+    cached = _cache_get(_NAME_CACHE, symbol, NAME_CACHE_TTL)
+    if cached is not None:
+        return cached
+    
     try:
         t = yf.Ticker(symbol)
         # info enthält detaillierte Informationen zur Aktie
         info = t.info
         # Versuche zuerst longName, dann shortName, sonst das Symbol selbst
-        return info.get("longName") or info.get("shortName") or symbol
+        name = info.get("longName") or info.get("shortName")
     except:
+        name = None
+    
+    if not name:
+        # Fallback nicht merken - beim nächsten Mal erneut versuchen
         return symbol
+    _cache_set(_NAME_CACHE, symbol, name)
+    _save_names()
+    return name
+
+
+def fetch_names(symbols):
+    """
+    Ruft die Firmennamen für MEHRERE Symbole gleichzeitig ab.
+    
+    Jeder fetch_name()-Aufruf wartet hauptsächlich auf das Netzwerk -
+    in Threads parallel ausgeführt dauern N Namen also etwa so lange wie einer.
+    
+    Parameter:
+    - symbols: Liste von Börsensymbolen
+    
+    Rückgabe: Dictionary {symbol: firmenname}
+    """
+    symbols = list(dict.fromkeys(symbols))  # Doppelte entfernen, Reihenfolge behalten
+    if not symbols:
+        return {}
+    with ThreadPoolExecutor(max_workers=min(8, len(symbols))) as executor:
+        return dict(zip(symbols, executor.map(fetch_name, symbols)))
 
 
 def fetch_stock_history(symbol, period="1mo", interval="1d"):
@@ -317,14 +1113,26 @@ def fetch_stock_history(symbol, period="1mo", interval="1d"):
     Rückgabe: Ein Pandas DataFrame mit Spalten:
               Open, High, Low, Close, Volume (Eröffnung, Hoch, Tief, Schluss, Volumen)
               Der Index ist das Datum/die Zeit.
+    
+    Ergebnisse werden HISTORY_CACHE_TTL Sekunden zwischengespeichert, Intraday-Daten
+    nur so lange wie der Intraday-Chart (den zurückgegebenen DataFrame nicht verändern).
     """
+    key = (symbol, period, interval)
+    ttl = CHART_CACHE_TTL_INTRADAY if interval.endswith(("m", "h")) else HISTORY_CACHE_TTL
+    cached = _cache_get(_HISTORY_CACHE, key, ttl)
+    if cached is not None:
+        return cached
+    
     try:
         t = yf.Ticker(symbol)
         # history() ruft die historischen Daten ab
         hist = t.history(period=period, interval=interval)
-        return hist
     except:
         return None
+    # Nur echte Daten merken - leere Antworten sollen erneut versucht werden
+    if hist is not None and not hist.empty:
+        _cache_set(_HISTORY_CACHE, key, hist)
+    return hist
 
 def search_stocks(query):
     """
@@ -337,26 +1145,65 @@ def search_stocks(query):
     - query: Der Suchbegriff (z.B. "Apple", "Tesla", "AAPL")
     
     Rückgabe: Eine Liste von Dictionaries mit gefundenen Wertpapieren:
-    [{"symbol": "AAPL", "name": "Apple Inc.", "exchange": "NASDAQ"}, ...]
+    [{"symbol": "AAPL", "name": "Apple Inc.", "exchange": "NASDAQ", "type": "EQUITY"}, ...]
     
     Wenn die Suche fehlschlägt oder nichts gefunden wird: leere Liste []
+    
+    Ergebnisse werden SEARCH_CACHE_TTL Sekunden zwischengespeichert. Wird derselbe
+    Begriff erneut gesucht (z.B. Enter + Verlassen des Feldes), gibt es keine
+    zweite Anfrage an Yahoo.
     """
     # Mindestens 2 Zeichen benötigt für sinnvolle Suche
     if not query or len(query) < 2:
         return []
     
+    # Groß-/Kleinschreibung und Leerzeichen spielen für die Suche keine Rolle
+    cache_key = query.strip().lower()
+    cached = _cache_get(_SEARCH_CACHE, cache_key, SEARCH_CACHE_TTL)
+    if cached is not None:
+        return cached
+    
+    # Läuft für denselben Begriff schon eine Anfrage (z.B. Enter + Verlassen
+    # des Feldes kurz hintereinander, oder gleiche Suche in zwei Tabs)?
+    # Dann auf deren Ergebnis warten statt eine zweite Anfrage zu schicken.
+    with _CACHE_LOCK:
+        pending = _SEARCH_PENDING.get(cache_key)
+        is_owner = pending is None
+        if is_owner:
+            pending = _SEARCH_PENDING[cache_key] = threading.Event()
+    if not is_owner:
+        pending.wait(timeout=6)
+        cached = _cache_get(_SEARCH_CACHE, cache_key, SEARCH_CACHE_TTL)
+        return cached if cached is not None else []
+    
+    try:
+        return _yahoo_search(query, cache_key)
+    finally:
+        # Wartende Aufrufe freigeben
+        with _CACHE_LOCK:
+            _SEARCH_PENDING.pop(cache_key, None)
+        pending.set()
+
+
+def _yahoo_search(query, cache_key):
+    """
+    Fragt die Yahoo Finance Such-API ab und speichert das Ergebnis im Cache.
+    
+    Wird nur von search_stocks() aufgerufen (nach Cache-Prüfung).
+    """
     try:
         # Yahoo Finance Such-API URL
         # quotesCount=10: Maximal 10 Ergebnisse
         # newsCount=0: Keine News-Ergebnisse (nur Wertpapiere)
         url = f"https://query1.finance.yahoo.com/v1/finance/search?q={query}&quotesCount=10&newsCount=0"
         
-        # HTTP GET-Anfrage mit Timeout von 5 Sekunden
-        # User-Agent Header simuliert einen normalen Browser
-        resp = requests.get(url, timeout=5, headers={"User-Agent": "Mozilla/5.0"})
+        # HTTP GET-Anfrage mit Timeout von 5 Sekunden über die gemeinsame Session
+        # (User-Agent Header der Session simuliert einen normalen Browser)
+        resp = _HTTP_SESSION.get(url, timeout=5)
         
-        # JSON-Antwort parsen
-        data = resp.json()
+        # JSON-Antwort parsen - direkt aus den Bytes (orjson falls verfügbar,
+        # spart das Dekodieren zu einem String und ist deutlich schneller)
+        data = _json_loads(resp.content)
         
         results = []
         # Durchlaufe alle gefundenen "quotes" (Wertpapiere)
@@ -367,13 +1214,88 @@ def search_stocks(query):
                 results.append({
                     "symbol": q.get("symbol"),
                     "name": q.get("shortname") or q.get("longname") or q.get("symbol"),
-                    "exchange": q.get("exchange", "")  # Börse (z.B. NASDAQ, NYSE)
+                    "exchange": q.get("exchange", ""),  # Börse (z.B. NASDAQ, NYSE)
+                    "type": q.get("quoteType")          # Wertpapiertyp (z.B. EQUITY)
                 })
+        _cache_set(_SEARCH_CACHE, cache_key, results)
         return results
     except:
         # Bei Netzwerkfehlern: leere Liste zurückgeben
         return []
 
+def search_options(query):
+    """
+    Sucht Aktien und ETFs und baut daraus Dropdown-Optionen.
+    
+    Wird von den Suchfeldern für Prognose und Monte-Carlo verwendet.
+    
+    Parameter:
+    - query: Der Suchbegriff
+    
+    Rückgabe: (options, default_value)
+    - options: [{"label": "AAPL - Apple Inc.", "value": "AAPL"}, ...]
+    - default_value: Erstes Symbol (oder None)
+    
+    Die fertigen Optionen werden wie die Suchergebnisse zwischengespeichert.
+    """
+    if not query or len(query) < 2:
+        return [], None
+    
+    cache_key = ("options", query.strip().lower())
+    cached = _cache_get(_SEARCH_CACHE, cache_key, SEARCH_CACHE_TTL)
+    if cached is not None:
+        return cached
+    
+    options = [
+        {"label": f"{r['symbol']} - {r['name']}" if r["name"] != r["symbol"] else r["symbol"],
+         "value": r["symbol"]}
+        for r in search_stocks(query)
+        if r.get("type") in ("EQUITY", "ETF") and r.get("symbol")
+    ]
+    if not options:
+        # Nicht zwischenspeichern - evtl. war nur das Netzwerk kurz weg
+        return [], None
+    
+    result = (options, options[0]["value"])
+    _cache_set(_SEARCH_CACHE, cache_key, result)
+    return result
+
+
+def search_dropdown(query):
+    """
+    Sucht Wertpapiere und baut Dropdown-Optionen mit Name, Symbol und Börse.
+    
+    Wird von den Suchfeldern für Sentiment und Korrelation verwendet.
+    
+    Parameter:
+    - query: Der Suchbegriff
+    
+    Rückgabe: (options, default_value)
+    - options: [{"label": "Apple Inc. (AAPL) - NMS", "value": "AAPL"}, ...]
+    - default_value: Symbol, wenn es genau ein Ergebnis gibt (sonst None)
+    """
+    if not query or len(query) < 2:
+        return [], None
+    
+    cache_key = ("dropdown", query.strip().lower())
+    cached = _cache_get(_SEARCH_CACHE, cache_key, SEARCH_CACHE_TTL)
+    if cached is not None:
+        return cached
+    
+    results = search_stocks(query)
+    if not results:
+        # Nicht zwischenspeichern - evtl. war nur das Netzwerk kurz weg
+        return [{"label": "Keine Ergebnisse gefunden", "value": "", "disabled": True}], None
+    
+    options = [
+        {"label": f"{r['name']} ({r['symbol']}) - {r['exchange']}", "value": r['symbol']}
+        for r in results
+    ]
+    # Wenn nur ein Ergebnis, direkt auswählen
+    result = (options, results[0]['symbol'] if len(results) == 1 else None)
+    _cache_set(_SEARCH_CACHE, cache_key, result)
+    return result
+
 def fetch_google_news(symbol, limit=20):
     """
     Ruft aktuelle Nachrichten zu einer Aktie von Google News ab.
@@ -391,7 +1313,15 @@ def fetch_google_news(symbol, limit=20):
       "symbol": "AAPL"}, ...]
     
     RSS (Really Simple Syndication) ist ein XML-Format für News-Feeds.
+    
+    Ergebnisse werden NEWS_CACHE_TTL Sekunden zwischengespeichert
+    (z.B. beim Wechsel des Zeitraums oder erneutem Klick auf "Aktualisieren").
     """
+    cache_key = (symbol, limit)
+    cached = _cache_get(_NEWS_CACHE, cache_key, NEWS_CACHE_TTL)
+    if cached is not None:
+        return cached
+    
     try:
         # Google News RSS-Feed URL
         # hl=de: Sprache Deutsch
@@ -400,42 +1330,64 @@ def fetch_google_news(symbol, limit=20):
         url = f"https://news.google.com/rss/search?q={symbol}+stock&hl=de&gl=DE&ceid=DE:de"
         
         # RSS-Feed abrufen
-        resp = requests.get(url, timeout=10, headers={"User-Agent": "Mozilla/5.0"})
-        
-        # Alle <item>-Tags finden (jeder <item> ist eine Nachricht)
-        # re.findall sucht alle Vorkommen des Musters
-        # re.DOTALL lässt '.' auch Zeilenumbrüche matchen
-        items = re.findall(r"<item>(.*?)</item>", resp.text, re.DOTALL)
+        resp = _HTTP_SESSION.get(url, timeout=10)
         
+        # <item>-Elemente lesen (jedes <item> ist eine Nachricht)
+        # iterparse geht EINMAL durch die Bytes und meldet jedes fertig gelesene
+        # Element - nach 'limit' Items wird aufgehört, der Rest des Feeds
+        # (oft 100 Items) wird gar nicht erst gelesen.
+        # Der XML-Parser wandelt Entities selbst zurück (z.B. &amp; -> &)
         news = []
-        # Verarbeite die gefundenen Items (maximal 'limit' Stück)
-        for item in items[:limit]:
-            # Extrahiere Titel, Link, Veröffentlichungsdatum und Quelle
-            # mit Regular Expressions (Muster-Suche)
-            title_m = re.search(r"<title>(.*?)</title>", item)
-            link_m = re.search(r"<link>(.*?)</link>", item)
-            pub_m = re.search(r"<pubDate>(.*?)</pubDate>", item)
-            source_m = re.search(r"<source.*?>(.*?)</source>", item)
-            
-            # Wenn gefunden, extrahiere den Text (group(1)), sonst Fallback-Wert
-            # unescape() wandelt HTML-Entities zurück (z.B. &amp; -> &)
-            title = unescape(title_m.group(1)) if title_m else "News"
-            link = link_m.group(1) if link_m else ""
-            pub = pub_m.group(1) if pub_m else ""
-            source = unescape(source_m.group(1)) if source_m else ""
-            
-            news.append({
-                "title": title,
-                "link": link,
-                "pubDate": pub,
-                "source": source,
-                "symbol": symbol  # Füge Symbol hinzu, damit wir wissen, zu welcher Aktie die News gehört
-            })
+        try:
+            for _, item in ET.iterparse(BytesIO(resp.content)):
+                if item.tag != "item":
+                    continue
+                # Titel, Link, Veröffentlichungsdatum und Quelle (sonst Fallback-Wert)
+                news.append({
+                    "title": item.findtext("title") or "News",
+                    "link": item.findtext("link") or "",
+                    "pubDate": item.findtext("pubDate") or "",
+                    "source": item.findtext("source") or "",
+                    "symbol": symbol  # Füge Symbol hinzu, damit wir wissen, zu welcher Aktie die News gehört
+                })
+                item.clear()  # Gelesenes Item freigeben
+                if len(news) >= limit:
+                    break
+        except ET.ParseError:
+            # Fehlerhaftes XML: Die bis dahin gelesenen Items behalten
+            pass
+        # Leere Ergebnisse nicht merken - evtl. war nur das Netzwerk kurz weg
+        if news:
+            _cache_set(_NEWS_CACHE, cache_key, news)
         return news
     except:
         # Bei Fehlern: leere Liste zurückgeben
         return []
 
+
+# Ein gemeinsamer Thread-Pool für alle News-Abrufe. Er wird einmal beim Start
+# erstellt und bei jedem Refresh wiederverwendet (statt jedes Mal neue Threads).
+_NEWS_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix="news")
+
+
+def fetch_google_news_many(targets, limit=20):
+    """
+    Ruft die Google-News für MEHRERE Suchbegriffe gleichzeitig ab.
+    
+    Jeder Feed-Abruf wartet fast nur auf das Netzwerk. In Threads parallel
+    gestartet dauern z.B. 8 Kategorien-Begriffe etwa so lange wie einer.
+    
+    Parameter:
+    - targets: Liste von Suchbegriffen (z.B. ["DAX", "Nasdaq", "Bitcoin"])
+    - limit: Maximale Anzahl News pro Suchbegriff
+    
+    Rückgabe: Eine Liste aller News (in der Reihenfolge der Suchbegriffe)
+    """
+    if not targets:
+        return []
+    results = _NEWS_EXECUTOR.map(lambda target: fetch_google_news(target, limit), targets)
+    return [item for news in results for item in news]
+
 def format_volume(vol):
     """
     Formatiert große Zahlen (Handelsvolumen) in lesbare Kurzform.
@@ -469,6 +1421,45 @@ def format_volume(vol):
     # Kleine Zahlen einfach als String zurückgeben
     return str(vol)
 
+
+# Übersetzungstabelle für die deutsche Zahlenschreibweise: "," <-> "." tauschen
+_DE_NUMBER = str.maketrans(",.", ".,")
+
+
+def format_number_de(value, decimals=2):
+    """
+    Formatiert eine Zahl in deutscher Schreibweise.
+    
+    Parameter:
+    - value: Die Zahl
+    - decimals: Anzahl Nachkommastellen (Standard: 2)
+    
+    Rückgabe: Zeichenkette, z.B. 1234.5 -> "1.234,50"
+    
+    Erst englisch formatieren (1,234.50), dann Komma und Punkt in EINEM
+    Durchlauf tauschen (translate) - statt dreimal replace() mit Platzhalter.
+    """
+    return f"{value:,.{decimals}f}".translate(_DE_NUMBER)
+
+
+def format_change(price, prev):
+    """
+    Berechnet Farbe und Änderungstext für einen Kurs im Vergleich zum Vortag.
+    
+    Parameter:
+    - price: Aktueller Kurs
+    - prev: Vortagesschluss (oder None)
+    
+    Rückgabe: (farbe, text), z.B. ("#22c55e", " (+1.20 / +0.85%)")
+    """
+    if not prev:
+        return "#000", ""
+    diff = price - prev
+    pct = (diff / prev) * 100
+    sign = "+" if diff >= 0 else ""
+    color = "#22c55e" if price >= prev else "#ef4444"
+    return color, f" ({sign}{diff:.2f} / {sign}{pct:.2f}%)"
+
 # ================================================================================
 # HILFSFUNKTIONEN: DIAGRAMME/CHARTS ERSTELLEN
 # ================================================================================
@@ -476,7 +1467,41 @@ def format_volume(vol):
 # Plotly ist eine Bibliothek für interaktive, webfähige Graphen.
 # ================================================================================
 
+# Gültigkeitsdauer der Chart-Caches in Sekunden:
+# Intraday-Charts (Minuten/Stunden) ändern sich schnell, Tages-/Wochencharts kaum
+CHART_CACHE_TTL_INTRADAY = 60
+CHART_CACHE_TTL_DAILY = 600
+
+
 def create_stock_chart(symbol, period="1mo", interval="1d"):
+    """
+    Liefert den Kurs-Chart für eine Aktie - aus dem Cache oder neu erstellt.
+    
+    Jeder neue Chart bedeutet einen Download der Kursdaten plus den Aufbau
+    der Plotly-Figur. Wird derselbe Chart (gleiches Symbol, Zeitraum, Intervall)
+    kurz danach erneut angefragt, kommt er aus dem Cache.
+    
+    Im Cache liegt nur das Dictionary der Figur (fig.to_dict()). Jeder Aufruf
+    bekommt ein neues Figure-Objekt, damit Änderungen durch einen Callback
+    nicht versehentlich den Chart eines anderen verändern.
+    
+    Parameter und Rückgabe: wie _build_stock_chart()
+    """
+    key = (symbol, period, interval)
+    ttl = CHART_CACHE_TTL_INTRADAY if interval.endswith(("m", "h")) else CHART_CACHE_TTL_DAILY
+    
+    cached = _cache_get(_CHART_CACHE, key, ttl)
+    if cached is not None:
+        return go.Figure(cached)
+    
+    fig = _build_stock_chart(symbol, period, interval)
+    # Leere Charts ("Keine Daten verfügbar") nicht merken - beim nächsten Mal neu versuchen
+    if fig.data:
+        _cache_set(_CHART_CACHE, key, fig.to_dict(), maxsize=256)
+    return fig
+
+
+def _build_stock_chart(symbol, period="1mo", interval="1d"):
     """
     Erstellt ein Liniendiagramm (Kursverlauf) für eine Aktie.
     
@@ -505,9 +1530,13 @@ def create_stock_chart(symbol, period="1mo", interval="1d"):
         fig.update_layout(xaxis=dict(visible=False), yaxis=dict(visible=False))
         return fig
     
+    # Schlusskurse EINMAL als NumPy-Array holen - alle folgenden Berechnungen
+    # laufen direkt auf dem Array (ohne den Umweg über pandas-Methoden)
+    closes = hist["Close"].to_numpy(dtype=float)
+    
     # Berechne ob der Kurs gestiegen oder gefallen ist
-    start_price = hist["Close"].iloc[0]   # Erster Schlusskurs (iloc[0] = erste Zeile)
-    end_price = hist["Close"].iloc[-1]    # Letzter Schlusskurs (iloc[-1] = letzte Zeile)
+    start_price = closes[0]    # Erster Schlusskurs
+    end_price = closes[-1]     # Letzter Schlusskurs
     is_positive = end_price >= start_price  # True wenn Kurs gestiegen
     
     # Wähle Farbe basierend auf Kursentwicklung
@@ -516,8 +1545,9 @@ def create_stock_chart(symbol, period="1mo", interval="1d"):
     
     # ===== Y-Achsen-Skalierung berechnen =====
     # Wir wollen die Y-Achse optimal zoomen, damit der Kursverlauf gut sichtbar ist
-    y_min = hist["Close"].min()  # Tiefster Kurs
-    y_max = hist["Close"].max()  # Höchster Kurs
+    # nanmin/nanmax: Lücken (NaN) ignorieren, wie pandas' min()/max()
+    y_min = np.nanmin(closes)    # Tiefster Kurs
+    y_max = np.nanmax(closes)    # Höchster Kurs
     y_range = y_max - y_min      # Spannweite
     
     # Berechne Padding (Abstand am Rand) für bessere Optik
@@ -532,7 +1562,7 @@ def create_stock_chart(symbol, period="1mo", interval="1d"):
     # Füge die Kurslinie hinzu
     fig.add_trace(go.Scatter(
         x=hist.index,              # X-Achse: Datum/Zeit
-        y=hist["Close"],           # Y-Achse: Schlusskurse
+        y=closes,                  # Y-Achse: Schlusskurse (Array wird schneller serialisiert)
         mode="lines",              # Nur Linien, keine Punkte
         line=dict(color=color, width=2),  # Linienfarbe und -dicke
         fill="tozeroy",            # Fülle den Bereich bis zur X-Achse
@@ -562,7 +1592,12 @@ def create_stock_chart(symbol, period="1mo", interval="1d"):
     )
     return fig
 
-def create_portfolio_pie_chart(portfolio):
+# Feste Farbpalette für das Kreisdiagramm (einmal beim Start berechnet)
+# Farbwinkel in Schritten von 137° ("goldener Winkel") -> benachbarte Sektoren
+# unterscheiden sich deutlich. Anders als hash() bleibt sie nach einem Neustart gleich.
+_PIE_PALETTE = [f"hsl({i * 137 % 360}, 70%, 50%)" for i in range(64)]
+
+def create_portfolio_pie_chart(portfolio, prices=None):
     """
     Erstellt ein Kreisdiagramm (Pie Chart) der Portfolio-Zusammensetzung.
     
@@ -571,6 +1606,8 @@ def create_portfolio_pie_chart(portfolio):
     
     Parameter:
     - portfolio: Liste der Portfolio-Positionen aus der JSON-Datei
+    - prices: Optional {symbol: (preis, vortag)}, wenn der Aufrufer die Kurse
+              schon hat (sonst werden sie hier per Sammelabruf geholt)
     
     Rückgabe: Ein Plotly Figure-Objekt (Kreisdiagramm)
     """
@@ -586,13 +1623,17 @@ def create_portfolio_pie_chart(portfolio):
         values = []   # Werte (aktueller Wert der Position)
         colors = []   # Farben für jeden Sektor
         
+        # Alle Kurse in EINEM Sammelabruf holen statt einzeln pro Position
+        if prices is None:
+            prices = fetch_prices([item["symbol"] for item in portfolio])
+        
         # Durchlaufe alle Positionen im Portfolio
         for item in portfolio:
             symbol = item["symbol"]
             qty = item["qty"]  # Anzahl der Aktien
             
-            # Hole aktuellen Preis
-            current_price, _ = fetch_price(symbol)
+            # Aktueller Preis aus dem Sammelabruf
+            current_price, _ = prices.get(symbol, (None, None))
             
             if current_price:
                 # Berechne aktuellen Wert der Position
@@ -600,9 +1641,8 @@ def create_portfolio_pie_chart(portfolio):
                 values.append(value)
                 labels.append(symbol)
                 
-                # Generiere eine Farbe basierend auf dem Symbol
-                # hash() erzeugt eine Zahl aus dem Symbol, % 360 gibt uns einen Farbwinkel (HSL)
-                colors.append(f"hsl({hash(symbol) % 360}, 70%, 50%)")
+                # Farbe aus der festen Palette (nach Position im Diagramm)
+                colors.append(_PIE_PALETTE[(len(values) - 1) % len(_PIE_PALETTE)])
         
         # Wenn keine Preise verfügbar
         if not values:
@@ -638,7 +1678,7 @@ def create_portfolio_pie_chart(portfolio):
         fig.update_layout(xaxis=dict(visible=False), yaxis=dict(visible=False), paper_bgcolor="rgba(0,0,0,0)", plot_bgcolor="rgba(0,0,0,0)")
         return fig
 
-def create_portfolio_value_chart(portfolio):
+def create_portfolio_value_chart(portfolio, prices=None, names=None):
     """
     Erstellt ein Liniendiagramm zur Visualisierung der Portfolio-Wertentwicklung.
     
@@ -650,6 +1690,8 @@ def create_portfolio_value_chart(portfolio):
     
     Parameter:
     - portfolio: Liste der Portfolio-Positionen
+    - prices: Optional {symbol: (preis, vortag)} - bereits geholte Kurse
+    - names: Optional {symbol: firmenname} - bereits geholte Namen
     
     Rückgabe: Ein Plotly Figure-Objekt
     """
@@ -672,6 +1714,14 @@ def create_portfolio_value_chart(portfolio):
         total_invested = 0  # Summe aller investierten Beträge
         total_current = 0   # Summe aller aktuellen Werte
         
+        # Kurse (ein Sammelabruf) und Namen (parallel) für alle Positionen vorab holen
+        # (nur falls der Aufrufer sie nicht schon mitgegeben hat)
+        all_symbols = [item.get("symbol", "") for item in portfolio]
+        if prices is None:
+            prices = fetch_prices(all_symbols)
+        if names is None:
+            names = fetch_names(all_symbols)
+        
         # Durchlaufe jede Position im Portfolio
         for item in portfolio:
             symbol = item.get("symbol", "")
@@ -684,11 +1734,8 @@ def create_portfolio_value_chart(portfolio):
             invested = qty * buy_price
             total_invested += invested
             
-            # Hole aktuellen Preis
-            try:
-                current_price, _ = fetch_price(symbol)
-            except:
-                current_price = None
+            # Aktueller Preis aus dem Sammelabruf
+            current_price, _ = prices.get(symbol, (None, None))
             
             # Wenn aktueller Preis verfügbar, berechne Statistiken
             if current_price:
@@ -699,11 +1746,8 @@ def create_portfolio_value_chart(portfolio):
                 # Prozentuale Veränderung berechnen (Vorsicht: Division durch 0 vermeiden)
                 pnl_pct = (pnl / invested) * 100 if invested > 0 else 0
                 
-                # Hole Firmennamen
-                try:
-                    name = fetch_name(symbol) or symbol
-                except:
-                    name = symbol
+                # Firmenname aus dem parallelen Abruf
+                name = names.get(symbol) or symbol
                 
                 # Füge alle Daten zur Liste hinzu
                 data_list.append({
@@ -877,6 +1921,47 @@ app = dash.Dash(
 # Titel der Webseite (erscheint im Browser-Tab)
 app.title = "Stock Dashboard"
 
+# ============== HINTERGRUND-CALLBACKS (OPTIONAL) ==============
+# Lange Analysen (z.B. Sentiment mit tausenden News) blockieren sonst einen
+# Server-Worker, bis sie fertig sind. Als "Background Callback" laufen sie in
+# einem eigenen Prozess, der Browser fragt regelmäßig nach dem Ergebnis.
+#
+# Genutzt von Sentiment, Korrelation, ARIMA-Prognose und Monte-Carlo.
+#
+# Bewusst OHNE cache_by: Dash würde sonst jedes Ergebnis des Zeitfensters
+# aufheben - auch Fehlermeldungen (und sogar Exceptions). Ein kurzer Ausfall
+# von Yahoo wäre dann 15 Minuten lang zu sehen. Stattdessen merkt sich jeder
+# Analyse-Tab den Schlüssel (analysis_key) des angezeigten Ergebnisses:
+# Gleiche Eingaben im selben Zeitfenster -> die Anzeige bleibt einfach stehen.
+# Wer zwischen Aktien wechselt (A -> B -> A), bekommt Korrelation, Prognose
+# und Monte-Carlo aus dem Ergebnis-Cache in sentiment_analysis.py
+# (cache_analysis - speichert nur fehlerfreie Ergebnisse).
+#
+# Benötigt: pip install "dash[diskcache]"
+# Ohne diese Pakete laufen die Callbacks ganz normal (synchron) weiter.
+ANALYSIS_CACHE_SECONDS = 900  # 15 Minuten
+
+
+def analysis_key(*args):
+    """
+    Baut einen Schlüssel aus den Eingaben einer Analyse.
+    
+    Enthält das aktuelle 15-Minuten-Fenster - nach Ablauf wird dieselbe
+    Analyse also wieder neu berechnet.
+    """
+    return "|".join(str(a) for a in args) + f"|{int(time.time() // ANALYSIS_CACHE_SECONDS)}"
+
+try:
+    import diskcache
+    from dash import DiskcacheManager
+    # Der Cache dient nur zur Übergabe des Ergebnisses an den Browser
+    # (ohne cache_by wird es nach dem Abholen gelöscht)
+    background_manager = DiskcacheManager(diskcache.Cache(Path(__file__).parent / ".cache"))
+    BACKGROUND_AVAILABLE = True
+except ImportError:
+    background_manager = None
+    BACKGROUND_AVAILABLE = False
+
 # ================================================================================
 # CUSTOM CSS (Benutzerdefinierte Styles)
 # ================================================================================
@@ -1051,7 +2136,8 @@ def create_market_ticker():
         # List Comprehension: Erstellt eine Liste von dbc.Col-Elementen
         dbc.Col(
             html.Div(
-                id=f"ticker-{s['name']}",  # Eindeutige ID für Callbacks
+                # Pattern-Matching-ID: Ein Callback kann mit ALL auf alle Ticker reagieren
+                id={"type": "ticker", "name": s["name"]},
                 className="text-center p-2",  # Bootstrap-Klassen: zentriert, Padding
                 style={
                     "cursor": "pointer",          # Mauszeiger zeigt an, dass klickbar
@@ -1069,6 +2155,15 @@ def create_market_ticker():
     )
 
 
+# Anzahl der Suchergebnis-Buttons im Kaufen/Verkaufen-Modal.
+# Die Buttons existieren fest im Layout (IDs "search-result-0" bis "-4") und
+# werden bei einer Suche nur beschriftet bzw. ein-/ausgeblendet.
+SEARCH_RESULT_SLOTS = 5
+
+# Stil für ungenutzte Suchergebnis-Buttons
+_HIDDEN = {"display": "none"}
+
+
 # ================================================================================
 # HAUPT-LAYOUT DER ANWENDUNG
 # ================================================================================
@@ -1088,7 +2183,15 @@ app.layout = dbc.Container([
     dcc.Store(id="selected-ticker", data=None),           # Aktuell ausgewählte Aktie für Buy/Sell
     dcc.Store(id="portfolio-store", data=load_portfolio()),  # Portfolio-Daten (geladen aus Datei)
     dcc.Store(id="search-results-store", data=[]),        # Suchergebnisse
+    dcc.Store(id="selected-search-idx", data=None),       # Geklicktes Suchergebnis (vom Browser gesetzt)
     dcc.Store(id="theme-store", data="dark"),             # Aktuelles Theme (dark/light)
+    dcc.Store(id="balance-store", data=load_balance()),   # Kontostand für Berechnungen im Browser
+    # Schlüssel der zuletzt angezeigten Analysen (gleiche Eingaben -> nicht neu rechnen)
+    # Bewusst "memory": Nach einem Neuladen ist die Anzeige leer und muss neu berechnet werden
+    dcc.Store(id="sentiment-last"),
+    dcc.Store(id="corr-last"),
+    dcc.Store(id="forecast-last"),
+    dcc.Store(id="mc-last"),
     
     # ===== HEADER MIT TITEL UND THEME-TOGGLE =====
     dbc.Row([
@@ -1606,7 +2709,20 @@ app.layout = dbc.Container([
         dbc.ModalHeader("💰 Kaufen / Verkaufen"),
         dbc.ModalBody([
             dbc.Input(id="buy-search", placeholder="Aktie suchen...", className="mb-2", debounce=True),
-            html.Div(id="buy-search-results", style={"maxHeight": "150px", "overflowY": "auto"}),
+            html.Div(
+                [
+                    dbc.Button(
+                        id=f"search-result-{i}",
+                        color="light",
+                        className="w-100 mb-1 text-start",  # Volle Breite, kleiner Abstand
+                        size="sm",
+                        style=_HIDDEN,  # Erst nach einer Suche sichtbar
+                    )
+                    for i in range(SEARCH_RESULT_SLOTS)
+                ],
+                id="buy-search-results",
+                style={"maxHeight": "150px", "overflowY": "auto"},
+            ),
             html.Hr(),
             html.Div(id="buy-stock-info"),
             html.Div(id="buy-chart-container"),  # Chart wird nur bei Auswahl angezeigt
@@ -1641,7 +2757,30 @@ app.layout = dbc.Container([
                 ])], width=4),
             ], className="mb-3"),
             html.Div(id="transactions-table"),
-            html.Div(id="transactions-summary", className="mt-3"),
+            # Zusammenfassung: Struktur steht fest, der Callback füllt nur die Zahlen
+            html.Div(dbc.Card([
+                dbc.CardBody([
+                    dbc.Row([
+                        dbc.Col([
+                            html.H6("📊 Transaktionen", className="text-muted mb-1"),
+                            html.H4(id="tx-count-val", className="text-info mb-0")
+                        ], width=3, className="text-center"),
+                        dbc.Col([
+                            html.H6("💵 Käufe", className="text-muted mb-1"),
+                            html.H4(id="tx-buy-val", className="text-success mb-0")
+                        ], width=3, className="text-center"),
+                        dbc.Col([
+                            html.H6("💸 Verkäufe", className="text-muted mb-1"),
+                            html.H4(id="tx-sell-val", className="text-danger mb-0")
+                        ], width=3, className="text-center"),
+                        dbc.Col([
+                            html.H6("📈 Saldo", className="text-muted mb-1"),
+                            html.H4(id="tx-saldo-val", className="text-success mb-0")
+                        ], width=3, className="text-center"),
+                    ])
+                ])
+            ], className="mt-3 border-0", style={"background": "linear-gradient(135deg, #1a1a2e 0%, #16213e 100%)"}),
+                id="transactions-summary", className="mt-3", style={"display": "none"}),
         ]),
         dbc.ModalFooter(dbc.Button("Schließen", id="btn-close-tx", color="secondary")),
     ], id="transactions-modal", size="xl"),
@@ -1723,16 +2862,69 @@ app.layout = dbc.Container([
 # ================================================================================
 
 
+# ================================================================================
+# HINTERGRUND-AKTUALISIERUNG DER MARKTÜBERSICHT
+# ================================================================================
+# Statt die Kurse im Callback abzufragen (der Callback wartet dann auf Yahoo),
+# holt ein eigener Hintergrund-Thread alle MARKET_REFRESH_SECONDS Sekunden die
+# Kurse und legt sie in _MARKET_PRICES ab. Der Callback liest nur noch das Dictionary.
+#
+# Der Thread startet erst beim ersten Ticker-Callback (also erst, wenn wirklich
+# jemand die Seite geöffnet hat) und läuft als "daemon" - er endet mit der App.
+MARKET_REFRESH_SECONDS = 15
+
+_MARKET_PRICES = {}              # symbol -> (preis, vortag), vom Hintergrund-Thread gefüllt
+_MARKET_THREAD = None            # Der laufende Thread (None = noch nicht gestartet)
+_MARKET_THREAD_LOCK = threading.Lock()
+
+
+def _market_refresher():
+    """
+    Endlosschleife des Hintergrund-Threads: Kurse holen, speichern, warten.
+    """
+    symbols = [s["symbol"] for s in MARKET_OVERVIEW_SYMBOLS]
+    while True:
+        try:
+            # refresh=True: sonst käme bei 15s Takt jeder zweite Abruf nur aus dem 30s-Cache
+            _MARKET_PRICES.update(fetch_prices(symbols, refresh=True))
+        except Exception as e:
+            # Der Thread darf nie sterben - beim nächsten Durchlauf erneut versuchen
+            print(f"[Marktübersicht] Fehler beim Aktualisieren: {e}")
+        time.sleep(MARKET_REFRESH_SECONDS)
+
+
+def start_market_refresher():
+    """
+    Startet den Hintergrund-Thread für die Marktübersicht (nur beim ersten Aufruf).
+    """
+    global _MARKET_THREAD
+    with _MARKET_THREAD_LOCK:
+        if _MARKET_THREAD is None:
+            _MARKET_THREAD = threading.Thread(target=_market_refresher, name="market-refresher", daemon=True)
+            _MARKET_THREAD.start()
+
+
 # ================================================================================
 # CALLBACK: MARKT-TICKER AKTUALISIEREN
 # ================================================================================
 # Dieser Callback aktualisiert die Kurse in der oberen Ticker-Leiste.
 # Er wird alle 15 Sekunden automatisch durch den Interval-Timer ausgelöst.
+
+# Style jedes Ticker-Elements - bei jedem Update gleich, daher nur einmal anlegen
+# (alle Ticker teilen sich dasselbe Dictionary, es wird nie verändert)
+DEFAULT_TICKER_STYLE = {"cursor": "pointer", "borderRadius": "5px", "background": "#f8f9fa", "padding": "8px"}
+
+# Fettgedruckte Namen der Ticker (z.B. <b>DAX</b>) - ebenfalls nur einmal erstellt
+_TICKER_LABELS = {s["name"]: html.B(s["name"]) for s in MARKET_OVERVIEW_SYMBOLS}
+
+# Farben nach Richtung der Änderung: Index 0 = gefallen, 1 = gleich, 2 = gestiegen
+_TICKER_COLORS = ("#ef4444", "#000000", "#22c55e")
+
 @callback(
     # OUTPUTS: Aktualisiere Text UND Style für jedes Ticker-Element
-    # List Comprehension erstellt eine Liste von Outputs für alle Symbole
-    [Output(f"ticker-{s['name']}", "children") for s in MARKET_OVERVIEW_SYMBOLS] +
-    [Output(f"ticker-{s['name']}", "style") for s in MARKET_OVERVIEW_SYMBOLS],
+    # Pattern Matching mit ALL: Je ein Output für alle Ticker (Reihenfolge wie im Layout)
+    Output({"type": "ticker", "name": dash.ALL}, "children"),
+    Output({"type": "ticker", "name": dash.ALL}, "style"),
     
     # INPUT: Der Interval-Timer (aktualisiert sich alle 15 Sekunden)
     Input("market-interval", "n_intervals")
@@ -1745,15 +2937,20 @@ def update_market_tickers(n):
     - n: Anzahl der vergangenen Intervalle (wird nicht direkt verwendet,
          löst aber den Callback aus)
     
-    Rückgabe: Liste von HTML-Elementen (Texte) + Liste von Style-Dictionaries
+    Rückgabe: (Liste von HTML-Elementen (Texte), Liste von Style-Dictionaries)
     """
     texts = []   # Liste für die anzuzeigenden Texte
     styles = []  # Liste für die Styling-Informationen
     
+    # Kurse kommen vom Hintergrund-Thread. Nur ganz am Anfang (Thread hat noch
+    # nichts geliefert) wird einmal direkt per Sammelabruf geholt.
+    start_market_refresher()
+    prices = dict(_MARKET_PRICES) or fetch_prices([s["symbol"] for s in MARKET_OVERVIEW_SYMBOLS])
+    
     # Durchlaufe alle Symbole aus der Konfiguration
     for s in MARKET_OVERVIEW_SYMBOLS:
-        # Hole aktuellen Preis und Vortagesschluss
-        price, prev = fetch_price(s["symbol"])
+        # Aktueller Preis und Vortagesschluss
+        price, prev = prices.get(s["symbol"], (None, None))
         
         # Spezialfall EUR/USD: Invertieren (weil Yahoo USD/EUR liefert)
         if s.get("invert") and price:
@@ -1763,27 +2960,25 @@ def update_market_tickers(n):
         
         # Wenn kein Preis verfügbar: "n/a" anzeigen
         if price is None:
-            texts.append(html.Span([html.B(s["name"]), ": n/a"]))
-            styles.append({"cursor": "pointer", "borderRadius": "5px", "background": "#f8f9fa", "padding": "8px"})
+            texts.append(html.Span([_TICKER_LABELS[s["name"]], ": n/a"]))
+            styles.append(DEFAULT_TICKER_STYLE)
         else:
             # Formatiere den Preis mit der konfigurierten Anzahl Nachkommastellen
             decimals = s.get("decimals", 2)
             # Deutsche Zahlenformatierung: 1.234,56 statt 1,234.56
-            formatted = f"{price:,.{decimals}f}".replace(",", "X").replace(".", ",").replace("X", ".")
+            formatted = format_number_de(price, decimals)
             
             # Farbe basierend auf Änderung zum Vortag
-            if prev:
-                diff = price - prev
-                # Grün wenn gestiegen, Rot wenn gefallen, Schwarz wenn gleich
-                color = "#22c55e" if diff > 0.0001 else "#ef4444" if diff < -0.0001 else "#000000"
-            else:
-                color = "#000000"
+            # Grün wenn gestiegen, Rot wenn gefallen, Schwarz wenn gleich:
+            # True/False zählen als 1/0 -> Index 2, 0 oder 1 in _TICKER_COLORS
+            diff = price - prev if prev else 0.0
+            color = _TICKER_COLORS[(diff > 0.0001) - (diff < -0.0001) + 1]
             
-            texts.append(html.Span([html.B(s["name"]), f": {formatted}"], style={"color": color, "fontWeight": "bold"}))
-            styles.append({"cursor": "pointer", "borderRadius": "5px", "background": "#f8f9fa", "padding": "8px"})
+            texts.append(html.Span([_TICKER_LABELS[s["name"]], f": {formatted}"], style={"color": color, "fontWeight": "bold"}))
+            styles.append(DEFAULT_TICKER_STYLE)
     
-    # Rückgabe: Erst alle Texte, dann alle Styles (entspricht der Output-Reihenfolge)
-    return texts + styles
+    # Rückgabe: Alle Texte und alle Styles (je eine Liste pro ALL-Output)
+    return texts, styles
 
 # ================================================================================
 # CALLBACK: AKTIENSUCHE UND CHART-AKTUALISIERUNG
@@ -1859,6 +3054,11 @@ def update_stock_view(search, n1d, n1w, n1m, n3m, n1y, nmax):
     # Erstelle den Chart für diese Aktie
     fig = create_stock_chart(symbol, period, interval)
     
+    # Nur ein Zeitraum-Button geklickt: Die Aktie ist dieselbe, also auch die News.
+    # no_update lässt die angezeigten News stehen (kein Abruf, keine Übertragung)
+    if triggered in period_map:
+        return fig, dash.no_update, *btn_states
+    
     # Hole News zur Aktie (maximal 10)
     news = fetch_google_news(symbol, 10)
     
@@ -1927,15 +3127,20 @@ def update_portfolio(portfolio):
         total_invested = 0
         total_value = 0
         
+        # Kurse und Namen für alle Positionen vorab holen (statt einzeln in der Schleife)
+        all_symbols = [item["symbol"] for item in portfolio]
+        prices = fetch_prices(all_symbols)
+        names = fetch_names(all_symbols)
+        
         for item in portfolio:
             symbol = item["symbol"]
-            name = fetch_name(symbol) or symbol
+            name = names.get(symbol) or symbol
             qty = item["qty"]
             buy_price = item.get("buy_price") or item.get("avg_price", 0)
             invested = qty * buy_price
             total_invested += invested
             
-            current_price, _ = fetch_price(symbol)
+            current_price, _ = prices.get(symbol, (None, None))
             if current_price:
                 value = qty * current_price
                 total_value += value
@@ -2085,12 +3290,13 @@ def update_portfolio(portfolio):
         
         # Charts mit Fehlerbehandlung erstellen
         try:
-            chart = create_portfolio_pie_chart(portfolio)
+            # Kurse und Namen von oben weiterreichen - keine zweite Abfrage
+            chart = create_portfolio_pie_chart(portfolio, prices)
         except Exception:
             chart = empty_figure("Fehler beim Laden des Pie-Charts")
         
         try:
-            value_chart = create_portfolio_value_chart(portfolio)
+            value_chart = create_portfolio_value_chart(portfolio, prices, names)
         except Exception as e:
             value_chart = empty_figure(f"Fehler: {str(e)[:40]}")
         
@@ -2156,10 +3362,8 @@ def update_market_news(n, category, search_term):
         targets = category_targets.get(category, category_targets["news-all"])
         news_limit = 4
     
-    all_news = []
-    for target in targets:
-        news = fetch_google_news(target, news_limit)
-        all_news.extend(news)
+    # Alle Feeds gleichzeitig abrufen statt nacheinander
+    all_news = fetch_google_news_many(targets, news_limit)
     
     if not all_news:
         return html.Div([
@@ -2333,6 +3537,7 @@ def update_market_news(n, category, search_term):
 # Dieser Callback steuert, ob das Kauf/Verkauf-Modal sichtbar ist.
 @callback(
     Output("buy-sell-modal", "is_open"),    # Steuert ob Modal offen ist (True/False)
+    Output("balance-store", "data"),         # Kontostand beim Öffnen aktualisieren
     Input("btn-buy-sell", "n_clicks"),       # "Buy/Sell" Button im Portfolio
     Input("btn-close-modal", "n_clicks"),    # "Schließen" Button im Modal
     Input("btn-confirm-buy", "n_clicks"),    # "Kaufen" Button (schließt auch)
@@ -2348,9 +3553,15 @@ def toggle_buy_sell_modal(n1, n2, n3, n4, is_open):
     - n1-n4: Klick-Zähler der verschiedenen Buttons
     - is_open: Aktueller Zustand (True = offen, False = geschlossen)
     
-    Rückgabe: Der neue Zustand (invertiert)
+    Rückgabe: (neuer_zustand, kontostand)
+    
+    Der Kontostand wird nur beim Öffnen einmal aus der Datei gelesen.
+    Die Berechnung des Gesamtbetrags läuft danach komplett im Browser.
     """
-    return not is_open  # Einfach umschalten: offen -> zu, zu -> offen
+    # Einfach umschalten: offen -> zu, zu -> offen
+    if is_open:
+        return False, dash.no_update
+    return True, load_balance()
 
 
 # ================================================================================
@@ -2442,78 +3653,101 @@ def handle_kontostand(is_open, btn_deposit, btn_withdraw, amount):
 # CALLBACK: AKTIENSUCHE IM BUY/SELL MODAL
 # ================================================================================
 # Sucht nach Aktien basierend auf der Eingabe im Modal und zeigt Ergebnisse.
+# Die Buttons stehen fest im Layout - hier werden nur Texte und Sichtbarkeit
+# gesetzt. Es entstehen keine neuen Komponenten (und keine Pattern-IDs).
 @callback(
-    Output("buy-search-results", "children"),  # Liste der Suchergebnis-Buttons
+    *[Output(f"search-result-{i}", "children") for i in range(SEARCH_RESULT_SLOTS)],  # Button-Texte
+    *[Output(f"search-result-{i}", "style") for i in range(SEARCH_RESULT_SLOTS)],     # Ein-/Ausblenden
     Output("search-results-store", "data"),    # Speichert Ergebnisse für spätere Verwendung
     Input("buy-search", "value"),              # Suchfeld im Modal
     prevent_initial_call=True
 )
 def search_for_buy(query):
     """
-    Sucht nach Aktien für den Kauf und erstellt klickbare Buttons.
+    Sucht nach Aktien für den Kauf und beschriftet die Ergebnis-Buttons.
     
     Parameter:
     - query: Der Suchbegriff aus dem Eingabefeld
     
-    Rückgabe: (buttons_liste, suchergebnisse_daten)
+    Rückgabe: (5 Button-Texte, 5 Button-Stile, suchergebnisse_daten)
     """
     # Mindestens 2 Zeichen für Suche erforderlich
     if not query or len(query) < 2:
-        return [], []
+        results = []
+    else:
+        # Suche durchführen, nur die ersten 5 Ergebnisse
+        results = search_stocks(query)[:SEARCH_RESULT_SLOTS]
     
-    # Suche durchführen
-    results = search_stocks(query)
+    labels = [f"{r['symbol']} - {r['name']}" for r in results]
+    styles = [None] * len(results)  # None = normaler Stil (sichtbar)
     
-    # Erstelle Buttons für jedes Ergebnis (maximal 5)
-    # Das Pattern {"type": "search-result", "index": i} ermöglicht Pattern Matching Callbacks
-    buttons = [
-        dbc.Button(
-            f"{r['symbol']} - {r['name']}",  # Button-Text
-            id={"type": "search-result", "index": i},  # Dynamische ID
-            color="light", 
-            className="w-100 mb-1 text-start",  # Volle Breite, kleiner Abstand
-            size="sm"
-        )
-        for i, r in enumerate(results[:5])  # Nur erste 5 Ergebnisse
-    ]
+    # Restliche Buttons leeren und ausblenden
+    missing = SEARCH_RESULT_SLOTS - len(results)
+    labels += [""] * missing
+    styles += [_HIDDEN] * missing
     
-    return buttons, results[:5]  # Rückgabe: Buttons und Daten
+    return *labels, *styles, results  # Rückgabe: Texte, Stile und Daten
 
 
 # (Balance displayed/updated by calculate_total)
 
 
+# ================================================================================
+# CALLBACK: GEKLICKTES SUCHERGEBNIS MERKEN (CLIENTSIDE)
+# ================================================================================
+# Läuft im Browser: Findet heraus, welcher der 5 Buttons geklickt wurde, und
+# schreibt dessen Nummer in "selected-search-idx". Der Server bekommt danach
+# nur diese eine Zahl statt aller Klick-Zähler.
+#
+# Zusätzlich wird ein Zeitstempel mitgeschickt: So ändert sich der Store auch
+# dann, wenn nach einer neuen Suche wieder derselbe Button geklickt wird.
+app.clientside_callback(
+    """
+    function() {
+        const triggered = dash_clientside.callback_context.triggered[0];
+        if (!triggered || !triggered.value) return window.dash_clientside.no_update;
+        
+        // "search-result-3.n_clicks" -> 3
+        const id = triggered.prop_id.split('.')[0];
+        const index = parseInt(id.split('-').pop(), 10);
+        return {index: index, t: Date.now()};
+    }
+    """,
+    Output("selected-search-idx", "data"),
+    *[Input(f"search-result-{i}", "n_clicks") for i in range(SEARCH_RESULT_SLOTS)],
+    prevent_initial_call=True
+)
+
+
 # ================================================================================
 # CALLBACK: AKTIE FÜR KAUF/VERKAUF AUSWÄHLEN
 # ================================================================================
 # Wird ausgelöst wenn der Benutzer auf einen Suchergebnis-Button klickt.
-# Verwendet Pattern Matching: Input({"type": "search-result", "index": dash.ALL}, ...)
-# Das ALL bedeutet: Reagiere auf ALLE Elemente dieses Typs
+# Den Index des Buttons liefert der Clientside-Callback oben über den Store
+# "selected-search-idx" - hier muss nur noch die Aktie angezeigt werden.
 @callback(
     Output("buy-stock-info", "children"),    # Aktien-Info Anzeige
     Output("buy-chart-container", "children"), # Mini-Chart im Modal
     Output("selected-ticker", "data"),       # Speichert ausgewählte Aktie
-    Input({"type": "search-result", "index": dash.ALL}, "n_clicks"),  # Pattern Match auf alle Buttons
+    Input("selected-search-idx", "data"),    # Index des geklickten Buttons
     State("search-results-store", "data"),   # Gespeicherte Suchergebnisse
     prevent_initial_call=True
 )
-def select_stock_for_buy(clicks, results):
+def select_stock_for_buy(selection, results):
     """
     Zeigt Details zur ausgewählten Aktie an wenn ein Suchergebnis geklickt wird.
     
     Parameter:
-    - clicks: Liste aller Klick-Zähler (einer pro Suchergebnis-Button)
+    - selection: {"index": nummer_des_buttons, "t": zeitstempel} aus dem Browser
     - results: Die gespeicherten Suchergebnisse
     
     Rückgabe: (aktien_info, chart, ticker_daten)
     """
     # Prüfe ob überhaupt geklickt wurde
-    if not any(clicks) or not results:
+    if not selection or not results:
         return "", "", None
     
-    # Finde den Index des geklickten Buttons
-    # next() findet das erste Element, das die Bedingung erfüllt
-    idx = next((i for i, c in enumerate(clicks) if c), 0)
+    idx = selection.get("index", 0)
     
     if idx >= len(results):
         return "", "", None
@@ -2521,15 +3755,11 @@ def select_stock_for_buy(clicks, results):
     stock = results[idx]
     symbol = stock["symbol"]
     
+    # Kurs immer neu holen: confirm_buy rechnet mit diesem Preis.
+    # Doppelklicks fängt der Kurs-Cache ab (PRICE_CACHE_TTL Sekunden)
     price, prev = fetch_price(symbol)
     if price:
-        color = "#22c55e" if prev and price >= prev else "#ef4444" if prev else "#000"
-        change = ""
-        if prev:
-            diff = price - prev
-            pct = (diff / prev) * 100
-            sign = "+" if diff >= 0 else ""
-            change = f" ({sign}{diff:.2f} / {sign}{pct:.2f}%)"
+        color, change = format_change(price, prev)
         info = html.Div([
             html.H5(f"{stock['name']} ({symbol})"),
             html.H4(f"{price:.2f} USD{change}", style={"color": color})
@@ -2542,31 +3772,47 @@ def select_stock_for_buy(clicks, results):
     chart_container = dcc.Graph(figure=fig, style={"height": "250px"})
     return info, chart_container, {"symbol": symbol, "name": stock["name"], "price": price}
 
-# Calculate Total and enforce balance
-@callback(
+# ================================================================================
+# CALLBACK: GESAMTBETRAG BERECHNEN (CLIENTSIDE)
+# ================================================================================
+# Wird bei jeder Änderung der Anzahl ausgelöst - also sehr oft!
+# Die Rechnung (Menge * Preis) ist trivial und läuft deshalb im Browser,
+# ohne Umweg über den Server. Der Kontostand kommt aus dem "balance-store".
+#
+# Ist der Gesamtbetrag größer als der Kontostand, wird "Kaufen" deaktiviert.
+# Kauf und Verkauf selbst bleiben Server-Callbacks (sie schreiben Dateien).
+app.clientside_callback(
+    """
+    function(qty, ticker, balance) {
+        // Zahl wie Python f"{x:,.2f}" formatieren (z.B. 10,000.00)
+        const fmt = (x) => Number(x).toLocaleString('en-US', {
+            minimumFractionDigits: 2, maximumFractionDigits: 2
+        });
+        balance = balance || 0;
+        const balanceText = 'Kontostand: ' + fmt(balance) + ' USD';
+        
+        // Ohne Aktie oder Menge: Nur Kontostand anzeigen, Kaufen deaktivieren
+        if (!ticker || !qty || !ticker.price) {
+            return ['', balanceText, true];
+        }
+        
+        const total = qty * ticker.price;
+        const totalHtml = {
+            namespace: 'dash_html_components',
+            type: 'H5',
+            props: {children: 'Gesamt: ' + fmt(total) + ' USD'}
+        };
+        return [totalHtml, balanceText, total > balance];
+    }
+    """,
     Output("buy-total", "children"),
     Output("buy-balance", "children"),
     Output("btn-confirm-buy", "disabled"),
     Input("buy-qty", "value"),
     Input("selected-ticker", "data"),
-    Input("portfolio-store", "data"),
+    Input("balance-store", "data"),
     prevent_initial_call=True
 )
-def calculate_total(qty, ticker, portfolio):
-
-    # load current balance
-    balance = load_balance()
-
-    # If no ticker or qty, still show balance but no total
-    if not ticker or not qty or not ticker.get("price"):
-        balance_html = html.Span(f"Kontostand: {balance:,.2f} USD")
-        return "", balance_html, True
-
-    total = qty * ticker["price"]
-    disabled = total > balance
-    total_html = html.H5(f"Gesamt: {total:,.2f} USD")
-    balance_html = html.Span(f"Kontostand: {balance:,.2f} USD")
-    return total_html, balance_html, disabled
 
 
 # ================================================================================
@@ -2599,74 +3845,74 @@ def confirm_buy(n, ticker, qty, portfolio):
     - qty: Gewünschte Kaufmenge
     - portfolio: Aktuelles Portfolio
     
-    Rückgabe: Das aktualisierte Portfolio
+    Rückgabe: Nur die Änderung am Portfolio (Patch) bzw. dash.no_update
+    
+    Statt das komplette Portfolio an den Browser zu schicken, wird mit Patch()
+    nur die geänderte Position übertragen. Schlägt die Validierung fehl,
+    ändert sich nichts und es wird gar nichts übertragen (no_update).
     """
     # Validierung: Alle erforderlichen Daten vorhanden?
     if not n or not ticker or not qty or not ticker.get("price"):
-        return portfolio or []
+        return dash.no_update
 
     # Sicherheitsprüfung: Genug Geld vorhanden?
     balance = load_balance()
     total_cost = int(qty) * float(ticker.get("price", 0))
 
     if total_cost > balance:
-        # Nicht genug Geld: Kauf abbrechen, Portfolio unverändert zurückgeben
-        return portfolio or []
+        # Nicht genug Geld: Kauf abbrechen, Portfolio bleibt unverändert
+        return dash.no_update
     
+    # Patch nur möglich, wenn im Browser schon eine Liste liegt
+    store_is_list = isinstance(portfolio, list)
     portfolio = portfolio or []  # Falls None, leere Liste verwenden
+    patch = Patch()
     
     # ===== Portfolio aktualisieren =====
     # Prüfen ob diese Aktie schon im Portfolio ist
-    found = False
-    for item in portfolio:
-        if item["symbol"] == ticker["symbol"]:
-            # Aktie bereits vorhanden: Durchschnittlichen Kaufpreis berechnen
-            # Formel: (alter_preis * alte_menge + neuer_preis * neue_menge) / gesamtmenge
-            old_qty = item["qty"]
-            old_price = item.get("buy_price") or item.get("avg_price", 0)
-            new_qty = old_qty + int(qty)
-            new_price = ((old_price * old_qty) + (ticker["price"] * int(qty))) / new_qty
-            
-            # Werte aktualisieren
-            item["qty"] = new_qty
-            item["buy_price"] = new_price
-            item["avg_price"] = new_price
-            found = True
-            break
-    
-    # Wenn Aktie noch nicht im Portfolio: Neue Position hinzufügen
-    if not found:
-        portfolio.append({
+    idx = find_position(portfolio, ticker["symbol"])
+    if idx is not None:
+        item = portfolio[idx]
+        # Aktie bereits vorhanden: Durchschnittlichen Kaufpreis berechnen
+        # Formel: (alter_preis * alte_menge + neuer_preis * neue_menge) / gesamtmenge
+        old_qty = item["qty"]
+        old_price = item.get("buy_price") or item.get("avg_price", 0)
+        new_qty = old_qty + int(qty)
+        new_price = ((old_price * old_qty) + (ticker["price"] * int(qty))) / new_qty
+        
+        # Werte aktualisieren (lokal und im Patch für den Browser)
+        item["qty"] = new_qty
+        item["buy_price"] = new_price
+        item["avg_price"] = new_price
+        patch[idx]["qty"] = new_qty
+        patch[idx]["buy_price"] = new_price
+        patch[idx]["avg_price"] = new_price
+    else:
+        # Aktie noch nicht im Portfolio: Neue Position hinzufügen
+        new_item = {
             "symbol": ticker["symbol"],
             "qty": int(qty),
             "buy_price": ticker["price"],
             "avg_price": ticker["price"]
-        })
-    
-    # Portfolio in Datei speichern
-    save_portfolio(portfolio)
+        }
+        portfolio.append(new_item)
+        patch.append(new_item)
     
-    # Transaktion in Historie speichern
-    save_transaction({
+    # ===== Speichern =====
+    # Portfolio, Transaktion und neuer Kontostand (Kaufpreis abgezogen)
+    # gemeinsam in einer Datenbank-Transaktion
+    save_trade(portfolio, {
         "timestamp": datetime.now().isoformat(),  # Aktuelles Datum/Zeit im ISO-Format
         "type": "buy",                            # Transaktionstyp
         "symbol": ticker["symbol"],
         "qty": int(qty),
         "price": ticker["price"]
-    })
+    }, balance - total_cost)
     
-    # ===== Kontostand aktualisieren =====
-    # Kaufpreis vom Kontostand abziehen
-    try:
-        current_balance = load_balance()
-        cost = int(qty) * float(ticker.get("price", 0))
-        current_balance -= cost
-        save_balance(current_balance)
-    except Exception:
-        # Bei Fehlern: Nichts weiter tun (Portfolio wurde trotzdem aktualisiert)
-        pass
+    # Gehandelte Aktie: Kurs beim nächsten Anzeigen frisch holen
+    invalidate_price(ticker["symbol"])
 
-    return portfolio
+    return patch if store_is_list else portfolio
 
 # ================================================================================
 # CALLBACK: VERKAUF BESTÄTIGEN
@@ -2698,58 +3944,52 @@ def confirm_sell(n, ticker, qty, portfolio):
     - qty: Zu verkaufende Menge
     - portfolio: Aktuelles Portfolio
     
-    Rückgabe: Das aktualisierte Portfolio
+    Rückgabe: Nur die Änderung am Portfolio (Patch) bzw. dash.no_update
     """
     # Validierung
     if not n or not ticker or not qty:
-        return portfolio or []
+        return dash.no_update
     
     symbol = ticker["symbol"]
     qty = int(qty)
     portfolio = portfolio or []
+    patch = Patch()
+    balance = load_balance()  # Nur einmal lesen
     
-    # ===== Position im Portfolio finden und aktualisieren =====
-    sold = False  # Flag um zu prüfen ob Verkauf erfolgreich war
-    for item in portfolio:
-        if item["symbol"] == symbol:
-            # Prüfen ob genug Aktien zum Verkaufen vorhanden sind
-            if item["qty"] >= qty:
-                item["qty"] -= qty  # Menge reduzieren
-                sold = True  # Verkauf war erfolgreich
-                
-                # Wenn alle Aktien verkauft: Position entfernen
-                if item["qty"] == 0:
-                    portfolio.remove(item)
-                break
+    # ===== Position im Portfolio finden =====
+    idx = find_position(portfolio, symbol)
     
-    # Nur wenn Verkauf erfolgreich war: Portfolio, Transaktion und Kontostand aktualisieren
-    if not sold:
+    # Nur wenn Verkauf möglich ist: Portfolio, Transaktion und Kontostand aktualisieren
+    if idx is None or portfolio[idx]["qty"] < qty:
         # Aktie nicht im Portfolio oder nicht genug Stücke vorhanden
-        return portfolio
+        return dash.no_update
+    
+    item = portfolio[idx]
+    item["qty"] -= qty  # Menge reduzieren
     
-    # Portfolio speichern
-    save_portfolio(portfolio)
+    # Wenn alle Aktien verkauft: Position entfernen
+    if item["qty"] == 0:
+        del portfolio[idx]
+        del patch[idx]
+    else:
+        patch[idx]["qty"] = item["qty"]
     
-    # Transaktion in Historie speichern
-    save_transaction({
+    # ===== Speichern =====
+    # Portfolio, Transaktion und neuer Kontostand (Erlös addiert)
+    # gemeinsam in einer Datenbank-Transaktion
+    proceeds = qty * float(ticker.get("price", 0))  # Erlös = Menge * Preis
+    save_trade(portfolio, {
         "timestamp": datetime.now().isoformat(),
         "type": "sell",  # Verkauf
         "symbol": symbol,
         "qty": qty,
         "price": ticker.get("price", 0)
-    })
+    }, balance + proceeds)
     
-    # ===== Kontostand aktualisieren =====
-    # Verkaufserlös zum Kontostand addieren
-    try:
-        current_balance = load_balance()
-        proceeds = qty * float(ticker.get("price", 0))  # Erlös = Menge * Preis
-        current_balance += proceeds
-        save_balance(current_balance)
-    except Exception:
-        pass
+    # Verkaufte Aktie: Kurs beim nächsten Anzeigen frisch holen
+    invalidate_price(symbol)
 
-    return portfolio
+    return patch
 
 # Transactions Modal
 # ================================================================================
@@ -2765,15 +4005,20 @@ def confirm_sell(n, ticker, qty, portfolio):
 # - Berechnung von Zusammenfassungs-Statistiken (Summe Käufe, Verkäufe, Saldo)
 #
 # Die Tabelle verwendet dash_table.DataTable für erweiterte Funktionen:
-# - Pagination (seitenweise Anzeige)
-# - Native Sortierung und Filterung
+# - Pagination (seitenweise Anzeige) - die Seiten kommen aus der Datenbank
+# - Sortierung und Filterung (ebenfalls in der Datenbank, siehe unten)
 # - Bedingte Formatierung (grün für Käufe, rot für Verkäufe)
 # ================================================================================
 @callback(
     # --- Outputs: Was der Callback aktualisiert ---
     Output("transactions-modal", "is_open"),         # Modal öffnen/schließen
     Output("transactions-table", "children"),        # Tabellen-Inhalt
-    Output("transactions-summary", "children"),      # Zusammenfassungs-Karten
+    Output("transactions-summary", "style"),         # Zusammenfassung ein-/ausblenden
+    Output("tx-count-val", "children"),              # Anzahl Transaktionen
+    Output("tx-buy-val", "children"),                # Summe Käufe
+    Output("tx-sell-val", "children"),               # Summe Verkäufe
+    Output("tx-saldo-val", "children"),              # Saldo
+    Output("tx-saldo-val", "className"),             # Farbe des Saldos
     Output("tx-year", "options"),                    # Jahr-Dropdown-Optionen
     
     # --- Inputs: Was den Callback auslöst ---
@@ -2800,54 +4045,46 @@ def toggle_transactions(n1, n2, year, month, tx_type, is_open):
         is_open: Aktueller Modal-Zustand
     
     Returns:
-        Tuple: (Modal-Status, Tabellen-Inhalt, Zusammenfassung, Jahr-Optionen)
+        Tuple: (Modal-Status, Tabellen-Inhalt, Sichtbarkeit der Zusammenfassung,
+                vier Zahlen der Zusammenfassung + Saldo-Farbe, Jahr-Optionen)
+    
+    Die Zusammenfassungs-Karte steht fest im Layout - übertragen werden
+    nur die vier Texte, nicht die komplette Karte.
     """
     triggered = ctx.triggered_id
     
-    if triggered in ["btn-transactions", "btn-close-tx"]:
-        is_open = not is_open
+    # Alle Outputs außer dem Modal-Status unverändert lassen
+    unchanged = (dash.no_update,) * 8
+    
+    # Schließen: Tabelle ist danach unsichtbar -> nichts neu berechnen
+    if triggered == "btn-close-tx":
+        return (False, *unchanged)
     
-    txs = load_transactions()
+    if triggered == "btn-transactions":
+        is_open = not is_open
+    elif not is_open:
+        # Filter geändert, aber Modal ist zu -> Inhalt wird beim Öffnen gebaut
+        return (is_open, *unchanged)
     
     # Jahr-Optionen
-    years = sorted(set(datetime.fromisoformat(t["timestamp"]).year for t in txs), reverse=True) if txs else []
+    years = transaction_years()
     year_options = [{"label": "Alle Jahre", "value": "all"}] + [{"label": str(y), "value": str(y)} for y in years]
     
-    # Filtern
-    filtered = txs
-    if year and year != "all":
-        filtered = [t for t in filtered if datetime.fromisoformat(t["timestamp"]).year == int(year)]
-    if month and month != "all":
-        filtered = [t for t in filtered if datetime.fromisoformat(t["timestamp"]).month == int(month)]
-    if tx_type and tx_type != "all":
-        filtered = [t for t in filtered if t["type"] == tx_type]
+    # Filtern und Summieren übernimmt die Datenbank; an den Browser geht
+    # nur die erste Seite - weitere Seiten lädt update_transactions_page()
+    totals = get_transaction_totals(year, month, tx_type)
     
-    if not filtered:
-        return is_open, html.P("Keine Transaktionen vorhanden", className="text-muted"), "", year_options
+    if not totals["count"]:
+        return (is_open, html.P("Keine Transaktionen vorhanden", className="text-muted"), {"display": "none"},
+                dash.no_update, dash.no_update, dash.no_update, dash.no_update, dash.no_update, year_options)
     
-    rows = []
-    total_buy = 0
-    total_sell = 0
+    total_buy = totals["buy"]
+    total_sell = totals["sell"]
     
-    for t in sorted(filtered, key=lambda x: x["timestamp"], reverse=True):
-        dt = datetime.fromisoformat(t["timestamp"])
-        total = t["qty"] * t["price"]
-        if t["type"] == "buy":
-            total_buy += total
-        else:
-            total_sell += total
-        
-        rows.append({
-            "Datum": dt.strftime("%d.%m.%Y"),
-            "Zeit": dt.strftime("%H:%M"),
-            "Typ": "Kauf" if t["type"] == "buy" else "Verkauf",
-            "Symbol": t["symbol"],
-            "Menge": t["qty"],
-            "Kurs": f"{t['price']:.2f}",
-            "Gesamt": f"{total:.2f}"
-        })
+    rows, page_count = get_transaction_page(year, month, tx_type)
     
     table = dash_table.DataTable(
+        id="tx-datatable",
         data=rows,
         columns=[{"name": c, "id": c} for c in ["Datum", "Zeit", "Typ", "Symbol", "Menge", "Kurs", "Gesamt"]],
         style_cell={
@@ -2873,38 +4110,58 @@ def toggle_transactions(n1, n2, year, month, tx_type, is_open):
             {"if": {"filter_query": "{Typ} = 'Kauf'"}, "backgroundColor": "#1a472a", "color": "#22c55e"},
             {"if": {"filter_query": "{Typ} = 'Verkauf'"}, "backgroundColor": "#4a1a1a", "color": "#ef4444"},
         ],
-        page_size=50,  # Zeigt bis zu 50 Transaktionen
-        page_action="native",
-        sort_action="native",
+        page_size=TX_PAGE_SIZE,  # Zeigt bis zu 50 Transaktionen pro Seite
+        page_current=0,
+        page_count=page_count,
+        # "custom" = Seiten, Sortierung und Filter berechnet der Server
+        page_action="custom",
+        sort_action="custom",
         sort_mode="single",
-        filter_action="native"
+        filter_action="custom"
     )
     
     saldo = total_sell - total_buy
-    summary = dbc.Card([
-        dbc.CardBody([
-            dbc.Row([
-                dbc.Col([
-                    html.H6("📊 Transaktionen", className="text-muted mb-1"),
-                    html.H4(f"{len(filtered)}", className="text-info mb-0")
-                ], width=3, className="text-center"),
-                dbc.Col([
-                    html.H6("💵 Käufe", className="text-muted mb-1"),
-                    html.H4(f"${total_buy:,.2f}", className="text-success mb-0")
-                ], width=3, className="text-center"),
-                dbc.Col([
-                    html.H6("💸 Verkäufe", className="text-muted mb-1"),
-                    html.H4(f"${total_sell:,.2f}", className="text-danger mb-0")
-                ], width=3, className="text-center"),
-                dbc.Col([
-                    html.H6("📈 Saldo", className="text-muted mb-1"),
-                    html.H4(f"${saldo:+,.2f}", className=f"text-{'success' if saldo >= 0 else 'danger'} mb-0")
-                ], width=3, className="text-center"),
-            ])
-        ])
-    ], className="mt-3 border-0", style={"background": "linear-gradient(135deg, #1a1a2e 0%, #16213e 100%)"})
+    saldo_class = f"text-{'success' if saldo >= 0 else 'danger'} mb-0"
+    
+    return (is_open, table, {"display": "block"},
+            f"{totals['count']}", f"${total_buy:,.2f}", f"${total_sell:,.2f}", f"${saldo:+,.2f}", saldo_class,
+            year_options)
+
+
+# ================================================================================
+# TRANSAKTIONSTABELLE - Seitenweise aus der Datenbank laden
+# ================================================================================
+# Blättern, Sortieren oder Filtern in der Tabelle löst diesen Callback aus.
+# Er holt per LIMIT/OFFSET genau die sichtbare Seite aus SQLite - auch bei
+# tausenden Transaktionen werden so nur 50 Zeilen übertragen.
+#
+# prevent_initial_call=True: Die erste Seite liefert bereits toggle_transactions()
+# ================================================================================
+@callback(
+    Output("tx-datatable", "data"),
+    Output("tx-datatable", "page_count"),
+    Input("tx-datatable", "page_current"),
+    Input("tx-datatable", "sort_by"),
+    Input("tx-datatable", "filter_query"),
+    State("tx-year", "value"),
+    State("tx-month", "value"),
+    State("tx-type", "value"),
+    prevent_initial_call=True
+)
+def update_transactions_page(page_current, sort_by, filter_query, year, month, tx_type):
+    """
+    Lädt die angeforderte Seite der Transaktionstabelle.
+    
+    Args:
+        page_current: Aktuelle Seite (0 = erste Seite)
+        sort_by: Sortierung der Tabelle
+        filter_query: Inhalt der Filterzeile
+        year, month, tx_type: Werte der Filter-Dropdowns
     
-    return is_open, table, summary, year_options
+    Returns:
+        Tuple: (Tabellenzeilen, Anzahl Seiten)
+    """
+    return get_transaction_page(year, month, tx_type, page_current, sort_by, filter_query)
 
 # ================================================================================
 # TICKER DETAIL MODAL - Market Overview Detailansicht
@@ -2917,14 +4174,10 @@ def toggle_transactions(n1, n2, year, month, tx_type, is_open):
 # - Zeitraum-Buttons für verschiedene Ansichten (1 Tag, 1 Woche, 1 Monat, 3 Monate)
 # - Aktuelle Statistiken (Kurs, Hoch, Tief, Volumen)
 #
-# Dynamische Inputs:
-# - Die Inputs werden dynamisch für alle MARKET_OVERVIEW_SYMBOLS generiert
-# - Das ermöglicht Klick-Handler für jeden einzelnen Ticker
-# - List Comprehension erstellt für jedes Symbol einen eigenen Input
-#
-# *args Pattern:
-# - Weil die Anzahl der Inputs variabel ist, werden alle als *args übergeben
-# - Der Code muss dann die einzelnen Argumente extrahieren
+# Pattern Matching:
+# - Alle Ticker haben eine ID der Form {"type": "ticker", "name": ...}
+# - Ein einziger Input mit ALL reagiert auf Klicks auf jeden Ticker
+# - ctx.triggered_id["name"] verrät, welcher Ticker geklickt wurde
 # ================================================================================
 @callback(
     # --- Outputs ---
@@ -2938,36 +4191,26 @@ def toggle_transactions(n1, n2, year, month, tx_type, is_open):
     Output("ticker-btn-1m", "active"),               # Aktiv-Status 1-Monat Button
     Output("ticker-btn-3m", "active"),               # Aktiv-Status 3-Monate Button
     
-    # --- Dynamische Inputs für alle Ticker + Kontroll-Buttons ---
-    # Für jedes Symbol in MARKET_OVERVIEW_SYMBOLS wird ein Input erstellt
-    [Input(f"ticker-{s['name']}", "n_clicks") for s in MARKET_OVERVIEW_SYMBOLS] +
-    # Plus die Kontroll-Buttons für Schließen und Zeitraum-Wechsel
-    [Input("btn-close-ticker", "n_clicks"),
-     Input("ticker-btn-1d", "n_clicks"),             # 1-Tages-Ansicht
-     Input("ticker-btn-1w", "n_clicks"),             # 1-Wochen-Ansicht
-     Input("ticker-btn-1m", "n_clicks"),             # 1-Monats-Ansicht
-     Input("ticker-btn-3m", "n_clicks")],            # 3-Monats-Ansicht
+    # --- Inputs: Ein Pattern-Matching-Input für alle Ticker + Kontroll-Buttons ---
+    Input({"type": "ticker", "name": dash.ALL}, "n_clicks"),
+    Input("btn-close-ticker", "n_clicks"),
+    Input("ticker-btn-1d", "n_clicks"),              # 1-Tages-Ansicht
+    Input("ticker-btn-1w", "n_clicks"),              # 1-Wochen-Ansicht
+    Input("ticker-btn-1m", "n_clicks"),              # 1-Monats-Ansicht
+    Input("ticker-btn-3m", "n_clicks"),              # 3-Monats-Ansicht
     
     # --- States ---
     State("ticker-modal", "is_open"),
     State("current-ticker-symbol", "data"),          # Gespeichertes Symbol für Zeitraum-Wechsel
     prevent_initial_call=True
 )
-def toggle_ticker_modal(*args):
+def toggle_ticker_modal(ticker_clicks, close_click, n_1d, n_1w, n_1m, n_3m, is_open, current_symbol):
     """
     Verwaltet das Ticker-Detail-Modal.
     
-    Verwendet *args weil die Anzahl der Inputs dynamisch ist
-    (abhängig von der Anzahl der Symbole in MARKET_OVERVIEW_SYMBOLS).
+    Alle Ticker der Marktübersicht kommen über EINEN Pattern-Matching-Input
+    (ticker_clicks ist eine Liste); welcher geklickt wurde, steht in ctx.triggered_id.
     """
-    # Parse arguments
-    num_tickers = len(MARKET_OVERVIEW_SYMBOLS)
-    ticker_clicks = args[:num_tickers]
-    close_click = args[num_tickers]
-    period_clicks = args[num_tickers+1:num_tickers+5]
-    is_open = args[-2]
-    current_symbol = args[-1]
-    
     triggered = ctx.triggered_id
     
     if triggered == "btn-close-ticker":
@@ -2984,55 +4227,55 @@ def toggle_ticker_modal(*args):
     # Bestimme welcher Button aktiv sein soll
     btn_ids = ["ticker-btn-1d", "ticker-btn-1w", "ticker-btn-1m", "ticker-btn-3m"]
     
-    if triggered in period_map and current_symbol:
+    if isinstance(triggered, str) and triggered in period_map and current_symbol:
         period, interval = period_map[triggered]
         fig = create_stock_chart(current_symbol["symbol"], period, interval)
         btn_states = [triggered == btn for btn in btn_ids]
         return True, current_symbol["header"], current_symbol["stats"], fig, current_symbol, *btn_states
     
-    # Finde geklickten Ticker
-    for i, s in enumerate(MARKET_OVERVIEW_SYMBOLS):
-        if triggered == f"ticker-{s['name']}":
-            symbol = s["symbol"]
-            name = s["name"]
-            
-            price, prev = fetch_price(symbol)
-            if s.get("invert") and price:
-                price = 1 / price
-                if prev:
-                    prev = 1 / prev
-            
-            # Stats
-            try:
-                t = yf.Ticker(symbol)
-                fast = t.fast_info if hasattr(t, "fast_info") else {}
-                high = getattr(fast, "day_high", None)
-                low = getattr(fast, "day_low", None)
-                vol = getattr(fast, "last_volume", None)
-            except:
-                high, low, vol = None, None, None
-            
-            price_text = f"{price:.4f}" if price else "n/a"
-            high_text = f"{high:.2f}" if high else "n/a"
-            low_text = f"{low:.2f}" if low else "n/a"
-            
-            stats = html.Div([
-                dbc.Row([
-                    dbc.Col([html.B("Kurs: "), price_text], width=3),
-                    dbc.Col([html.B("High: "), high_text], width=3),
-                    dbc.Col([html.B("Low: "), low_text], width=3),
-                    dbc.Col([html.B("Vol: "), format_volume(vol)], width=3),
-                ])
+    # Finde geklickten Ticker (triggered_id ist z.B. {"type": "ticker", "name": "DAX"})
+    s = _NAME_TO_SYMBOL.get(triggered["name"]) if isinstance(triggered, dict) else None
+    if s:
+        symbol = s["symbol"]
+        name = s["name"]
+        
+        price, prev = fetch_price(symbol)
+        if s.get("invert") and price:
+            price = 1 / price
+            if prev:
+                prev = 1 / prev
+        
+        # Stats
+        try:
+            # Gleiches (zwischengespeichertes) Ticker-Objekt wie fetch_price
+            _, fast = _get_ticker(symbol)
+            high = getattr(fast, "day_high", None)
+            low = getattr(fast, "day_low", None)
+            vol = getattr(fast, "last_volume", None)
+        except:
+            high, low, vol = None, None, None
+        
+        price_text = f"{price:.4f}" if price else "n/a"
+        high_text = f"{high:.2f}" if high else "n/a"
+        low_text = f"{low:.2f}" if low else "n/a"
+        
+        stats = html.Div([
+            dbc.Row([
+                dbc.Col([html.B("Kurs: "), price_text], width=3),
+                dbc.Col([html.B("High: "), high_text], width=3),
+                dbc.Col([html.B("Low: "), low_text], width=3),
+                dbc.Col([html.B("Vol: "), format_volume(vol)], width=3),
             ])
-            
-            fig = create_stock_chart(symbol, "1d", "5m")
-            header = f"{name} ({symbol})"
-            
-            # Speichere Symbol-Info für Zeitraum-Wechsel
-            symbol_data = {"symbol": symbol, "name": name, "header": header, "stats": stats}
-            
-            # 1T ist standardmäßig aktiv wenn Modal geöffnet wird
-            return True, header, stats, fig, symbol_data, True, False, False, False
+        ])
+        
+        fig = create_stock_chart(symbol, "1d", "5m")
+        header = f"{name} ({symbol})"
+        
+        # Speichere Symbol-Info für Zeitraum-Wechsel
+        symbol_data = {"symbol": symbol, "name": name, "header": header, "stats": stats}
+        
+        # 1T ist standardmäßig aktiv wenn Modal geöffnet wird
+        return True, header, stats, fig, symbol_data, True, False, False, False
     
     return is_open, "", "", go.Figure(), current_symbol, True, False, False, False
 
@@ -3061,22 +4304,7 @@ def sentiment_search_stocks(search_query):
     Returns:
         Tuple: (Dropdown-Optionen, vorausgewählter Wert)
     """
-    if not search_query or len(search_query) < 2:
-        return [], None
-    
-    results = search_stocks(search_query)
-    if not results:
-        return [{"label": "Keine Ergebnisse gefunden", "value": "", "disabled": True}], None
-    
-    options = [
-        {"label": f"{r['name']} ({r['symbol']}) - {r['exchange']}", "value": r['symbol']}
-        for r in results
-    ]
-    
-    # Wenn nur ein Ergebnis, direkt auswählen
-    default_value = results[0]['symbol'] if len(results) == 1 else None
-    
-    return options, default_value
+    return search_dropdown(search_query)
 
 # ================================================================================
 # SENTIMENT ANALYSE - Hauptanalyse-Callback
@@ -3098,13 +4326,33 @@ def sentiment_search_stocks(search_query):
 # ================================================================================
 @callback(
     Output("ai-sentiment-output", "children"),       # Ergebnis-Container
+    Output("sentiment-last", "data"),                # Schlüssel der angezeigten Analyse
     Input("btn-sentiment-analyze", "n_clicks"),      # "Analysieren"-Button
     State("sentiment-stock-dropdown", "value"),      # Ausgewählte Aktie
     State("sentiment-period-select", "value"),       # Zeitraum (1 Monat, 3 Monate, etc.)
     State("sentiment-news-count", "value"),          # Anzahl News zu analysieren
+    State("sentiment-last", "data"),                 # Schlüssel der letzten Analyse
+    # Als Hintergrund-Callback ausführen, falls diskcache installiert ist
+    background=BACKGROUND_AVAILABLE,
+    manager=background_manager,
+    # Button während der Analyse deaktivieren (verhindert Doppelklicks)
+    running=[(Output("btn-sentiment-analyze", "disabled"), True, False)],
     prevent_initial_call=True
 )
-def sentiment_analyze_callback(n_clicks, symbol, period, news_count):
+def sentiment_analyze_callback(n_clicks, symbol, period, news_count, last_key):
+    """
+    Startet die Analyse - aber nur, wenn sich die Eingaben seit dem
+    angezeigten Ergebnis geändert haben. Sonst bleibt die Anzeige stehen.
+    """
+    key = analysis_key(symbol, period, news_count)
+    if key == last_key:
+        raise dash.exceptions.PreventUpdate
+    output = _render_sentiment(n_clicks, symbol, period, news_count)
+    # Fehlermeldungen nicht merken - ein erneuter Klick versucht es nochmal
+    return output, (dash.no_update if isinstance(output, dbc.Alert) else key)
+
+
+def _render_sentiment(n_clicks, symbol, period, news_count):
     """
     Führt eine Sentiment-Analyse für die ausgewählte Aktie durch.
     
@@ -3231,21 +4479,7 @@ def corr_search_stocks(search_query):
     """
     Sucht Aktien für die Korrelationsanalyse.
     """
-    if not search_query or len(search_query) < 2:
-        return [], None
-    
-    results = search_stocks(search_query)
-    if not results:
-        return [{"label": "Keine Ergebnisse gefunden", "value": "", "disabled": True}], None
-    
-    options = [
-        {"label": f"{r['name']} ({r['symbol']}) - {r['exchange']}", "value": r['symbol']}
-        for r in results
-    ]
-    
-    default_value = results[0]['symbol'] if len(results) == 1 else None
-    
-    return options, default_value
+    return search_dropdown(search_query)
 
 # ================================================================================
 # KORRELATIONS-ANALYSE - Hauptanalyse-Callback
@@ -3267,13 +4501,34 @@ def corr_search_stocks(search_query):
 # ================================================================================
 @callback(
     Output("corr-output", "children"),               # Ergebnis-Container
+    Output("corr-last", "data"),                     # Schlüssel der angezeigten Analyse
     Input("btn-corr-analyze", "n_clicks"),           # "Analysieren"-Button
     State("corr-stock-dropdown", "value"),           # Ausgewählte Aktie
     State("corr-period-select", "value"),            # Zeitraum
     State("corr-news-count", "value"),               # Anzahl News
+    State("corr-last", "data"),                      # Schlüssel der letzten Analyse
+    # Als Hintergrund-Callback (gleiche Eingaben -> Anzeige bleibt stehen, siehe *-last)
+    background=BACKGROUND_AVAILABLE,
+    manager=background_manager,
+    running=[(Output("btn-corr-analyze", "disabled"), True, False)],
     prevent_initial_call=True
 )
-def correlation_analyze_callback(n_clicks, symbol, period, news_count):
+def correlation_analyze_callback(n_clicks, symbol, period, news_count, last_key):
+    """
+    Startet die Analyse - aber nur, wenn sich die Eingaben seit dem
+    angezeigten Ergebnis geändert haben. Sonst bleibt die Anzeige stehen
+    (erneuter Klick = keine Arbeit, keine Datenübertragung).
+    """
+    key = analysis_key(symbol, period, news_count)
+    if key == last_key:
+        raise dash.exceptions.PreventUpdate
+    output = _render_correlation(n_clicks, symbol, period, news_count)
+    # Fehlermeldungen nicht merken - ein erneuter Klick versucht es nochmal
+    # (der Hintergrund-Manager hebt keine Ergebnisse auf, siehe background_manager)
+    return output, (dash.no_update if isinstance(output, dbc.Alert) else key)
+
+
+def _render_correlation(n_clicks, symbol, period, news_count):
     """
     Berechnet die Korrelation zwischen News-Sentiment und Kursbewegung.
     
@@ -3389,45 +4644,47 @@ def forecast_search_callback(search_term):
     """
     Sucht Aktien für die Prognose-Funktion.
     
-    Verwendet Yahoo Finance API direkt statt der globalen search_stocks(),
-    um die Implementierung zu demonstrieren.
+    Nutzt die zwischengespeicherte search_stocks() - gleiche Suchbegriffe
+    (auch aus anderen Tabs) lösen keine neue Anfrage an Yahoo aus.
     """
     if not search_term or len(search_term) < 2:
         return [], None
     
-    options = []
-    try:
-        url = f"https://query1.finance.yahoo.com/v1/finance/search?q={search_term}&quotesCount=10&newsCount=0"
-        headers = {"User-Agent": "Mozilla/5.0"}
-        resp = requests.get(url, headers=headers, timeout=5)
-        data = resp.json()
-        
-        for quote in data.get("quotes", []):
-            symbol = quote.get("symbol", "")
-            name = quote.get("shortname", "") or quote.get("longname", "")
-            qtype = quote.get("quoteType", "")
-            
-            if qtype in ["EQUITY", "ETF"] and symbol:
-                label = f"{symbol} - {name}" if name else symbol
-                options.append({"label": label, "value": symbol})
-    except:
-        pass
-    
-    default_value = options[0]["value"] if options else None
-    return options, default_value
+    return search_options(search_term)
 
 
 # --- ARIMA-Prognose Hauptanalyse ---
 # Dieser Callback führt die eigentliche ARIMA-Prognose durch
 @callback(
     Output("ai-forecast-output", "children"),        # Ergebnis-Container
+    Output("forecast-last", "data"),                 # Schlüssel der angezeigten Analyse
     Input("btn-forecast-analyze", "n_clicks"),       # "Analysieren"-Button
     State("forecast-stock-dropdown", "value"),       # Ausgewählte Aktie
     State("forecast-history-select", "value"),       # Historische Daten (z.B. "1y" für 1 Jahr)
     State("forecast-days-select", "value"),          # Prognose-Horizont in Tagen
+    State("forecast-last", "data"),                  # Schlüssel der letzten Analyse
+    # Als Hintergrund-Callback (gleiche Eingaben -> Anzeige bleibt stehen, siehe *-last)
+    background=BACKGROUND_AVAILABLE,
+    manager=background_manager,
+    running=[(Output("btn-forecast-analyze", "disabled"), True, False)],
     prevent_initial_call=True
 )
-def forecast_analyze_callback(n_clicks, symbol, history_period, forecast_days):
+def forecast_analyze_callback(n_clicks, symbol, history_period, forecast_days, last_key):
+    """
+    Startet die Analyse - aber nur, wenn sich die Eingaben seit dem
+    angezeigten Ergebnis geändert haben. Sonst bleibt die Anzeige stehen
+    (erneuter Klick = keine Arbeit, keine Datenübertragung).
+    """
+    key = analysis_key(symbol, history_period, forecast_days)
+    if key == last_key:
+        raise dash.exceptions.PreventUpdate
+    output = _render_forecast(n_clicks, symbol, history_period, forecast_days)
+    # Fehlermeldungen nicht merken - ein erneuter Klick versucht es nochmal
+    # (der Hintergrund-Manager hebt keine Ergebnisse auf, siehe background_manager)
+    return output, (dash.no_update if isinstance(output, dbc.Alert) else key)
+
+
+def _render_forecast(n_clicks, symbol, history_period, forecast_days):
     """
     Führt eine ARIMA-basierte Kursprognose durch.
     
@@ -3570,40 +4827,42 @@ def mc_search_callback(search_term):
     if not search_term or len(search_term) < 2:
         return [], None
     
-    options = []
-    try:
-        url = f"https://query1.finance.yahoo.com/v1/finance/search?q={search_term}&quotesCount=10&newsCount=0"
-        headers = {"User-Agent": "Mozilla/5.0"}
-        resp = requests.get(url, headers=headers, timeout=5)
-        data = resp.json()
-        
-        for quote in data.get("quotes", []):
-            symbol = quote.get("symbol", "")
-            name = quote.get("shortname", "") or quote.get("longname", "")
-            qtype = quote.get("quoteType", "")
-            
-            if qtype in ["EQUITY", "ETF"] and symbol:
-                label = f"{symbol} - {name}" if name else symbol
-                options.append({"label": label, "value": symbol})
-    except:
-        pass
-    
-    default_value = options[0]["value"] if options else None
-    return options, default_value
+    return search_options(search_term)
 
 
 # --- Monte-Carlo Hauptanalyse ---
 # Dieser Callback führt die Monte-Carlo-Simulation durch
 @callback(
     Output("mc-output", "children"),                 # Ergebnis-Container
+    Output("mc-last", "data"),                       # Schlüssel der angezeigten Analyse
     Input("btn-mc-analyze", "n_clicks"),             # "Analysieren"-Button
     State("mc-stock-dropdown", "value"),             # Ausgewählte Aktie
     State("mc-history-select", "value"),             # Historische Daten für Volatilität
     State("mc-days-select", "value"),                # Prognose-Horizont
     State("mc-simulations-select", "value"),         # Anzahl Simulationen
+    State("mc-last", "data"),                        # Schlüssel der letzten Analyse
+    # Als Hintergrund-Callback (gleiche Eingaben -> Anzeige bleibt stehen, siehe *-last)
+    background=BACKGROUND_AVAILABLE,
+    manager=background_manager,
+    running=[(Output("btn-mc-analyze", "disabled"), True, False)],
     prevent_initial_call=True
 )
-def monte_carlo_analyze_callback(n_clicks, symbol, history_period, forecast_days, num_simulations):
+def monte_carlo_analyze_callback(n_clicks, symbol, history_period, forecast_days, num_simulations, last_key):
+    """
+    Startet die Analyse - aber nur, wenn sich die Eingaben seit dem
+    angezeigten Ergebnis geändert haben. Sonst bleibt die Anzeige stehen
+    (erneuter Klick = keine Arbeit, keine Datenübertragung).
+    """
+    key = analysis_key(symbol, history_period, forecast_days, num_simulations)
+    if key == last_key:
+        raise dash.exceptions.PreventUpdate
+    output = _render_monte_carlo(n_clicks, symbol, history_period, forecast_days, num_simulations)
+    # Fehlermeldungen nicht merken - ein erneuter Klick versucht es nochmal
+    # (der Hintergrund-Manager hebt keine Ergebnisse auf, siehe background_manager)
+    return output, (dash.no_update if isinstance(output, dbc.Alert) else key)
+
+
+def _render_monte_carlo(n_clicks, symbol, history_period, forecast_days, num_simulations):
     """
     Führt eine Monte-Carlo-Simulation für die Kursprognose durch.
     
@@ -5,11 +5,15 @@ import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import yfinance as yf
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
-import re
 from pathlib import Path
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from html import unescape
+import xml.etree.ElementTree as ET
+from io import BytesIO
 import pandas as pd
 from flask import Flask, request, session, redirect
 
@@ -216,7 +220,9 @@ def protect():
 DATA_DIR = Path(__file__).parent / "gui"
 DATA_DIR.mkdir(exist_ok=True)
 PORTFOLIO_FILE = DATA_DIR / "portfolio.json"
-TRANSACTIONS_FILE = DATA_DIR / "transactions.json"
+# Transaktionen als JSON Lines (eine Transaktion pro Zeile) -> neue Trades werden nur angehängt
+TRANSACTIONS_FILE = DATA_DIR / "transactions.jsonl"
+LEGACY_TRANSACTIONS_FILE = DATA_DIR / "transactions.json"
 BALANCE_FILE = DATA_DIR / "balance.json"
 
 # ============== Market Overview Symbole ==============
@@ -244,18 +250,58 @@ def load_portfolio():
 def save_portfolio(data):
     PORTFOLIO_FILE.write_text(json.dumps(data, indent=2), encoding="utf-8")
 
+def find_position(portfolio, symbol):
+    # Position der Aktie in der Liste (erster Treffer) oder None
+    return next((i for i, item in enumerate(portfolio) if item["symbol"] == symbol), None)
+
+# zuletzt gelesene Transaktionen: Datei-Stand (mtime, Größe) -> Liste und DataFrame
+_TX_CACHE = {"key": None, "txs": [], "df": None}
+
 def load_transactions():
-    if TRANSACTIONS_FILE.exists():
+    # altes Format (eine große JSON-Liste) einmalig in JSON Lines übernehmen
+    if not TRANSACTIONS_FILE.exists() and LEGACY_TRANSACTIONS_FILE.exists():
         try:
-            return json.loads(TRANSACTIONS_FILE.read_text(encoding="utf-8"))
+            txs = json.loads(LEGACY_TRANSACTIONS_FILE.read_text(encoding="utf-8"))
+            TRANSACTIONS_FILE.write_text("".join(json.dumps(tx) + "\n" for tx in txs), encoding="utf-8")
         except:
             return []
+    if TRANSACTIONS_FILE.exists():
+        # Datei unverändert -> gemerkte Liste, nicht neu lesen/parsen
+        st = TRANSACTIONS_FILE.stat()
+        key = (st.st_mtime_ns, st.st_size)
+        if _TX_CACHE["key"] == key:
+            return _TX_CACHE["txs"]
+        txs = []
+        with TRANSACTIONS_FILE.open(encoding="utf-8") as f:
+            for line in f:
+                try:
+                    txs.append(json.loads(line))
+                except ValueError:
+                    # leere oder halb geschriebene Zeile überspringen
+                    continue
+        _TX_CACHE.update(key=key, txs=txs, df=None)
+        return txs
     return []
 
-def save_transaction(tx):
+def load_transactions_df():
+    # Transaktionen als DataFrame mit geparsten Zeitstempeln ("ts") und Gesamtbetrag,
+    # wird nur neu gebaut wenn sich die Datei geändert hat
     txs = load_transactions()
-    txs.append(tx)
-    TRANSACTIONS_FILE.write_text(json.dumps(txs, indent=2), encoding="utf-8")
+    if not txs:
+        return None
+    if _TX_CACHE["df"] is None or _TX_CACHE["txs"] is not txs:
+        df = pd.DataFrame(txs)
+        df["ts"] = pd.to_datetime(df["timestamp"], format="ISO8601")
+        df["total"] = df["qty"] * df["price"]
+        _TX_CACHE["df"] = df
+    return _TX_CACHE["df"]
+
+def save_transaction(tx):
+    # nur eine Zeile anhängen statt die ganze Historie neu zu schreiben
+    if not TRANSACTIONS_FILE.exists():
+        load_transactions()
+    with TRANSACTIONS_FILE.open("a", encoding="utf-8") as f:
+        f.write(json.dumps(tx) + "\n")
 
 def load_balance():
     if BALANCE_FILE.exists():
@@ -280,6 +326,57 @@ def fetch_price(symbol):
         pass
     return None, None
 
+# Tageswerte fürs Ticker-Modal: symbol -> (zeitstempel, (high, low, volume))
+_FAST_INFO = {}
+
+def fetch_fast_info(symbol, ttl=60):
+    # jedes yf.Ticker + fast_info kostet Anfragen -> Werte ttl Sekunden merken
+    cached = _FAST_INFO.get(symbol)
+    if cached and time.monotonic() - cached[0] < ttl:
+        return cached[1]
+    try:
+        fast = yf.Ticker(symbol).fast_info
+        values = (getattr(fast, "day_high", None), getattr(fast, "day_low", None),
+                  getattr(fast, "last_volume", None))
+    except Exception:
+        # Fehler nicht merken -> beim nächsten Öffnen neu versuchen
+        return None, None, None
+    if len(_FAST_INFO) >= 64:
+        _FAST_INFO.pop(next(iter(_FAST_INFO)))  # ältesten Eintrag entfernen
+    _FAST_INFO[symbol] = (time.monotonic(), values)
+    return values
+
+# Ergebnisse der Sammelabrufe: sortierte Symbole -> (zeitstempel, {symbol: (preis, vortag)})
+# (Marktübersicht und Portfolio fragen unterschiedliche Symbol-Listen ab)
+_BATCH_PRICES = {}
+
+def fetch_prices_batch(symbols, ttl=15):
+    # ein yf.download für alle Symbole (intern parallel), Ergebnis ttl Sekunden merken
+    key = tuple(sorted(set(symbols)))
+    if not key:
+        return {}
+    cached = _BATCH_PRICES.get(key)
+    if cached and time.monotonic() - cached[0] < ttl:
+        return cached[1]
+    try:
+        # period="5d", damit auch am Montag/nach Feiertagen ein Vortag dabei ist
+        data = yf.download(tickers=" ".join(key), period="5d", interval="1d",
+                           group_by="ticker", threads=True, progress=False, auto_adjust=False)
+    except Exception:
+        data = None
+    result = {}
+    for sym in key:
+        try:
+            closes = data[sym]["Close"].dropna()
+            result[sym] = (float(closes.iloc[-1]), float(closes.iloc[-2]) if len(closes) > 1 else None)
+        except Exception:
+            # keine Daten im Sammelabruf -> einzeln versuchen
+            result[sym] = fetch_price(sym)
+    if len(_BATCH_PRICES) >= 32:
+        _BATCH_PRICES.pop(next(iter(_BATCH_PRICES)), None)
+    _BATCH_PRICES[key] = (time.monotonic(), result)
+    return result
+
 def fetch_name(symbol):
     try:
         t = yf.Ticker(symbol)
@@ -288,6 +385,14 @@ def fetch_name(symbol):
     except:
         return symbol
 
+def fetch_names_bulk(symbols, max_workers=8):
+    # t.info ist die langsamste Yahoo-Anfrage -> alle Namen parallel in Threads holen
+    symbols = list(dict.fromkeys(symbols))
+    if not symbols:
+        return {}
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(symbols))) as ex:
+        return dict(zip(symbols, ex.map(fetch_name, symbols)))
+
 def fetch_stock_history(symbol, period="1mo", interval="1d"):
     try:
         t = yf.Ticker(symbol)
@@ -296,12 +401,22 @@ def fetch_stock_history(symbol, period="1mo", interval="1d"):
     except:
         return None
 
+# eine Session für alle HTTP-Anfragen: Verbindungen bleiben offen (Keep-Alive),
+# kurze Netzwerkfehler werden wiederholt
+_HTTP_SESSION = requests.Session()
+_HTTP_SESSION.headers.update({"User-Agent": "Mozilla/5.0"})
+_HTTP_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=16,
+    max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=[502, 503, 504]),
+))
+
 def search_stocks(query):
     if not query or len(query) < 2:
         return []
     try:
         url = f"https://query1.finance.yahoo.com/v1/finance/search?q={query}&quotesCount=10&newsCount=0"
-        resp = requests.get(url, timeout=5, headers={"User-Agent": "Mozilla/5.0"})
+        resp = _HTTP_SESSION.get(url, timeout=5)
         data = resp.json()
         results = []
         for q in data.get("quotes", []):
@@ -315,22 +430,28 @@ def search_stocks(query):
     except:
         return []
 
+# ein Thread-Pool für alle News-Abrufe (wird wiederverwendet statt bei jedem Refresh neu erstellt)
+_NEWS_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix="news")
+
 def fetch_google_news(symbol, limit=20):
     try:
         url = f"https://news.google.com/rss/search?q={symbol}+stock&hl=de&gl=DE&ceid=DE:de"
-        resp = requests.get(url, timeout=10, headers={"User-Agent": "Mozilla/5.0"})
-        items = re.findall(r"<item>(.*?)</item>", resp.text, re.DOTALL)
+        resp = _HTTP_SESSION.get(url, timeout=10)
         news = []
-        for item in items[:limit]:
-            title_m = re.search(r"<title>(.*?)</title>", item)
-            link_m = re.search(r"<link>(.*?)</link>", item)
-            pub_m = re.search(r"<pubDate>(.*?)</pubDate>", item)
-            source_m = re.search(r"<source.*?>(.*?)</source>", item)
-            title = unescape(title_m.group(1)) if title_m else "News"
-            link = link_m.group(1) if link_m else ""
-            pub = pub_m.group(1) if pub_m else ""
-            source = unescape(source_m.group(1)) if source_m else ""
-            news.append({"title": title, "link": link, "pubDate": pub, "source": source, "symbol": symbol})
+        # XML-Parser in einem Durchlauf (Entities wie &amp; löst er selbst auf),
+        # nach 'limit' Items aufhören
+        try:
+            for _, item in ET.iterparse(BytesIO(resp.content)):
+                if item.tag != "item":
+                    continue
+                news.append({"title": item.findtext("title") or "News", "link": item.findtext("link") or "",
+                             "pubDate": item.findtext("pubDate") or "", "source": item.findtext("source") or "",
+                             "symbol": symbol})
+                item.clear()
+                if len(news) >= limit:
+                    break
+        except ET.ParseError:
+            pass  # kaputtes XML: bisher gelesene Items behalten
         return news
     except:
         return []
@@ -346,7 +467,26 @@ def format_volume(vol):
         return f"{vol/1_000:.1f}K"
     return str(vol)
 
+# Cache für fertige Kurs-Charts: (symbol, period, interval) -> (zeitstempel, figure-dict)
+_CHART_CACHE = {}
+
 def create_stock_chart(symbol, period="1mo", interval="1d"):
+    # gleicher Chart kurz hintereinander (z.B. Klick auf 1T/1W/1M) kommt aus dem Cache,
+    # Intraday-Charts 1 Minute, Tages-Charts 10 Minuten
+    key = (symbol, period, interval)
+    ttl = 60 if interval.endswith(("m", "h")) else 600
+    cached = _CHART_CACHE.get(key)
+    if cached and time.monotonic() - cached[0] < ttl:
+        return go.Figure(cached[1])
+    fig = _build_stock_chart(symbol, period, interval)
+    # leere Charts nicht merken, nur das Dictionary speichern (jeder Aufruf bekommt eine neue Figur)
+    if fig.data:
+        if len(_CHART_CACHE) >= 256:
+            _CHART_CACHE.pop(next(iter(_CHART_CACHE)), None)
+        _CHART_CACHE[key] = (time.monotonic(), fig.to_dict())
+    return fig
+
+def _build_stock_chart(symbol, period="1mo", interval="1d"):
     hist = fetch_stock_history(symbol, period, interval)
     if hist is None or hist.empty:
         fig = go.Figure()
@@ -395,6 +535,9 @@ def create_stock_chart(symbol, period="1mo", interval="1d"):
     )
     return fig
 
+# Farbpalette für das Kreisdiagramm, Farbwinkel im goldenen Winkel (137°) verteilt
+_PIE_PALETTE = [f"hsl({i * 137 % 360}, 70%, 50%)" for i in range(64)]
+
 def create_portfolio_pie_chart(portfolio):
     if not portfolio:
         fig = go.Figure()
@@ -406,17 +549,19 @@ def create_portfolio_pie_chart(portfolio):
         labels = []
         values = []
         colors = []
+        # alle Kurse mit einem Sammelabruf
+        prices = fetch_prices_batch([item["symbol"] for item in portfolio])
         
         for item in portfolio:
             symbol = item["symbol"]
             qty = item["qty"]
-            current_price, _ = fetch_price(symbol)
+            current_price, _ = prices.get(symbol, (None, None))
             if current_price:
                 value = qty * current_price
                 values.append(value)
                 labels.append(symbol)
-                # Zufällige Farben oder feste Palette
-                colors.append(f"hsl({hash(symbol) % 360}, 70%, 50%)")
+                # feste Palette nach Position (stabil über Neustarts, anders als hash())
+                colors.append(_PIE_PALETTE[(len(values) - 1) % len(_PIE_PALETTE)])
         
         if not values:
             fig = go.Figure()
@@ -465,6 +610,8 @@ def create_portfolio_value_chart(portfolio):
         data_list = []
         total_invested = 0
         total_current = 0
+        names = fetch_names_bulk([item.get("symbol", "") for item in portfolio])
+        prices = fetch_prices_batch([item.get("symbol", "") for item in portfolio])
         
         for item in portfolio:
             symbol = item.get("symbol", "")
@@ -473,20 +620,14 @@ def create_portfolio_value_chart(portfolio):
             invested = qty * buy_price
             total_invested += invested
             
-            try:
-                current_price, _ = fetch_price(symbol)
-            except:
-                current_price = None
+            current_price, _ = prices.get(symbol, (None, None))
                 
             if current_price:
                 current_value = qty * current_price
                 total_current += current_value
                 pnl = current_value - invested
                 pnl_pct = (pnl / invested) * 100 if invested > 0 else 0
-                try:
-                    name = fetch_name(symbol) or symbol
-                except:
-                    name = symbol
+                name = names.get(symbol) or symbol
                 data_list.append({
                     "symbol": symbol,
                     "name": name,
@@ -637,49 +778,59 @@ def create_portfolio_total_value_chart(portfolio, days=30):
         return empty_fig("Keine Positionen im Portfolio")
 
     try:
-        totals = {}
+        closes, qtys = [], []
         end = datetime.date.today()
         start = end - datetime.timedelta(days=days)
 
+        # hole historische Preise (täglicher Schlusskurs) für alle Symbole per Sammelabruf,
+        # Yahoo verarbeitet ca. 20 Symbole pro Anfrage -> in Blöcken zu 20 abfragen
+        symbols = list(dict.fromkeys(item.get("symbol") for item in portfolio if item.get("symbol") and item.get("qty", 0)))
+        histories = {}
+        for i in range(0, len(symbols), 20):
+            chunk = symbols[i:i + 20]
+            try:
+                data = yf.download(tickers=" ".join(chunk), period=f"{days}d", interval="1d",
+                                   group_by="ticker", threads=True, progress=False)
+            except Exception:
+                continue
+            for sym in chunk:
+                try:
+                    hist = data[sym] if isinstance(data.columns, pd.MultiIndex) else data
+                    histories[sym] = hist.dropna(subset=["Close"])
+                except Exception:
+                    continue
+
         for item in portfolio:
             symbol = item.get("symbol")
             qty = item.get("qty", 0)
             if not symbol or qty == 0:
                 continue
 
-            # hole historische Preise (täglicher Schlusskurs)
-            hist = fetch_stock_history(symbol, period=f"{days}d", interval="1d")
+            hist = histories.get(symbol)
             if hist is None or hist.empty:
                 continue
 
-            for idx, row in hist.iterrows():
-                # idx ist ein Timestamp
-                try:
-                    dt = idx.date()
-                except Exception:
-                    # falls idx kein DatetimeIndex-Element ist
-                    try:
-                        dt = datetime.date.fromtimestamp(idx.timestamp())
-                    except Exception:
-                        continue
+            # Schlusskurse der Position je Tag (ganze Spalte auf einmal statt Zeile für Zeile),
+            # Zeitraum per Slice auf dem sortierten DatetimeIndex (Binärsuche statt Vergleich je Zeile);
+            # Datums-Strings funktionieren mit und ohne Zeitzone am Index
+            series = hist["Close"].sort_index().loc[str(start):str(end)].astype(float)
+            series.index = pd.DatetimeIndex(series.index).date
+            closes.append(series)
+            qtys.append(float(qty))
 
-                if dt < start or dt > end:
-                    continue
-
-                try:
-                    close = row.get("Close") if isinstance(row, dict) or hasattr(row, "get") else row["Close"]
-                    value = float(close) * qty
-                except Exception:
-                    continue
-
-                totals.setdefault(dt, 0.0)
-                totals[dt] += value
+        if not closes:
+            return empty_fig("Keine historischen Preise verfügbar")
 
-        if not totals:
+        # Matrix Tage x Positionen; fehlende Kurse zählen mit 0 (wie zuvor bei add(fill_value=0)).
+        # Gesamtwert je Tag = Matrix-Vektor-Produkt mit den Stückzahlen (ein BLAS-Aufruf)
+        matrix = pd.concat(closes, axis=1).fillna(0.0)
+        total = matrix.dot(qtys)
+        if total.empty:
             return empty_fig("Keine historischen Preise verfügbar")
 
-        dates = sorted(totals.keys())
-        values = [totals[d] for d in dates]
+        total = total.sort_index()
+        dates = list(total.index)
+        values = total.tolist()
 
         fig = go.Figure()
         fig.add_trace(go.Scatter(x=dates, y=values, mode="lines+markers", name="Gesamtwert", line=dict(color="#0ea5a4")))
@@ -841,6 +992,7 @@ app.layout = dbc.Container([
     dcc.Store(id="portfolio-store", data=load_portfolio()),
     dcc.Store(id="search-results-store", data=[]),
     dcc.Store(id="theme-store", data="dark"),  # Theme Store
+    dcc.Store(id="balance-store", data=load_balance()),  # Kontostand für die Rechnung im Browser
     
     # Header mit Theme Toggle
     dbc.Row([
@@ -1390,6 +1542,11 @@ app.layout = dbc.Container([
 
 # ============== Callbacks ==============
 
+# Übersetzungstabelle für die deutsche Zahlenschreibweise
+_DE_NUMBER = str.maketrans(",.", ".,")
+# Farben: gefallen / gleich / gestiegen
+_TICKER_COLORS = ("#ef4444", "#000000", "#22c55e")
+
 # Market Ticker Update
 @callback(
     [Output(f"ticker-{s['name']}", "children") for s in MARKET_OVERVIEW_SYMBOLS] +
@@ -1399,8 +1556,10 @@ app.layout = dbc.Container([
 def update_market_tickers(n):
     texts = []
     styles = []
+    # alle Kurse mit einem Sammelabruf statt einer Anfrage pro Symbol
+    prices = fetch_prices_batch([s["symbol"] for s in MARKET_OVERVIEW_SYMBOLS])
     for s in MARKET_OVERVIEW_SYMBOLS:
-        price, prev = fetch_price(s["symbol"])
+        price, prev = prices.get(s["symbol"], (None, None))
         if s.get("invert") and price:
             price = 1 / price
             if prev:
@@ -1411,13 +1570,11 @@ def update_market_tickers(n):
             styles.append({"cursor": "pointer", "borderRadius": "5px", "background": "#f8f9fa", "padding": "8px"})
         else:
             decimals = s.get("decimals", 2)
-            formatted = f"{price:,.{decimals}f}".replace(",", "X").replace(".", ",").replace("X", ".")
+            # "," <-> "." in einem Durchlauf tauschen (1,234.56 -> 1.234,56)
+            formatted = f"{price:,.{decimals}f}".translate(_DE_NUMBER)
             
-            if prev:
-                diff = price - prev
-                color = "#22c55e" if diff > 0.0001 else "#ef4444" if diff < -0.0001 else "#000000"
-            else:
-                color = "#000000"
+            diff = price - prev if prev else 0.0
+            color = _TICKER_COLORS[(diff > 0.0001) - (diff < -0.0001) + 1]
             
             texts.append(html.Span([html.B(s["name"]), f": {formatted}"], style={"color": color, "fontWeight": "bold"}))
             styles.append({"cursor": "pointer", "borderRadius": "5px", "background": "#f8f9fa", "padding": "8px"})
@@ -1509,16 +1666,18 @@ def update_portfolio(portfolio):
         stock_cards = []
         total_invested = 0
         total_value = 0
+        names = fetch_names_bulk([item["symbol"] for item in portfolio])
+        prices = fetch_prices_batch([item["symbol"] for item in portfolio])
         
         for item in portfolio:
             symbol = item["symbol"]
-            name = fetch_name(symbol) or symbol
+            name = names.get(symbol) or symbol
             qty = item["qty"]
             buy_price = item.get("buy_price") or item.get("avg_price", 0)
             invested = qty * buy_price
             total_invested += invested
             
-            current_price, _ = fetch_price(symbol)
+            current_price, _ = prices.get(symbol, (None, None))
             if current_price:
                 value = qty * current_price
                 total_value += value
@@ -1739,10 +1898,9 @@ def update_market_news(n, category, search_term):
         targets = category_targets.get(category, category_targets["news-all"])
         news_limit = 4
     
-    all_news = []
-    for target in targets:
-        news = fetch_google_news(target, news_limit)
-        all_news.extend(news)
+    # alle Feeds gleichzeitig abrufen (reine Wartezeit aufs Netzwerk), Reihenfolge bleibt erhalten
+    results = _NEWS_EXECUTOR.map(lambda target: fetch_google_news(target, news_limit), targets)
+    all_news = [n for news in results for n in news]
     
     if not all_news:
         return html.Div([
@@ -1911,6 +2069,7 @@ def update_market_news(n, category, search_term):
 # Buy/Sell Modal Toggle
 @callback(
     Output("buy-sell-modal", "is_open"),
+    Output("balance-store", "data"),
     Input("btn-buy-sell", "n_clicks"),
     Input("btn-close-modal", "n_clicks"),
     Input("btn-confirm-buy", "n_clicks"),
@@ -1919,7 +2078,10 @@ def update_market_news(n, category, search_term):
     prevent_initial_call=True
 )
 def toggle_buy_sell_modal(n1, n2, n3, n4, is_open):
-    return not is_open
+    # beim Öffnen aktuellen Kontostand an den Browser geben (für die Gesamtsumme)
+    if not is_open:
+        return True, load_balance()
+    return False, dash.no_update
 
 # Kontostand Modal Toggle
 @callback(
@@ -2035,30 +2197,35 @@ def select_stock_for_buy(clicks, results):
     return info, chart_container, {"symbol": symbol, "name": stock["name"], "price": price}
 
 # Calculate Total and enforce balance
-@callback(
+# läuft im Browser (jede Eingabe in buy-qty), Kontostand kommt aus balance-store
+app.clientside_callback(
+    """
+    function(qty, ticker, balance) {
+        const fmt = (x) => Number(x).toLocaleString('en-US', {
+            minimumFractionDigits: 2, maximumFractionDigits: 2
+        });
+        balance = balance || 0;
+        const balanceText = 'Kontostand: ' + fmt(balance) + ' USD';
+        if (!ticker || !qty || !ticker.price) {
+            return ['', balanceText, true];
+        }
+        const total = qty * ticker.price;
+        const totalHtml = {
+            namespace: 'dash_html_components',
+            type: 'H5',
+            props: {children: 'Gesamt: ' + fmt(total) + ' USD'}
+        };
+        return [totalHtml, balanceText, total > balance];
+    }
+    """,
     Output("buy-total", "children"),
     Output("buy-balance", "children"),
     Output("btn-confirm-buy", "disabled"),
     Input("buy-qty", "value"),
     Input("selected-ticker", "data"),
-    Input("portfolio-store", "data"),
+    Input("balance-store", "data"),
     prevent_initial_call=True
 )
-def calculate_total(qty, ticker, portfolio):
-
-    # load current balance
-    balance = load_balance()
-
-    # If no ticker or qty, still show balance but no total
-    if not ticker or not qty or not ticker.get("price"):
-        balance_html = html.Span(f"Kontostand: {balance:,.2f} USD")
-        return "", balance_html, True
-
-    total = qty * ticker["price"]
-    disabled = total > balance
-    total_html = html.H5(f"Gesamt: {total:,.2f} USD")
-    balance_html = html.Span(f"Kontostand: {balance:,.2f} USD")
-    return total_html, balance_html, disabled
 
 # Confirm Buy
 @callback(
@@ -2084,21 +2251,18 @@ def confirm_buy(n, ticker, qty, portfolio):
     portfolio = portfolio or []
     
     # Prüfen ob schon vorhanden
-    found = False
-    for item in portfolio:
-        if item["symbol"] == ticker["symbol"]:
-            # Gewichteter Durchschnitt berechnen
-            old_qty = item["qty"]
-            old_price = item.get("buy_price") or item.get("avg_price", 0)
-            new_qty = old_qty + int(qty)
-            new_price = ((old_price * old_qty) + (ticker["price"] * int(qty))) / new_qty
-            item["qty"] = new_qty
-            item["buy_price"] = new_price
-            item["avg_price"] = new_price
-            found = True
-            break
-    
-    if not found:
+    idx = find_position(portfolio, ticker["symbol"])
+    if idx is not None:
+        item = portfolio[idx]
+        # Gewichteter Durchschnitt berechnen
+        old_qty = item["qty"]
+        old_price = item.get("buy_price") or item.get("avg_price", 0)
+        new_qty = old_qty + int(qty)
+        new_price = ((old_price * old_qty) + (ticker["price"] * int(qty))) / new_qty
+        item["qty"] = new_qty
+        item["buy_price"] = new_price
+        item["avg_price"] = new_price
+    else:
         portfolio.append({
             "symbol": ticker["symbol"],
             "qty": int(qty),
@@ -2116,15 +2280,8 @@ def confirm_buy(n, ticker, qty, portfolio):
         "price": ticker["price"]
     })
     
-    # Kontostand anpassen: Betrag abziehen
-    try:
-        current_balance = load_balance()
-        cost = int(qty) * float(ticker.get("price", 0))
-        current_balance -= cost
-        save_balance(current_balance)
-    except Exception:
-        # Falls Balance-Funktionen fehlen oder fehlschlagen, nichts weiter tun
-        pass
+    # Kontostand anpassen: Betrag abziehen (balance/total_cost von oben)
+    save_balance(balance - total_cost)
 
     return portfolio
 
@@ -2146,13 +2303,12 @@ def confirm_sell(n, ticker, qty, portfolio):
     portfolio = portfolio or []
     
     # Finde Position im Portfolio
-    for item in portfolio:
-        if item["symbol"] == symbol:
-            if item["qty"] >= qty:
-                item["qty"] -= qty
-                if item["qty"] == 0:
-                    portfolio.remove(item)
-                break
+    idx = find_position(portfolio, symbol)
+    if idx is not None and portfolio[idx]["qty"] >= qty:
+        portfolio[idx]["qty"] -= qty
+        if portfolio[idx]["qty"] == 0:
+            # per Position löschen statt remove() (das müsste erneut suchen)
+            del portfolio[idx]
     
     save_portfolio(portfolio)
     
@@ -2195,45 +2351,42 @@ def toggle_transactions(n1, n2, year, month, tx_type, is_open):
     if triggered in ["btn-transactions", "btn-close-tx"]:
         is_open = not is_open
     
-    txs = load_transactions()
+    # Zeitstempel sind schon geparst (nur neu, wenn sich die Datei geändert hat)
+    df = load_transactions_df()
+    year_options = [{"label": "Alle Jahre", "value": "all"}]
+    if df is None:
+        return is_open, html.P("Keine Transaktionen vorhanden", className="text-muted"), "", year_options
     
     # Jahr-Optionen
-    years = sorted(set(datetime.fromisoformat(t["timestamp"]).year for t in txs), reverse=True) if txs else []
-    year_options = [{"label": "Alle Jahre", "value": "all"}] + [{"label": str(y), "value": str(y)} for y in years]
+    years = sorted(df["ts"].dt.year.unique(), reverse=True)
+    year_options += [{"label": str(y), "value": str(y)} for y in years]
     
-    # Filtern
-    filtered = txs
+    # Filtern (eine Maske statt mehrerer Listen)
+    mask = pd.Series(True, index=df.index)
     if year and year != "all":
-        filtered = [t for t in filtered if datetime.fromisoformat(t["timestamp"]).year == int(year)]
+        mask &= df["ts"].dt.year == int(year)
     if month and month != "all":
-        filtered = [t for t in filtered if datetime.fromisoformat(t["timestamp"]).month == int(month)]
+        mask &= df["ts"].dt.month == int(month)
     if tx_type and tx_type != "all":
-        filtered = [t for t in filtered if t["type"] == tx_type]
+        mask &= df["type"] == tx_type
+    filtered = df[mask].sort_values("ts", ascending=False)
     
-    if not filtered:
+    if filtered.empty:
         return is_open, html.P("Keine Transaktionen vorhanden", className="text-muted"), "", year_options
     
-    rows = []
-    total_buy = 0
-    total_sell = 0
+    sums = filtered.groupby("type")["total"].sum()
+    total_buy = float(sums.get("buy", 0.0))
+    total_sell = float(sums.drop("buy", errors="ignore").sum())  # alles außer Kauf zählt als Verkauf
     
-    for t in sorted(filtered, key=lambda x: x["timestamp"], reverse=True):
-        dt = datetime.fromisoformat(t["timestamp"])
-        total = t["qty"] * t["price"]
-        if t["type"] == "buy":
-            total_buy += total
-        else:
-            total_sell += total
-        
-        rows.append({
-            "Datum": dt.strftime("%d.%m.%Y"),
-            "Zeit": dt.strftime("%H:%M"),
-            "Typ": "Kauf" if t["type"] == "buy" else "Verkauf",
-            "Symbol": t["symbol"],
-            "Menge": t["qty"],
-            "Kurs": f"{t['price']:.2f}",
-            "Gesamt": f"{total:.2f}"
-        })
+    rows = pd.DataFrame({
+        "Datum": filtered["ts"].dt.strftime("%d.%m.%Y"),
+        "Zeit": filtered["ts"].dt.strftime("%H:%M"),
+        "Typ": filtered["type"].map(lambda t: "Kauf" if t == "buy" else "Verkauf"),
+        "Symbol": filtered["symbol"],
+        "Menge": filtered["qty"],
+        "Kurs": filtered["price"].map("{:.2f}".format),
+        "Gesamt": filtered["total"].map("{:.2f}".format),
+    }).to_dict("records")
     
     table = dash_table.DataTable(
         data=rows,
@@ -2350,15 +2503,8 @@ def toggle_ticker_modal(*args):
                 if prev:
                     prev = 1 / prev
             
-            # Stats
-            try:
-                t = yf.Ticker(symbol)
-                fast = t.fast_info if hasattr(t, "fast_info") else {}
-                high = getattr(fast, "day_high", None)
-                low = getattr(fast, "day_low", None)
-                vol = getattr(fast, "last_volume", None)
-            except:
-                high, low, vol = None, None, None
+            # Stats (60 s zwischengespeichert)
+            high, low, vol = fetch_fast_info(symbol)
             
             price_text = f"{price:.4f}" if price else "n/a"
             high_text = f"{high:.2f}" if high else "n/a"
@@ -2637,8 +2783,7 @@ def forecast_search_callback(search_term):
     options = []
     try:
         url = f"https://query1.finance.yahoo.com/v1/finance/search?q={search_term}&quotesCount=10&newsCount=0"
-        headers = {"User-Agent": "Mozilla/5.0"}
-        resp = requests.get(url, headers=headers, timeout=5)
+        resp = _HTTP_SESSION.get(url, timeout=5)
         data = resp.json()
         
         for quote in data.get("quotes", []):
@@ -2767,8 +2912,7 @@ def mc_search_callback(search_term):
     options = []
     try:
         url = f"https://query1.finance.yahoo.com/v1/finance/search?q={search_term}&quotesCount=10&newsCount=0"
-        headers = {"User-Agent": "Mozilla/5.0"}
-        resp = requests.get(url, headers=headers, timeout=5)
+        resp = _HTTP_SESSION.get(url, timeout=5)
         data = resp.json()
         
         for quote in data.get("quotes", []):
@@ -36,6 +36,9 @@ AUTOR: Stock Dashboard Team
 # requests: HTTP-Bibliothek zum Abrufen von RSS-Feeds aus dem Internet
 import requests
 
+# HTTPAdapter: Verbindungs-Pool für eine requests.Session (Keep-Alive)
+from requests.adapters import HTTPAdapter
+
 # re: Regular Expressions (Reguläre Ausdrücke) zum Parsen von XML/HTML
 # Wird verwendet um Titel, Daten und andere Infos aus RSS-Feeds zu extrahieren
 import re
@@ -76,6 +79,30 @@ from datetime import datetime, timedelta
 # - Wichtig für saubere Titel aus RSS-Feeds
 from html import unescape
 
+# ProcessPoolExecutor: Verteilt Arbeit auf mehrere Prozesse (= CPU-Kerne)
+# - Wird für die Sentiment-Berechnung sehr vieler News verwendet
+# ThreadPoolExecutor: Mehrere Aufgaben gleichzeitig in Threads
+# - Wird für das parallele Laden der RSS-Feeds und für Timeouts verwendet
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+# hashlib: Prüfsummen (z.B. MD5) - als Cache-Schlüssel für Kursdaten
+import hashlib
+
+# time: Zeitstempel für den Speicher-Cache
+import time
+
+# threading: Lock für den Speicher-Cache (Feeds werden parallel geladen)
+import threading
+
+# Path: Plattformunabhängige Dateipfade (für das Cache-Verzeichnis)
+from pathlib import Path
+
+# wraps: Übernimmt Name und Docstring einer Funktion in einen Decorator
+from functools import wraps
+
+# importlib.util: Prüfen, ob eine Bibliothek installiert ist, OHNE sie zu laden
+import importlib.util
+
 # ================================================================================
 # OPTIONALE BIBLIOTHEKEN - Mit Verfügbarkeitsprüfung
 # ================================================================================
@@ -120,17 +147,33 @@ except ImportError:
 # 4. Erkennt Emoticons und Slang
 #
 # Output: compound Score von -1 (sehr negativ) bis +1 (sehr positiv)
+#
+# Das Laden des Wörterbuchs kostet beim Start Zeit und Speicher. Deshalb wird hier
+# nur geprüft, OB vaderSentiment installiert ist - importiert und erstellt wird
+# der Analyzer erst bei der ersten Sentiment-Berechnung (siehe _get_analyzer()).
+VADER_AVAILABLE = importlib.util.find_spec("vaderSentiment") is not None
+_analyzer = None
+
+# --- Numba JIT-Compiler ---
+# Numba übersetzt Python-Funktionen beim ersten Aufruf in Maschinencode.
+# - @njit: Kompiliert die Funktion (ohne Python-Objekte = schnell)
+# - prange: Schleife wird auf mehrere CPU-Kerne verteilt
+# Wird für die Monte-Carlo-Simulation genutzt; ohne Numba rechnet NumPy.
 try:
-    from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
-    VADER_AVAILABLE = True
-    
-    # Eine globale Instanz des Analyzers erstellen (Performance)
-    # So muss nicht bei jedem Aufruf ein neuer Analyzer erstellt werden
-    _analyzer = SentimentIntensityAnalyzer()
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
 except ImportError:
-    # Falls vaderSentiment nicht installiert ist
-    VADER_AVAILABLE = False
-    _analyzer = None
+    NUMBA_AVAILABLE = False
+
+# --- CuPy für Berechnungen auf der Grafikkarte (NVIDIA/CUDA) ---
+# CuPy bietet fast dieselben Funktionen wie NumPy, rechnet aber auf der GPU.
+# Nur sinnvoll, wenn wirklich eine CUDA-fähige Grafikkarte vorhanden ist.
+try:
+    import cupy as cp
+    CUPY_AVAILABLE = cp.cuda.runtime.getDeviceCount() > 0
+except Exception:
+    # Nicht installiert, kein CUDA-Treiber oder keine Grafikkarte
+    CUPY_AVAILABLE = False
 
 
 # ================================================================================
@@ -226,6 +269,177 @@ STATIC_RSS_FEEDS = [
 ]
 
 
+# Obergrenze für die Threads beim gleichzeitigen Abrufen der Feeds.
+# Verwendet wird ein Thread pro Feed (+1 für den Firmennamen), also alle
+# Abrufe in EINER Runde - höchstens so viele, wie die Session Verbindungen
+# pro Server offen hält (pool_maxsize=32).
+RSS_FETCH_WORKERS = 32
+
+
+# ================================================================================
+# HTTP-SESSION - Wiederverwendbare Verbindungen für alle Feed-Abrufe
+# ================================================================================
+# requests.get() baut für jede Anfrage eine neue Verbindung auf (TCP + TLS-Handshake,
+# oft ~100ms). Eine Session hält die Verbindungen offen (Keep-Alive) - bei der
+# nächsten Analyse gehen die Anfragen an dieselben Feed-Server ohne neuen Handshake.
+# - pool_connections: Anzahl Server, deren Verbindungen gemerkt werden
+# - pool_maxsize: Gleichzeitige Verbindungen pro Server (Feeds werden parallel geladen)
+_HTTP_SESSION = requests.Session()
+_HTTP_SESSION.headers.update({
+    # Browser-Identifikation (Chrome auf Windows) - ohne User-Agent blocken manche Server
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    
+    # Akzeptierte Inhaltstypen (XML-Formate für RSS)
+    "Accept": "application/rss+xml, application/xml, text/xml, */*",
+    
+    # Bevorzugte Sprachen
+    "Accept-Language": "en-US,en;q=0.9,de;q=0.8",
+})
+_HTTP_SESSION.mount("https://", HTTPAdapter(pool_connections=16, pool_maxsize=32))
+
+
+# ================================================================================
+# NETZWERK-CACHE - Feeds, Kurse und Firmennamen nicht bei jedem Klick neu laden
+# ================================================================================
+# Jede Analyse lädt dieselben RSS-Feeds und Kursdaten erneut - das dauert
+# Sekunden. Innerhalb der Gültigkeitsdauer kommt das Ergebnis aus dem Cache.
+#
+# Wie beim ARIMA-Cache: Mit diskcache liegt der Cache auf der Festplatte
+# (.cache/net - überlebt Neustarts, gilt auch für die Prozesse der
+# Hintergrund-Callbacks), sonst im Speicher.
+# Leere Ergebnisse (Fehler, Timeout) werden NICHT gespeichert.
+RSS_CACHE_SECONDS = 15 * 60              # Feeds: 15 Minuten
+PRICE_HISTORY_CACHE_SECONDS = 60 * 60    # Tageskurse: 1 Stunde
+COMPANY_NAME_CACHE_SECONDS = 24 * 60 * 60  # Firmennamen: 24 Stunden
+NET_CACHE_MAXSIZE = 256                  # Nur für den Speicher-Cache
+
+try:
+    import diskcache
+    _NET_CACHE = diskcache.Cache(str(Path(__file__).parent / ".cache" / "net"))
+except ImportError:
+    _NET_CACHE = None
+_NET_MEMORY_CACHE = {}  # schlüssel -> (zeitstempel, wert)
+_NET_MEMORY_LOCK = threading.Lock()
+
+
+def _net_cache_get(key: str, ttl: float):
+    """
+    Liest einen Wert aus dem Netzwerk-Cache.
+    
+    Args:
+        key: Cache-Schlüssel, z.B. "rss|https://..."
+        ttl: Gültigkeitsdauer in Sekunden (nur für den Speicher-Cache,
+             diskcache kennt das Ablaufdatum selbst)
+    
+    Returns:
+        Der gespeicherte Wert oder None
+    """
+    if _NET_CACHE is not None:
+        try:
+            return _NET_CACHE.get(key)
+        except Exception:
+            return None
+    with _NET_MEMORY_LOCK:
+        entry = _NET_MEMORY_CACHE.get(key)
+    return entry[1] if entry and time.monotonic() - entry[0] < ttl else None
+
+
+def _net_cache_set(key: str, value, ttl: float):
+    """
+    Speichert einen Wert im Netzwerk-Cache.
+    
+    Args:
+        key: Cache-Schlüssel
+        value: Der Wert (muss für diskcache picklebar sein)
+        ttl: Gültigkeitsdauer in Sekunden
+    """
+    if _NET_CACHE is not None:
+        try:
+            _NET_CACHE.set(key, value, expire=ttl)
+        except Exception:
+            pass  # Cache ist nur eine Beschleunigung - Fehler ignorieren
+        return
+    with _NET_MEMORY_LOCK:
+        if key not in _NET_MEMORY_CACHE and len(_NET_MEMORY_CACHE) >= NET_CACHE_MAXSIZE:
+            # Ältesten Eintrag entfernen
+            oldest = min(_NET_MEMORY_CACHE, key=lambda k: _NET_MEMORY_CACHE[k][0])
+            del _NET_MEMORY_CACHE[oldest]
+        _NET_MEMORY_CACHE[key] = (time.monotonic(), value)
+
+
+# ================================================================================
+# ERGEBNIS-CACHE FÜR ANALYSEN
+# ================================================================================
+# Korrelation, Prognose und Monte-Carlo rechnen bei jedem Aufruf alles neu
+# (Kurse laden, ARIMA anpassen, Pfade simulieren). Wer zwischen Aktien hin
+# und her wechselt (A -> B -> A), bekommt A hier direkt aus dem Cache.
+#
+# Schlüssel: Funktionsname + alle Argumente + heutiges Datum - am nächsten
+# Tag wird also neu gerechnet. Mit diskcache liegt der Cache auf der
+# Festplatte (.cache/analysis, gilt auch für die Prozesse der
+# Hintergrund-Callbacks), sonst im Speicher.
+# Ergebnisse mit "error" werden NICHT gespeichert - ein erneuter Versuch
+# soll wirklich neu rechnen (z.B. nach einem kurzen Netzwerkausfall).
+ANALYSIS_CACHE_SECONDS = 24 * 60 * 60  # 24 Stunden
+ANALYSIS_CACHE_MAXSIZE = 32            # Nur für den Speicher-Cache (Ergebnisse enthalten Charts)
+
+try:
+    import diskcache
+    _ANALYSIS_CACHE = diskcache.Cache(str(Path(__file__).parent / ".cache" / "analysis"))
+except ImportError:
+    _ANALYSIS_CACHE = None
+_ANALYSIS_MEMORY_CACHE = {}  # schlüssel -> (zeitstempel, ergebnis)
+_ANALYSIS_MEMORY_LOCK = threading.Lock()
+
+
+def cache_analysis(func):
+    """
+    Decorator: Merkt sich fehlerfreie Ergebnisse einer Analyse-Funktion.
+    
+    Args:
+        func: Analyse-Funktion, die ein Ergebnis-Dictionary zurückgibt
+    
+    Returns:
+        Die Funktion mit vorgeschaltetem Cache
+    """
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        key = "|".join([func.__name__, *map(repr, args),
+                        *(f"{k}={v!r}" for k, v in sorted(kwargs.items())),
+                        datetime.now().date().isoformat()])
+        
+        if _ANALYSIS_CACHE is not None:
+            try:
+                cached = _ANALYSIS_CACHE.get(key)
+            except Exception:
+                cached = None
+        else:
+            with _ANALYSIS_MEMORY_LOCK:
+                entry = _ANALYSIS_MEMORY_CACHE.get(key)
+            cached = entry[1] if entry and time.monotonic() - entry[0] < ANALYSIS_CACHE_SECONDS else None
+        if cached is not None:
+            return cached
+        
+        result = func(*args, **kwargs)
+        if "error" in result:
+            return result
+        
+        if _ANALYSIS_CACHE is not None:
+            try:
+                _ANALYSIS_CACHE.set(key, result, expire=ANALYSIS_CACHE_SECONDS)
+            except Exception:
+                pass  # Cache ist nur eine Beschleunigung - Fehler ignorieren
+        else:
+            with _ANALYSIS_MEMORY_LOCK:
+                _ANALYSIS_MEMORY_CACHE.pop(key, None)
+                if len(_ANALYSIS_MEMORY_CACHE) >= ANALYSIS_CACHE_MAXSIZE:
+                    # Ältesten Eintrag entfernen (dict behält die Einfüge-Reihenfolge)
+                    del _ANALYSIS_MEMORY_CACHE[next(iter(_ANALYSIS_MEMORY_CACHE))]
+                _ANALYSIS_MEMORY_CACHE[key] = (time.monotonic(), result)
+        return result
+    return wrapper
+
+
 # ================================================================================
 # HILFSFUNKTIONEN - Grundlegende Funktionen für die Analyse
 # ================================================================================
@@ -293,6 +507,23 @@ def identify_source(feed_url: str) -> str:
     return "Unbekannt"
 
 
+def _get_analyzer():
+    """
+    Liefert die globale VADER-Instanz und erstellt sie beim ersten Aufruf.
+    
+    So muss nicht bei jedem Aufruf ein neuer Analyzer erstellt werden - und
+    wer die Sentiment-Analyse nie benutzt, lädt das Wörterbuch gar nicht erst.
+    
+    Returns:
+        SentimentIntensityAnalyzer oder None, falls vaderSentiment fehlt
+    """
+    global _analyzer
+    if _analyzer is None and VADER_AVAILABLE:
+        from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+        _analyzer = SentimentIntensityAnalyzer()
+    return _analyzer
+
+
 def calculate_sentiment(text: str) -> float:
     """
     Berechnet den Sentiment-Score für einen Text mit VADER.
@@ -323,13 +554,140 @@ def calculate_sentiment(text: str) -> float:
         -0.5423  # Negativ
     """
     # Sicherheitsprüfung: VADER muss verfügbar sein
-    if not VADER_AVAILABLE or _analyzer is None:
+    analyzer = _get_analyzer()
+    if analyzer is None:
         return 0.0
     
     # polarity_scores() gibt ein Dictionary zurück:
     # {"pos": 0.5, "neg": 0.0, "neu": 0.5, "compound": 0.6369}
     # Wir verwenden nur den "compound" Score (kombinierter Wert)
-    return _analyzer.polarity_scores(text)["compound"]
+    return analyzer.polarity_scores(text)["compound"]
+
+
+# Ab dieser Anzahl Titel lohnt es sich, mehrere Prozesse zu starten
+# (darunter ist der Start der Prozesse teurer als die Berechnung selbst)
+PARALLEL_SCORING_THRESHOLD = 2000
+
+# Anzahl Titel pro Arbeitspaket für einen Prozess
+SCORING_CHUNK_SIZE = 1000
+
+# Bereits bewertete Titel: titel -> score
+# VADER liefert für denselben Text immer denselben Score. Wiederholte Analysen
+# (anderer Zeitraum, Korrelation nach Sentiment, erneuter Klick) sehen fast
+# nur bekannte Titel - bewertet werden dann nur noch die neuen.
+#
+# Mit diskcache liegen die Scores im Netzwerk-Cache (.cache/net, ein Eintrag
+# pro Titel): Die Analysen laufen dann als Hintergrund-Callback in jeweils
+# eigenen Prozessen - ein Dictionary im Speicher wäre nach jedem Lauf weg.
+# Ohne diskcache dient das Dictionary als Ersatz.
+SCORE_CACHE_SECONDS = 7 * 24 * 60 * 60  # Scores ändern sich nie - 7 Tage
+SCORE_CACHE_MAXSIZE = 20000             # Nur für den Speicher-Cache
+_SCORE_CACHE = {}
+_SCORE_CACHE_LOCK = threading.Lock()
+
+
+def _score_key(title: str) -> str:
+    """Cache-Schlüssel für einen Titel (Hash statt langem Text)."""
+    return "score|" + hashlib.md5(title.encode("utf-8")).hexdigest()
+
+
+def _score_cache_get_many(titles) -> dict:
+    """
+    Liest die bekannten Scores für mehrere Titel.
+    
+    Args:
+        titles: Titel (ohne Duplikate)
+    
+    Returns:
+        dict: titel -> score (nur Titel, die schon bewertet wurden)
+    """
+    if _NET_CACHE is not None:
+        found = {}
+        try:
+            # Eine Transaktion für alle Abfragen statt einer pro Titel
+            with _NET_CACHE.transact():
+                for title in titles:
+                    score = _NET_CACHE.get(_score_key(title))
+                    if score is not None:
+                        found[title] = score
+        except Exception:
+            pass  # Cache ist nur eine Beschleunigung
+        return found
+    with _SCORE_CACHE_LOCK:
+        return {title: _SCORE_CACHE[title] for title in titles if title in _SCORE_CACHE}
+
+
+def _score_cache_set_many(scores: dict):
+    """
+    Speichert neu berechnete Scores (titel -> score).
+    """
+    if _NET_CACHE is not None:
+        try:
+            with _NET_CACHE.transact():
+                for title, score in scores.items():
+                    _NET_CACHE.set(_score_key(title), score, expire=SCORE_CACHE_SECONDS)
+        except Exception:
+            pass
+        return
+    with _SCORE_CACHE_LOCK:
+        _SCORE_CACHE.update(scores)
+        # Älteste Einträge entfernen (dict behält die Einfüge-Reihenfolge)
+        while len(_SCORE_CACHE) > SCORE_CACHE_MAXSIZE:
+            del _SCORE_CACHE[next(iter(_SCORE_CACHE))]
+
+
+def _score_batch(titles: list) -> list:
+    """
+    Berechnet die Sentiment-Scores für eine Liste von Titeln.
+    
+    Läuft entweder direkt oder in einem Worker-Prozess. Jeder Prozess
+    hat dabei seinen eigenen _analyzer (wird beim ersten Titel erstellt).
+    """
+    return [calculate_sentiment(title) for title in titles]
+
+
+def score_titles(titles: list) -> list:
+    """
+    Berechnet Sentiment-Scores für viele Titel - bei Bedarf parallel.
+    
+    VADER ist reine CPU-Arbeit. Wegen des GIL kann Python in einem Prozess
+    nur einen Kern nutzen. Bei sehr vielen News (z.B. "Alle") werden die
+    Titel deshalb in Pakete aufgeteilt und auf mehrere Prozesse verteilt.
+    
+    Args:
+        titles: Liste der News-Titel
+    
+    Returns:
+        list: Scores in derselben Reihenfolge wie die Titel
+    """
+    # Gleiche Titel (z.B. dieselbe Meldung aus mehreren Feeds) nur einmal bewerten
+    # dict.fromkeys entfernt Duplikate und behält die Reihenfolge bei
+    # Schon früher bewertete Titel kommen direkt aus dem Cache
+    distinct = dict.fromkeys(titles)
+    score_by_title = _score_cache_get_many(distinct)
+    unique = [title for title in distinct if title not in score_by_title]
+    
+    if not unique:
+        scores = []
+    elif len(unique) < PARALLEL_SCORING_THRESHOLD:
+        scores = _score_batch(unique)
+    else:
+        # In Pakete à SCORING_CHUNK_SIZE Titel aufteilen
+        chunks = [unique[i:i + SCORING_CHUNK_SIZE] for i in range(0, len(unique), SCORING_CHUNK_SIZE)]
+        try:
+            with ProcessPoolExecutor() as executor:
+                # map() behält die Reihenfolge der Pakete bei
+                scores = [score for batch in executor.map(_score_batch, chunks) for score in batch]
+        except Exception as e:
+            # Z.B. wenn keine Kind-Prozesse erlaubt sind -> einfach seriell rechnen
+            print(f"[Sentiment] Parallele Berechnung nicht möglich ({e}), rechne seriell")
+            scores = _score_batch(unique)
+    
+    new_scores = dict(zip(unique, scores))
+    if new_scores and _get_analyzer() is not None:  # Ohne VADER sind alle Scores 0.0 - nicht merken
+        _score_cache_set_many(new_scores)
+    score_by_title.update(new_scores)
+    return [score_by_title[title] for title in titles]
 
 
 def parse_date(date_str: str):
@@ -429,23 +787,18 @@ def fetch_rss_feed(url: str, timeout: int = 10):
     
     Hinweis: Die Funktion gibt nur die rohen XML-Strings zurück.
     Das Parsen der einzelnen Felder erfolgt in parse_feed_item().
+    
+    Ergebnisse werden RSS_CACHE_SECONDS lang zwischengespeichert.
     """
+    cache_key = f"rss|{url}"
+    cached = _net_cache_get(cache_key, RSS_CACHE_SECONDS)
+    if cached is not None:
+        return cached
+    
     try:
-        # HTTP-Header setzen (wichtig für viele Server!)
-        # Ohne User-Agent blocken manche Server die Anfrage
-        headers = {
-            # Browser-Identifikation (Chrome auf Windows)
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-            
-            # Akzeptierte Inhaltstypen (XML-Formate für RSS)
-            "Accept": "application/rss+xml, application/xml, text/xml, */*",
-            
-            # Bevorzugte Sprachen
-            "Accept-Language": "en-US,en;q=0.9,de;q=0.8",
-        }
-        
-        # HTTP GET-Request senden
-        resp = requests.get(url, timeout=timeout, headers=headers)
+        # HTTP GET-Request über die gemeinsame Session senden
+        # (die nötigen Header wie User-Agent sind dort schon gesetzt)
+        resp = _HTTP_SESSION.get(url, timeout=timeout)
         
         # Status-Code prüfen (200 = OK)
         if resp.status_code != 200:
@@ -458,12 +811,14 @@ def fetch_rss_feed(url: str, timeout: int = 10):
         # Sucht nach allem zwischen <item> und </item>
         # re.DOTALL: . matcht auch Zeilenumbrüche
         # re.IGNORECASE: Groß-/Kleinschreibung egal
-        items = re.findall(r"<item>(.*?)</item>", content, re.DOTALL | re.IGNORECASE)
+        items = _ITEM_RE.findall(content)
         
         # Alternativ: Atom-Feeds verwenden <entry> statt <item>
         if not items:
-            items = re.findall(r"<entry>(.*?)</entry>", content, re.DOTALL | re.IGNORECASE)
+            items = _ENTRY_RE.findall(content)
         
+        if items:
+            _net_cache_set(cache_key, items, RSS_CACHE_SECONDS)
         return items
         
     except Exception as e:
@@ -472,6 +827,21 @@ def fetch_rss_feed(url: str, timeout: int = 10):
         return []
 
 
+# Vorkompilierte Regular Expressions für das Parsen der Feeds
+# re.compile() übersetzt das Muster nur EINMAL - bei hunderten Items pro
+# Analyse spart das die wiederholte Muster-Suche im internen re-Cache.
+# re.DOTALL: . matcht auch Zeilenumbrüche, re.IGNORECASE: Groß-/Kleinschreibung egal
+_ITEM_RE = re.compile(r"<item>(.*?)</item>", re.DOTALL | re.IGNORECASE)
+_ENTRY_RE = re.compile(r"<entry>(.*?)</entry>", re.DOTALL | re.IGNORECASE)
+_TITLE_RE = re.compile(r"<title[^>]*>(.*?)</title>", re.DOTALL | re.IGNORECASE)
+_PUBDATE_RE = re.compile(r"<pubDate[^>]*>(.*?)</pubDate>", re.DOTALL | re.IGNORECASE)
+_PUBLISHED_RE = re.compile(r"<published[^>]*>(.*?)</published>", re.DOTALL | re.IGNORECASE)
+_UPDATED_RE = re.compile(r"<updated[^>]*>(.*?)</updated>", re.DOTALL | re.IGNORECASE)
+_SOURCE_RE = re.compile(r"<source[^>]*>(.*?)</source>", re.DOTALL | re.IGNORECASE)
+_CDATA_RE = re.compile(r"<!\[CDATA\[(.*?)\]\]>", re.DOTALL)
+_TAG_RE = re.compile(r"<[^>]+>")
+
+
 def parse_feed_item(item_xml: str, source_name: str) -> dict:
     """
     Parst ein einzelnes RSS-Item und extrahiert die relevanten Daten.
@@ -497,20 +867,20 @@ def parse_feed_item(item_xml: str, source_name: str) -> dict:
     """
     # === TITEL EXTRAHIEREN ===
     # Suche nach <title>...</title>
-    title_m = re.search(r"<title[^>]*>(.*?)</title>", item_xml, re.DOTALL | re.IGNORECASE)
+    title_m = _TITLE_RE.search(item_xml)
     
     if title_m:
         title = title_m.group(1)  # Inhalt der ersten Capture-Group
         
         # CDATA-Blöcke entfernen
         # CDATA wird verwendet um Sonderzeichen zu schützen: <![CDATA[Text]]>
-        title = re.sub(r"<!\[CDATA\[(.*?)\]\]>", r"\1", title, flags=re.DOTALL)
+        title = _CDATA_RE.sub(r"\1", title)
         
         # HTML-Entities dekodieren (&amp; → &, &lt; → <, etc.)
         title = unescape(title.strip())
         
         # Übrige HTML-Tags entfernen (z.B. <b>, <i>)
-        title = re.sub(r"<[^>]+>", "", title)
+        title = _TAG_RE.sub("", title)
     else:
         title = ""
     
@@ -518,15 +888,15 @@ def parse_feed_item(item_xml: str, source_name: str) -> dict:
     # Verschiedene Tags probieren (RSS vs. Atom haben unterschiedliche Namen)
     
     # RSS-Format: <pubDate>...</pubDate>
-    pub_m = re.search(r"<pubDate[^>]*>(.*?)</pubDate>", item_xml, re.DOTALL | re.IGNORECASE)
+    pub_m = _PUBDATE_RE.search(item_xml)
     
     # Atom-Format: <published>...</published>
     if not pub_m:
-        pub_m = re.search(r"<published[^>]*>(.*?)</published>", item_xml, re.DOTALL | re.IGNORECASE)
+        pub_m = _PUBLISHED_RE.search(item_xml)
     
     # Atom-Format alternativ: <updated>...</updated>
     if not pub_m:
-        pub_m = re.search(r"<updated[^>]*>(.*?)</updated>", item_xml, re.DOTALL | re.IGNORECASE)
+        pub_m = _UPDATED_RE.search(item_xml)
     
     # Datum parsen (mit unserer flexiblen parse_date Funktion)
     pub_date = parse_date(pub_m.group(1) if pub_m else "")
@@ -534,11 +904,11 @@ def parse_feed_item(item_xml: str, source_name: str) -> dict:
     # === QUELLE EXTRAHIEREN ===
     # Manche Feeds haben eine <source>-Tag mit der Original-Quelle
     # (z.B. bei Google News, das von vielen Quellen aggregiert)
-    source_m = re.search(r"<source[^>]*>(.*?)</source>", item_xml, re.DOTALL | re.IGNORECASE)
+    source_m = _SOURCE_RE.search(item_xml)
     
     if source_m:
         # Quelle bereinigen (CDATA und HTML-Entities)
-        original_source = unescape(re.sub(r"<!\[CDATA\[(.*?)\]\]>", r"\1", source_m.group(1)).strip())
+        original_source = unescape(_CDATA_RE.sub(r"\1", source_m.group(1)).strip())
     else:
         # Keine Quelle im Feed → Feed-Name verwenden
         original_source = source_name
@@ -572,6 +942,11 @@ def get_company_name(symbol: str) -> str:
         >>> get_company_name("AAPL")
         "Apple"
     """
+    cache_key = f"name|{symbol}"
+    cached = _net_cache_get(cache_key, COMPANY_NAME_CACHE_SECONDS)
+    if cached is not None:
+        return cached
+    
     try:
         # Yahoo Finance Ticker-Objekt erstellen
         ticker = yf.Ticker(symbol)
@@ -587,7 +962,9 @@ def get_company_name(symbol: str) -> str:
             # "Tesla, Inc." → "Tesla"
             # "Apple Inc" → "Apple"
             # "Microsoft Corporation" → "Microsoft"
-            return name.split(",")[0].split(" Inc")[0].split(" Corp")[0].strip()
+            name = name.split(",")[0].split(" Inc")[0].split(" Corp")[0].strip()
+            _net_cache_set(cache_key, name, COMPANY_NAME_CACHE_SECONDS)
+            return name
     except:
         pass
     
@@ -615,6 +992,7 @@ def fetch_news_from_feeds(symbol: str, period: str = "1mo", news_limit: int = 10
     5. Duplikate entfernen
     6. Nach Datum sortieren
     7. Auf Limit begrenzen
+    8. Sentiment-Scores berechnen (nur für die verbleibenden News)
     
     Args:
         symbol: Aktiensymbol (z.B. "TSLA", "AAPL", "MSFT")
@@ -637,10 +1015,29 @@ def fetch_news_from_feeds(symbol: str, period: str = "1mo", news_limit: int = 10
     # Sammel-Listen
     all_news_items = []     # Alle gefundenen News
     sources_count = {}      # Zähler pro Quelle
-    seen_titles = set()     # Set für Duplikat-Erkennung (schnell!)
+    seen_titles = set()     # Hash-Werte der Titel für die Duplikat-Erkennung (schnell!)
     
-    # Firmenname für bessere Filterung holen
-    company_name = get_company_name(symbol)
+    # =========================================================================
+    # SCHRITT 0: Alle Feeds GLEICHZEITIG abrufen
+    # =========================================================================
+    # Jeder Feed-Abruf wartet fast nur auf das Netzwerk. Nacheinander addieren
+    # sich die Wartezeiten, in Threads parallel dauert es nur so lange wie der
+    # langsamste Feed. Der Firmenname (Yahoo-Anfrage) wird gleich mit geholt.
+    # Die Auswertung unten läuft danach wie gewohnt in fester Reihenfolge
+    # (wichtig für die Duplikat-Erkennung).
+    dynamic_urls = [template.format(symbol=symbol) for template in RSS_FEED_TEMPLATES]
+    static_urls = [feed["url"] for feed in STATIC_RSS_FEEDS]
+    
+    all_urls = dynamic_urls + static_urls
+    workers = min(RSS_FETCH_WORKERS, len(all_urls) + 1)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        company_future = executor.submit(get_company_name, symbol)
+        feed_results = list(executor.map(fetch_rss_feed, all_urls))
+        # Firmenname für bessere Filterung
+        company_name = company_future.result()
+    
+    dynamic_results = feed_results[:len(dynamic_urls)]
+    static_results = feed_results[len(dynamic_urls):]
     
     # Suchbegriffe erstellen (Symbol + Firmenname)
     search_terms = [symbol.upper()]
@@ -655,13 +1052,10 @@ def fetch_news_from_feeds(symbol: str, period: str = "1mo", news_limit: int = 10
     # Diese Feeds werden mit dem Symbol ergänzt, z.B.:
     # "https://news.google.com/rss/search?q=TSLA+stock..."
     
-    for template in RSS_FEED_TEMPLATES:
-        # Symbol in die URL einsetzen
-        url = template.format(symbol=symbol)
+    for url, items in zip(dynamic_urls, dynamic_results):
+        # Quelle anhand der URL erkennen (Feed wurde oben schon abgerufen)
         source_name = identify_source(url)
         
-        # Feed abrufen
-        items = fetch_rss_feed(url)
         print(f"[RSS] {source_name}: {len(items)} Items gefunden")
         
         # Jedes Item verarbeiten
@@ -674,27 +1068,20 @@ def fetch_news_from_feeds(symbol: str, period: str = "1mo", news_limit: int = 10
                 continue
             
             # --- Duplikat-Check ---
-            # Verwende die ersten 60 Zeichen des Titels als "Hash"
+            # Verwende die ersten 60 Zeichen des Titels als Schlüssel
             # So werden "leicht unterschiedliche" Duplikate erkannt
-            title_hash = parsed["title"].lower()[:60]
+            # Im Set landet nur der hash() davon (eine Zahl statt eines Strings);
+            # erst kürzen, dann lower() - so werden höchstens 60 Zeichen umgewandelt
+            title_hash = hash(parsed["title"][:60].lower())
             if title_hash in seen_titles:
                 continue  # Schon gesehen → überspringen
             seen_titles.add(title_hash)
             
             # --- Zeit-Filter ---
             # Nur News im gewählten Zeitraum akzeptieren
-            try:
-                item_date = parsed["date"]
-                # Zeitzone entfernen für Vergleich
-                if hasattr(item_date, 'tzinfo') and item_date.tzinfo is not None:
-                    item_date = item_date.replace(tzinfo=None)
-                if item_date < cutoff_date:
-                    continue  # Zu alt → überspringen
-            except Exception:
-                pass
-            
-            # Sentiment berechnen
-            score = calculate_sentiment(parsed["title"])
+            # (parse_date liefert immer ein datetime ohne Zeitzone -> direkt vergleichbar)
+            if parsed["date"] < cutoff_date:
+                continue  # Zu alt → überspringen
             
             # Quelle: Feed-Quelle (z.B. "Google News") + Original-Quelle falls vorhanden
             display_source = parsed["source"]
@@ -703,9 +1090,9 @@ def fetch_news_from_feeds(symbol: str, period: str = "1mo", news_limit: int = 10
             
             all_news_items.append({
                 "title": parsed["title"],
-                "date": parsed["date"].strftime("%d.%m.%Y"),
+                "date": None,  # Anzeige-Text ("31.12.2025") wird erst nach dem Begrenzen erzeugt
                 "date_obj": parsed["date"],
-                "score": score,
+                "score": None,  # Wird erst nach dem Begrenzen berechnet (Schritt 3)
                 "source": display_source,
                 "feed_source": source_name  # Für die Quellen-Zählung
             })
@@ -718,9 +1105,8 @@ def fetch_news_from_feeds(symbol: str, period: str = "1mo", news_limit: int = 10
     # Diese Feeds enthalten ALLE Finanznews, nicht nur für unser Symbol.
     # Deshalb müssen wir nach dem Symbol/Firmennamen filtern.
     
-    for feed in STATIC_RSS_FEEDS:
-        # Feed abrufen (URL ist fest, nicht dynamisch)
-        items = fetch_rss_feed(feed["url"])
+    for feed, items in zip(STATIC_RSS_FEEDS, static_results):
+        # Feed wurde oben schon (parallel) abgerufen
         print(f"[RSS] {feed['name']}: {len(items)} Items gefunden")
         
         for item_xml in items:
@@ -738,30 +1124,21 @@ def fetch_news_from_feeds(symbol: str, period: str = "1mo", news_limit: int = 10
                 continue  # Nicht relevant → überspringen
             
             # Duplikat-Check (wie oben)
-            title_hash = parsed["title"].lower()[:60]
+            title_hash = hash(parsed["title"][:60].lower())
             if title_hash in seen_titles:
                 continue
             seen_titles.add(title_hash)
             
             # Zeit-Filter (wie oben)
-            try:
-                item_date = parsed["date"]
-                if hasattr(item_date, 'tzinfo') and item_date.tzinfo is not None:
-                    item_date = item_date.replace(tzinfo=None)
-                if item_date < cutoff_date:
-                    continue
-            except Exception:
-                pass
-            
-            # Sentiment berechnen
-            score = calculate_sentiment(parsed["title"])
+            if parsed["date"] < cutoff_date:
+                continue
             
             # Zur Liste hinzufügen
             all_news_items.append({
                 "title": parsed["title"],
-                "date": parsed["date"].strftime("%d.%m.%Y"),
+                "date": None,  # Anzeige-Text ("31.12.2025") wird erst nach dem Begrenzen erzeugt
                 "date_obj": parsed["date"],
-                "score": score,
+                "score": None,  # Wird erst nach dem Begrenzen berechnet (Schritt 3)
                 "source": feed["name"],
                 "feed_source": feed["name"]
             })
@@ -780,6 +1157,12 @@ def fetch_news_from_feeds(symbol: str, period: str = "1mo", news_limit: int = 10
     # Auf das Limit begrenzen (z.B. nur die 100 neuesten)
     news_items = all_news_items[:news_limit]
     
+    # Sentiment erst JETZT berechnen - nur für die News, die wirklich
+    # verwendet werden (bei vielen News parallel auf mehreren Kernen)
+    scores = score_titles([item["title"] for item in news_items])
+    for item, score in zip(news_items, scores):
+        item["score"] = score
+    
     # Temporäre Felder entfernen (werden für die Rückgabe nicht benötigt)
     # und finale Quellen-Statistik erstellen
     final_sources = {}
@@ -788,11 +1171,12 @@ def fetch_news_from_feeds(symbol: str, period: str = "1mo", news_limit: int = 10
         feed_src = item.get("feed_source", item["source"])
         final_sources[feed_src] = final_sources.get(feed_src, 0) + 1
         
-        # Interne Felder löschen
-        if "date_obj" in item:
-            del item["date_obj"]
-        if "feed_source" in item:
-            del item["feed_source"]
+        # Anzeige-Datum nur für die verbleibenden News formatieren
+        # (vorher wurde strftime für JEDE gefundene News aufgerufen)
+        item["date"] = item.pop("date_obj").strftime("%d.%m.%Y")
+        
+        # Internes Feld löschen
+        item.pop("feed_source", None)
     
     # Quellen-Zusammenfassung für die Anzeige erstellen
     # Format: ["Google News (72)", "Yahoo Finance (15)", ...]
@@ -829,6 +1213,78 @@ def fetch_news_for_correlation(symbol: str, period: str = "3mo"):
 # im Dashboard. Alle Charts sind responsive und haben Hover-Effekte.
 
 
+# Ab dieser Anzahl Punkte wird die Kurslinie mit WebGL (go.Scattergl) gezeichnet:
+# Die Grafikkarte zeichnet lange Linien (z.B. 5 Jahre = ~1250 Tage) deutlich
+# flüssiger als SVG. Kürzere Linien bleiben SVG - Browser erlauben nur wenige
+# WebGL-Kontexte gleichzeitig, und für kleine Charts lohnt es sich nicht.
+WEBGL_MIN_POINTS = 1000
+
+
+def line_trace_class(n_points: int):
+    """
+    Wählt die Plotly-Klasse für eine Linie passend zur Datenmenge.
+    
+    Args:
+        n_points: Anzahl der Datenpunkte
+    
+    Returns:
+        go.Scattergl (ab WEBGL_MIN_POINTS Punkten) oder go.Scatter
+    """
+    return go.Scattergl if n_points >= WEBGL_MIN_POINTS else go.Scatter
+
+
+# Höchstens so viele Punkte einer Kurslinie gehen an den Browser.
+# Ein Chart ist ~1200 Pixel breit - mehr Punkte sieht man nicht, sie
+# vergrößern nur die Datenmenge. (5 Jahre Tageskurse = ~1250 Punkte
+# bleiben vollständig, erst längere Reihen werden reduziert.)
+MAX_LINE_POINTS = 2000
+
+
+def downsample_minmax(x, y, n_out: int = MAX_LINE_POINTS):
+    """
+    Reduziert eine Linie auf höchstens n_out Punkte (MinMax-Verfahren).
+    
+    Die Reihe wird in (n_out - 2) / 2 gleich große Abschnitte geteilt. Von jedem
+    Abschnitt bleiben der tiefste und der höchste Punkt - so bleiben alle
+    Spitzen und Einbrüche sichtbar, die Linie sieht praktisch gleich aus.
+    Erster und letzter Punkt bleiben immer erhalten.
+    
+    Alles läuft als NumPy-Operation auf einer Matrix (Abschnitt × Position),
+    ohne Python-Schleife über die Abschnitte.
+    
+    Args:
+        x: X-Werte (Index, Series oder Array)
+        y: Y-Werte gleicher Länge
+        n_out: Maximale Anzahl Punkte
+    
+    Returns:
+        tuple: (x, y) - unverändert, wenn es nicht mehr als n_out Punkte sind
+    """
+    n = len(y)
+    if n <= n_out:
+        return x, y
+    
+    values = np.asarray(y, dtype=np.float64)
+    bin_size = -(-n // ((n_out - 2) // 2))    # Aufrunden (2 Plätze für Anfang/Ende)
+    n_bins = -(-n // bin_size)
+    # Auf volle Matrix auffüllen; NaN (Lücken + Auffüllung) nie als Min/Max wählen
+    padded = np.full(n_bins * bin_size, np.nan)
+    padded[:n] = values
+    grid = padded.reshape(n_bins, bin_size)
+    nan = np.isnan(grid)
+    offsets = np.arange(n_bins) * bin_size
+    idx_min = offsets + np.where(nan, np.inf, grid).argmin(axis=1)
+    idx_max = offsets + np.where(nan, -np.inf, grid).argmax(axis=1)
+    
+    # Reihenfolge wiederherstellen, doppelte Positionen (Min = Max) entfernen
+    idx = np.unique(np.concatenate(([0, n - 1], idx_min, idx_max)))
+    idx = idx[idx < n]
+    
+    x_out = x.take(idx) if hasattr(x, "take") else np.asarray(x)[idx]
+    y_out = y.take(idx) if hasattr(y, "take") else values[idx]
+    return x_out, y_out
+
+
 def create_sentiment_chart(symbol: str, hist, sentiment_daily) -> go.Figure:
     """
     Erstellt einen Dual-Axis Chart mit Kurs und Sentiment.
@@ -857,12 +1313,15 @@ def create_sentiment_chart(symbol: str, hist, sentiment_daily) -> go.Figure:
     color_line = "#22c55e" if is_positive else "#ef4444"  # Grün oder Rot
     
     # === KURSLINIE HINZUFÜGEN ===
-    # go.Scatter erstellt eine Linie (oder Punkte)
+    # go.Scatter erstellt eine Linie (oder Punkte), bei langen Zeiträumen
+    # go.Scattergl (siehe line_trace_class)
     # secondary_y=False → Linke Y-Achse
+    # Sehr lange Reihen vorher reduzieren (siehe downsample_minmax)
+    line_x, line_y = downsample_minmax(hist.index, hist["Close"])
     fig.add_trace(
-        go.Scatter(
-            x=hist.index,               # X-Achse: Datums-Index
-            y=hist["Close"],            # Y-Achse: Schlusskurse
+        line_trace_class(len(line_y))(
+            x=line_x,                   # X-Achse: Datums-Index
+            y=line_y,                   # Y-Achse: Schlusskurse
             mode="lines",               # Nur Linie, keine Punkte
             name=f"{symbol} Kurs",      # Name für die Legende
             line=dict(color=color_line, width=2),  # Linien-Stil
@@ -946,11 +1405,50 @@ def create_correlation_chart(symbol: str, merged_df) -> go.Figure:
     is_positive = end_price >= start_price
     color_price = "#22c55e" if is_positive else "#ef4444"
     
-    # === OBERER CHART: Kurslinie ===
+    # === SENTIMENT-HINTERGRUND ===
+    # Färbt den Hintergrund je nach Sentiment ein: Grün = positiv, Rot = negativ
+    # (nur bei ausreichend starkem Sentiment, |Wert| > 0.1).
+    #
+    # Statt eines Rechtecks (add_vrect) pro Tag - bei einem Jahr ~250 Shapes,
+    # die Plotly einzeln aufbaut und überträgt - ist der ganze Hintergrund
+    # EINE Heatmap mit einer Zeile:
+    # - x hat einen Wert mehr als z Spalten → x sind die Grenzen der Felder,
+    #   Feld i reicht also von Tag i bis Tag i+1 (wie vorher die Rechtecke)
+    # - z = Vorzeichen des Sentiments (-1, 0, +1), 0 ist durchsichtig
+    # - y = Unter- und Obergrenze der Kursachse (5% Rand wie bei Auto-Skalierung),
+    #   die Achse wird auf genau diesen Bereich festgelegt → volle Höhe
+    # Die Heatmap wird vor der Kurslinie hinzugefügt → liegt dahinter.
+    sentiment = merged_df["sentiment"].to_numpy()[:-1]
+    sign = np.where(np.abs(sentiment) > 0.1, np.sign(sentiment), 0.0)
+    prices = merged_df["price"].to_numpy(dtype=np.float64)
+    low, high = float(np.nanmin(prices)), float(np.nanmax(prices))
+    pad = (high - low) * 0.05 or abs(high) * 0.01 or 1.0  # Konstanter Kurs: trotzdem etwas Rand
+    y_range = [low - pad, high + pad]
     fig.add_trace(
-        go.Scatter(
+        go.Heatmap(
             x=merged_df["date"],
-            y=merged_df["price"],
+            y=y_range,
+            z=[sign],
+            zmin=-1, zmax=1,
+            colorscale=[
+                [0.0, "rgba(239, 68, 68, 0.15)"],   # -1: negativ (rot)
+                [0.5, "rgba(0, 0, 0, 0)"],          #  0: keine Färbung
+                [1.0, "rgba(34, 197, 94, 0.15)"],   # +1: positiv (grün)
+            ],
+            showscale=False,
+            hoverinfo="skip",
+        ),
+        row=1, col=1
+    )
+    
+    # === OBERER CHART: Kurslinie ===
+    # Bei langen Zeiträumen mit WebGL (siehe line_trace_class),
+    # sehr lange Reihen vorher reduziert (siehe downsample_minmax)
+    line_x, line_y = downsample_minmax(merged_df["date"], merged_df["price"])
+    fig.add_trace(
+        line_trace_class(len(line_y))(
+            x=line_x,
+            y=line_y,
             mode="lines",
             name="Kurs",
             line=dict(color=color_price, width=2),
@@ -959,26 +1457,6 @@ def create_correlation_chart(symbol: str, merged_df) -> go.Figure:
         row=1, col=1  # Position: Zeile 1, Spalte 1
     )
     
-    # === SENTIMENT-HINTERGRUND ===
-    # Färbt den Hintergrund je nach Sentiment ein
-    # add_vrect = vertikales Rechteck (von oben bis unten)
-    for i in range(len(merged_df) - 1):
-        sentiment_val = merged_df["sentiment"].iloc[i]
-        
-        # Nur bei ausreichend starkem Sentiment färben
-        if abs(sentiment_val) > 0.1:
-            # Farbe wählen (halbtransparent mit rgba)
-            fill_color = "rgba(34, 197, 94, 0.15)" if sentiment_val > 0 else "rgba(239, 68, 68, 0.15)"
-            
-            fig.add_vrect(
-                x0=merged_df["date"].iloc[i],      # Start-Datum
-                x1=merged_df["date"].iloc[i+1],    # End-Datum
-                fillcolor=fill_color,
-                layer="below",                      # Hinter der Linie
-                line_width=0,                       # Kein Rahmen
-                row=1, col=1
-            )
-    
     # === UNTERER CHART: Sentiment-Balken ===
     # Zeigt den 7-Tage-Durchschnitt des Sentiments
     colors_bars = ["#22c55e" if s > 0 else "#ef4444" for s in merged_df["sentiment_ma"]]
@@ -1007,7 +1485,7 @@ def create_correlation_chart(symbol: str, merged_df) -> go.Figure:
         margin=dict(l=50, r=50, t=80, b=50),
     )
     
-    fig.update_yaxes(title_text="Kurs (USD)", gridcolor="#e5e7eb", row=1, col=1)
+    fig.update_yaxes(title_text="Kurs (USD)", gridcolor="#e5e7eb", range=y_range, row=1, col=1)
     fig.update_yaxes(title_text="Sentiment", gridcolor="#e5e7eb", row=2, col=1)
     fig.update_xaxes(showgrid=True, gridcolor="#e5e7eb")
     
@@ -1021,6 +1499,70 @@ def create_correlation_chart(symbol: str, merged_df) -> go.Figure:
 # Sie orchestrieren den gesamten Analyse-Prozess.
 
 
+def daily_sentiment(news_items: list):
+    """
+    Berechnet den durchschnittlichen Sentiment-Score pro Tag mit NumPy.
+    
+    Statt eines DataFrames mit groupby werden die Scores als Array
+    gespeichert und mit np.bincount pro Tag aufsummiert:
+    - Jedes Datum bekommt eine Tagesnummer (0, 1, 2, ...)
+    - bincount(tag, weights=scores) = Summe der Scores pro Tag
+    - bincount(tag) = Anzahl News pro Tag
+    - Summe / Anzahl = Durchschnitt pro Tag
+    
+    Args:
+        news_items: Liste der News (mit "date" als "TT.MM.JJJJ" und "score")
+    
+    Returns:
+        tuple: (sentiment_daily, scores)
+               - sentiment_daily: pd.Series mit Datum als Index (aufsteigend)
+               - scores: NumPy-Array aller Scores (für Durchschnitt etc.)
+    """
+    scores = np.fromiter((item["score"] for item in news_items), dtype=np.float64, count=len(news_items))
+    
+    # Jedes Datum nur einmal parsen (viele News haben dasselbe Datum)
+    ordinal_by_date = {}
+    for item in news_items:
+        date = item["date"]
+        if date not in ordinal_by_date:
+            ordinal_by_date[date] = datetime.strptime(date, "%d.%m.%Y").toordinal()
+    ordinals = np.fromiter((ordinal_by_date[item["date"]] for item in news_items), dtype=np.int64, count=len(news_items))
+    
+    # np.unique liefert die sortierten Tage und für jede News die Tagesnummer
+    days, day_idx = np.unique(ordinals, return_inverse=True)
+    per_day = np.bincount(day_idx, weights=scores) / np.bincount(day_idx)
+    
+    index = pd.DatetimeIndex([datetime.fromordinal(int(d)) for d in days])
+    return pd.Series(per_day, index=index, name="sentiment"), scores
+
+
+def _fetch_price_history(symbol: str, period: str):
+    """
+    Lädt die Tageskurse einer Aktie von Yahoo Finance.
+    
+    Wird in einem eigenen Thread gestartet, während die RSS-Feeds laufen -
+    beide Abrufe warten nur auf das Netzwerk und können sich überlappen.
+    
+    Args:
+        symbol: Aktiensymbol
+        period: Zeitraum ("1mo", "3mo", ...)
+    
+    Returns:
+        DataFrame mit den Kursdaten (kann leer sein)
+    
+    Die Kurse werden PRICE_HISTORY_CACHE_SECONDS lang zwischengespeichert.
+    """
+    cache_key = f"history|{symbol}|{period}"
+    cached = _net_cache_get(cache_key, PRICE_HISTORY_CACHE_SECONDS)
+    if cached is not None:
+        return cached.copy()  # Kopie: Aufrufer dürfen den DataFrame verändern
+    
+    hist = yf.Ticker(symbol).history(period=period)
+    if not hist.empty:
+        _net_cache_set(cache_key, hist.copy(), PRICE_HISTORY_CACHE_SECONDS)
+    return hist
+
+
 def analyze_sentiment(symbol: str, period: str = "1mo", news_limit: int = 100) -> dict:
     """
     Führt eine VOLLSTÄNDIGE Sentiment-Analyse durch.
@@ -1064,28 +1606,21 @@ def analyze_sentiment(symbol: str, period: str = "1mo", news_limit: int = 100) -
     symbol = symbol.strip().upper()
     
     try:
-        # === SCHRITT 1: News abrufen ===
-        news_items, sources_found = fetch_news_from_feeds(symbol, period, news_limit)
+        # === SCHRITT 1: News abrufen (Kursdaten laden parallel im Hintergrund) ===
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            hist_future = executor.submit(_fetch_price_history, symbol, period or "1mo")
+            news_items, sources_found = fetch_news_from_feeds(symbol, period, news_limit)
         
         # Keine News gefunden?
         if not news_items:
             return {"error": f"Keine News für '{symbol}' gefunden. Versuchen Sie einen längeren Zeitraum."}
         
-        # === SCHRITT 2: DataFrame erstellen ===
-        # pandas DataFrame für einfachere Datenverarbeitung
-        news_df = pd.DataFrame(news_items)
-        
-        # Datum-Spalte in datetime konvertieren
-        news_df["date_parsed"] = pd.to_datetime(news_df["date"], format="%d.%m.%Y", errors="coerce")
+        # === SCHRITT 2+3: Täglicher Sentiment-Durchschnitt ===
+        # Scores als NumPy-Array, Durchschnitt pro Tag per bincount
+        sentiment_daily, scores = daily_sentiment(news_items)
         
-        # === SCHRITT 3: Täglicher Sentiment-Durchschnitt ===
-        # groupby: Gruppiert alle News nach Tag
-        # mean(): Berechnet den Durchschnitt der Scores pro Tag
-        sentiment_daily = news_df.groupby(news_df["date_parsed"].dt.date)["score"].mean()
-        
-        # === SCHRITT 4: Kursdaten abrufen ===
-        stock = yf.Ticker(symbol)
-        hist = stock.history(period=period or "1mo")
+        # === SCHRITT 4: Kursdaten (wurden parallel zu den News geladen) ===
+        hist = hist_future.result()
         
         # Keine Kursdaten?
         if hist.empty:
@@ -1102,7 +1637,7 @@ def analyze_sentiment(symbol: str, period: str = "1mo", news_limit: int = 100) -
         pct_change = ((end_price - start_price) / start_price) * 100
         
         # Durchschnittlicher Sentiment-Score aller News
-        avg_sentiment = news_df["score"].mean()
+        avg_sentiment = float(scores.mean())
         
         # === SCHRITT 7: Ergebnis zurückgeben ===
         return {
@@ -1128,6 +1663,58 @@ def analyze_sentiment(symbol: str, period: str = "1mo", news_limit: int = 100) -
         return {"error": str(e)}
 
 
+def pearson(x, y) -> float:
+    """
+    Berechnet den Pearson-Korrelationskoeffizienten zweier Arrays.
+    
+    Formel: r = Σ(x - x̄)(y - ȳ) / (n · σx · σy)
+    
+    Das Skalarprodukt (@) der zentrierten Werte ist eine einzige
+    NumPy-Operation - es wird keine Korrelationsmatrix aufgebaut.
+    Wertepaare mit NaN werden ignoriert (wie bei pandas .corr()).
+    
+    Args:
+        x, y: NumPy-Arrays gleicher Länge
+    
+    Returns:
+        float: Korrelation von -1 bis +1 (0.0 falls nicht berechenbar)
+    """
+    mask = ~(np.isnan(x) | np.isnan(y))
+    x, y = x[mask], y[mask]
+    n = len(x)
+    if n < 2:
+        return 0.0
+    
+    sx, sy = x.std(), y.std()
+    if sx == 0 or sy == 0:  # Konstante Reihe → Korrelation nicht definiert
+        return 0.0
+    return float((x - x.mean()) @ (y - y.mean()) / (n * sx * sy))
+
+
+def rolling_mean(x, window: int):
+    """
+    Gleitender Durchschnitt über 'window' Werte (wie pandas
+    .rolling(window, min_periods=1).mean() für Daten ohne NaN).
+    
+    Über die kumulierte Summe ist jeder Durchschnitt eine Differenz:
+    Summe(x[i-w+1..i]) = c[i+1] - c[i-w+1]. Die ersten Werte (weniger als
+    'window' Vorgänger) werden durch ihre tatsächliche Anzahl geteilt.
+    
+    Args:
+        x: NumPy-Array
+        window: Fenstergröße (z.B. 7 Tage)
+    
+    Returns:
+        np.ndarray: Durchschnitte, gleiche Länge wie x
+    """
+    c = np.concatenate(([0.0], np.cumsum(x, dtype=np.float64)))
+    n = len(x)
+    end = np.arange(1, n + 1)
+    start = np.maximum(end - window, 0)
+    return (c[end] - c[start]) / (end - start)
+
+
+@cache_analysis
 def analyze_correlation(symbol: str, period: str = "3mo", news_limit: int = 500) -> dict:
     """
     Führt eine KORRELATIONSANALYSE zwischen Kurs und Sentiment durch.
@@ -1160,25 +1747,20 @@ def analyze_correlation(symbol: str, period: str = "3mo", news_limit: int = 500)
     days_back = PERIOD_DAYS_MAP.get(period, 90)
     
     try:
-        # === SCHRITT 1: News abrufen ===
-        news_items, _ = fetch_news_from_feeds(symbol, period, news_limit)
+        # === SCHRITT 1: News abrufen (Kursdaten laden parallel im Hintergrund) ===
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            hist_future = executor.submit(_fetch_price_history, symbol, period or "3mo")
+            news_items, _ = fetch_news_from_feeds(symbol, period, news_limit)
         
         # Mindestens 5 News für sinnvolle Korrelation
         if len(news_items) < 5:
             return {"error": f"Zu wenige News für '{symbol}' gefunden ({len(news_items)} Artikel). Versuchen Sie einen längeren Zeitraum."}
         
-        # === SCHRITT 2: DataFrame erstellen ===
-        news_df = pd.DataFrame(news_items)
-        news_df["date_parsed"] = pd.to_datetime(news_df["date"], format="%d.%m.%Y", errors="coerce")
-        
-        # === SCHRITT 3: Täglicher Sentiment-Durchschnitt ===
-        sentiment_daily = news_df.groupby(news_df["date_parsed"].dt.date)["score"].mean().reset_index()
-        sentiment_daily.columns = ["date", "sentiment"]  # Spalten umbenennen
-        sentiment_daily["date"] = pd.to_datetime(sentiment_daily["date"])
+        # === SCHRITT 2+3: Täglicher Sentiment-Durchschnitt ===
+        sentiment_daily, _ = daily_sentiment(news_items)  # Series: Tag -> Durchschnitt (aufsteigend)
         
-        # === SCHRITT 4: Kursdaten abrufen ===
-        stock = yf.Ticker(symbol)
-        hist = stock.history(period=period or "3mo")
+        # === SCHRITT 4: Kursdaten (wurden parallel zu den News geladen) ===
+        hist = hist_future.result()
         
         if hist.empty:
             return {"error": f"Keine Kursdaten für '{symbol}' verfügbar."}
@@ -1189,33 +1771,48 @@ def analyze_correlation(symbol: str, period: str = "3mo", news_limit: int = 500)
         # Zeitzone entfernen für Merge
         price_df["date"] = pd.to_datetime(price_df["date"]).dt.tz_localize(None)
         
-        # === SCHRITT 5: Daten zusammenführen (Merge) ===
-        # pd.merge verbindet die DataFrames basierend auf dem Datum
-        # how="left": Alle Kursdaten behalten, auch wenn kein Sentiment
-        merged_df = pd.merge(price_df, sentiment_daily, on="date", how="left")
+        # === SCHRITT 5: Daten zusammenführen ===
+        # Für jeden Handelstag das Sentiment desselben Tages suchen.
+        # Beide Datumslisten sind sortiert → np.searchsorted findet die
+        # Position per Binärsuche (statt pd.merge mit Zwischen-DataFrames).
+        price_dates = price_df["date"].to_numpy(dtype="datetime64[ns]")
+        sent_dates = sentiment_daily.index.to_numpy(dtype="datetime64[ns]")
+        pos = np.minimum(np.searchsorted(sent_dates, price_dates), len(sent_dates) - 1)
+        rows = np.flatnonzero(sent_dates[pos] == price_dates)  # Handelstage MIT Sentiment
+        
+        # Tage ohne News linear auffüllen (np.interp über die Zeilennummer,
+        # wie pandas interpolate): vor dem ersten Tag mit News 0,
+        # nach dem letzten bleibt dessen Wert stehen
+        if len(rows):
+            sentiment = np.interp(np.arange(len(price_dates)), rows,
+                                  sentiment_daily.to_numpy()[pos[rows]], left=0.0)
+        else:
+            sentiment = np.zeros(len(price_dates))
+        merged_df = price_df.assign(sentiment=sentiment)  # Alle Kursdaten behalten
         
-        # Fehlende Sentiment-Werte interpolieren (linear auffüllen)
-        merged_df["sentiment"] = merged_df["sentiment"].interpolate(method="linear").fillna(0)
+        # Sentiment als float32: Angezeigt werden nur ~3 Nachkommastellen,
+        # die halbe Datenmenge macht Rechnung und Chart-Daten kleiner.
+        # Der Kurs bleibt float64 - bei teuren Aktien (z.B. BRK-A, ~700.000 USD)
+        # wäre float32 nicht mehr centgenau (Abstand 0.0625)
+        merged_df["sentiment"] = merged_df["sentiment"].astype(np.float32)
         
         # === SCHRITT 6: Korrelation berechnen ===
-        # .corr() berechnet den Pearson-Korrelationskoeffizienten
-        correlation = merged_df["price"].corr(merged_df["sentiment"])
-        if pd.isna(correlation):  # Falls nicht berechenbar
-            correlation = 0.0
+        # Pearson-Korrelationskoeffizient direkt mit NumPy (siehe pearson())
+        correlation = pearson(merged_df["price"].to_numpy(), merged_df["sentiment"].to_numpy())
         
         # === SCHRITT 7: Glättung mit Rolling Average ===
         # 7-Tage-Durchschnitt für glättere Darstellung
-        # min_periods=1: Auch bei weniger als 7 Tagen berechnen
-        merged_df["sentiment_ma"] = merged_df["sentiment"].rolling(window=7, min_periods=1).mean()
+        # Auch bei weniger als 7 Tagen berechnen (siehe rolling_mean())
+        merged_df["sentiment_ma"] = rolling_mean(merged_df["sentiment"].to_numpy(), 7).astype(np.float32)
         
         # === SCHRITT 8: Chart erstellen ===
         fig = create_correlation_chart(symbol, merged_df)
         
         # === SCHRITT 9: Statistiken berechnen ===
-        start_price = merged_df["price"].iloc[0]
-        end_price = merged_df["price"].iloc[-1]
+        start_price = float(merged_df["price"].iloc[0])
+        end_price = float(merged_df["price"].iloc[-1])
         pct_change = ((end_price - start_price) / start_price) * 100
-        avg_sentiment = merged_df["sentiment"].mean()
+        avg_sentiment = float(merged_df["sentiment"].mean())
         
         # === SCHRITT 10: Ergebnis zurückgeben ===
         return {
@@ -1319,6 +1916,168 @@ def get_correlation_label(correlation: float) -> tuple:
 # ================================================================================
 
 
+# Suchraum für die ARIMA-Parameter (p: AR-Terme, q: MA-Terme)
+ARIMA_P_RANGE = (1, 3)
+ARIMA_Q_RANGE = (1, 2)
+
+
+def _fit_arima(series, order):
+    """
+    Passt ein einzelnes ARIMA-Modell an.
+    
+    Trend-Parameter:
+    - Bei d>0: 't' (linear) erlaubt, 'c' (konstant) nicht
+    - Bei d=0: 'c' (konstant) erlaubt
+    
+    Returns:
+        Angepasstes Modell oder None, falls die Kombination nicht funktioniert
+    """
+    trend_param = 't' if order[1] > 0 else 'c'
+    try:
+        return ARIMA(series, order=order, trend=trend_param).fit()
+    except Exception:
+        # Manche Kombinationen funktionieren nicht → ignorieren
+        return None
+
+
+def stepwise_arima(series, d: int):
+    """
+    Sucht die besten ARIMA-Parameter schrittweise (Hyndman-Khandakar-Prinzip).
+    
+    Statt jede (p, q)-Kombination anzupassen (Grid-Search), startet die
+    Suche bei (1, d, 1) und probiert nur die Nachbarn (p±1, q±1) aus.
+    Ist ein Nachbar besser (niedrigerer AIC = Akaike Information Criterion),
+    geht die Suche dort weiter - sonst ist das aktuelle Modell das beste.
+    Jede Kombination wird höchstens einmal angepasst.
+    
+    Args:
+        series: Zeitreihe (Schlusskurse)
+        d: Differenzierungsgrad (aus dem ADF-Test)
+    
+    Returns:
+        tuple: (best_order, best_model) - best_model ist None, wenn kein Modell passte
+    """
+    fitted = {}  # (p, q) -> Modell (oder None)
+    
+    def aic_of(pq):
+        if pq not in fitted:
+            fitted[pq] = _fit_arima(series, (pq[0], d, pq[1]))
+        model = fitted[pq]
+        return model.aic if model is not None else float('inf')
+    
+    current = (ARIMA_P_RANGE[0], ARIMA_Q_RANGE[0])
+    current_aic = aic_of(current)
+    
+    while True:
+        p, q = current
+        neighbours = [
+            (np_, nq) for np_, nq in [(p + 1, q), (p - 1, q), (p, q + 1), (p, q - 1), (p + 1, q + 1), (p - 1, q - 1)]
+            if ARIMA_P_RANGE[0] <= np_ <= ARIMA_P_RANGE[1] and ARIMA_Q_RANGE[0] <= nq <= ARIMA_Q_RANGE[1]
+            and (np_, nq) not in fitted
+        ]
+        if not neighbours:
+            break
+        
+        # Nachbarn nacheinander anpassen: Der Optimierer von statsmodels ruft
+        # für jede Auswertung Python-Code auf (hält den GIL) - Threads brächten
+        # bei den wenigen Nachbarn pro Schritt nur Verwaltungsaufwand
+        best_neighbour = min(neighbours, key=aic_of)
+        best_neighbour_aic = aic_of(best_neighbour)
+        if best_neighbour_aic >= current_aic:
+            break  # Kein Nachbar ist besser → fertig
+        current, current_aic = best_neighbour, best_neighbour_aic
+    
+    best_model = fitted.get(current)
+    return (current[0], d, current[1]), best_model
+
+
+# --- Cache für angepasste ARIMA-Modelle ---
+# Das Anpassen (fit) ist der teuerste Teil der Prognose. Für dieselben
+# Kursdaten kommt immer dasselbe Modell heraus - nur .forecast(n) hängt
+# vom Prognose-Horizont ab. Deshalb wird das fertige Modell gespeichert.
+#
+# Mit diskcache liegt der Cache auf der Festplatte (überlebt Neustarts und ist
+# auch in den Prozessen der Hintergrund-Callbacks verfügbar), sonst im Speicher.
+ARIMA_CACHE_SECONDS = 24 * 60 * 60  # 24 Stunden
+ARIMA_CACHE_MAXSIZE = 64            # Nur für den Speicher-Cache
+
+try:
+    import diskcache
+    _ARIMA_CACHE = diskcache.Cache(str(Path(__file__).parent / ".cache" / "arima"))
+except ImportError:
+    _ARIMA_CACHE = None
+_ARIMA_MEMORY_CACHE = {}  # schlüssel -> (zeitstempel, ergebnis)
+
+
+def fit_arima_cached(symbol: str, history_period: str, series):
+    """
+    Passt das beste ARIMA-Modell an - mit Cache.
+    
+    Schlüssel: Symbol, Zeitraum und ein Hash (MD5) der Kursdaten.
+    Kommen neue Kurse dazu, ändert sich der Hash → neues Modell.
+    
+    Args:
+        symbol: Aktiensymbol
+        history_period: Zeitraum der Trainingsdaten
+        series: Schlusskurse als NumPy-Array
+    
+    Returns:
+        tuple: (best_order, best_model, best_aic)
+    """
+    data_hash = hashlib.md5(np.ascontiguousarray(series, dtype=np.float64).tobytes()).hexdigest()
+    key = f"{symbol}|{history_period}|{data_hash}"
+    
+    # Im Cache nachsehen
+    if _ARIMA_CACHE is not None:
+        try:
+            cached = _ARIMA_CACHE.get(key)
+        except Exception:
+            cached = None
+    else:
+        entry = _ARIMA_MEMORY_CACHE.get(key)
+        cached = entry[1] if entry and time.monotonic() - entry[0] < ARIMA_CACHE_SECONDS else None
+    if cached is not None:
+        return cached
+    
+    # Stationarität prüfen mit Augmented Dickey-Fuller Test
+    # p-value > 0.05 → Daten sind NICHT stationär → d=1
+    d = 0  # Differenzierungsgrad
+    try:
+        adf_result = adfuller(series, autolag='AIC')
+        if adf_result[1] > 0.05:  # p-value
+            d = 1  # Einmal differenzieren
+    except:
+        d = 1  # Im Zweifel differenzieren
+    
+    # Schrittweise Suche nach den besten ARIMA-Parametern
+    # (statt alle (p, d, q) Kombinationen durchzuprobieren)
+    best_order, best_model = stepwise_arima(series, d)
+    best_aic = best_model.aic if best_model is not None else float('inf')
+    
+    # Fallback falls keine Kombination funktioniert hat
+    if best_model is None:
+        model = ARIMA(series, order=(1, 1, 1))
+        best_model = model.fit()
+        best_order = (1, 1, 1)
+    
+    result = (best_order, best_model, best_aic)
+    
+    # Im Cache ablegen
+    if _ARIMA_CACHE is not None:
+        try:
+            _ARIMA_CACHE.set(key, result, expire=ARIMA_CACHE_SECONDS)
+        except Exception:
+            pass  # Cache ist nur eine Beschleunigung - Fehler ignorieren
+    else:
+        if len(_ARIMA_MEMORY_CACHE) >= ARIMA_CACHE_MAXSIZE:
+            # Ältesten Eintrag entfernen
+            oldest = min(_ARIMA_MEMORY_CACHE, key=lambda k: _ARIMA_MEMORY_CACHE[k][0])
+            del _ARIMA_MEMORY_CACHE[oldest]
+        _ARIMA_MEMORY_CACHE[key] = (time.monotonic(), result)
+    return result
+
+
+@cache_analysis
 def analyze_forecast(symbol: str, history_period: str = "1y", forecast_days: int = 30) -> dict:
     """
     Führt eine ARIMA-basierte Kursprognose mit Trend-Korrektur durch.
@@ -1401,51 +2160,10 @@ def analyze_forecast(symbol: str, history_period: str = "1y", forecast_days: int
         # SCHRITT 4: ARIMA-Modell anpassen
         # =================================================================
         
-        # Stationarität prüfen mit Augmented Dickey-Fuller Test
-        # p-value > 0.05 → Daten sind NICHT stationär → d=1
-        d = 0  # Differenzierungsgrad
-        try:
-            adf_result = adfuller(series, autolag='AIC')
-            if adf_result[1] > 0.05:  # p-value
-                d = 1  # Einmal differenzieren
-        except:
-            d = 1  # Im Zweifel differenzieren
-        
-        # ARIMA-Modell mit Trend (trend='t' für linearen Trend bei d>0)
-        # Grid-Search für beste ARIMA-Parameter
-        # Wir probieren verschiedene (p, d, q) Kombinationen
-        # und wählen die mit dem niedrigsten AIC (Akaike Information Criterion)
-        best_aic = float('inf')  # Unendlich als Startwert
-        best_order = (1, d, 1)   # Fallback-Parameter
-        best_model = None
-        
-        # Verschiedene ARIMA-Parameter testen (p: 1-3, q: 1-2)
-        for p in [1, 2, 3]:  # AR-Terme
-            for q in [1, 2]:  # MA-Terme
-                try:
-                    # Trend-Parameter wählen:
-                    # - Bei d>0: 't' (linear) erlaubt, 'c' (konstant) nicht
-                    # - Bei d=0: 'c' (konstant) erlaubt
-                    trend_param = 't' if d > 0 else 'c'
-                    
-                    # Modell erstellen und anpassen
-                    model = ARIMA(series, order=(p, d, q), trend=trend_param)
-                    fitted = model.fit()
-                    
-                    # Ist dieses Modell besser? (niedrigerer AIC = besser)
-                    if fitted.aic < best_aic:
-                        best_aic = fitted.aic
-                        best_order = (p, d, q)
-                        best_model = fitted
-                except:
-                    # Manche Kombinationen funktionieren nicht → ignorieren
-                    continue
-        
-        # Fallback falls keine Kombination funktioniert hat
-        if best_model is None:
-            model = ARIMA(series, order=(1, 1, 1))
-            best_model = model.fit()
-            best_order = (1, 1, 1)
+        # Bestes Modell suchen - oder aus dem Modell-Cache holen, wenn für
+        # genau diese Kursdaten schon eines angepasst wurde (z.B. nur der
+        # Prognose-Horizont wurde geändert)
+        best_order, best_model, best_aic = fit_arima_cached(symbol, history_period, series)
         
         # =================================================================
         # SCHRITT 5: Prognose erstellen (mit Trend-Korrektur)
@@ -1754,6 +2472,142 @@ def get_forecast_label(change: float) -> tuple:
 # ================================================================================
 
 
+if NUMBA_AVAILABLE:
+    # cache=True: Der kompilierte Code wird auf der Festplatte gespeichert,
+    # die Kompilierzeit fällt also nur beim allerersten Start an
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _simulate_gbm_numba(current_price, drift, vol, forecast_days, num_simulations):
+        """
+        Numba-Kernel: Berechnet alle GBM-Pfade parallel auf allen CPU-Kernen.
+        
+        Jeder Pfad wird Tag für Tag in einem Durchlauf berechnet - ohne große
+        Zwischen-Arrays für Zufallszahlen und Log-Renditen. Die Zähler für
+        die Wahrscheinlichkeiten laufen direkt in der Schleife mit.
+        
+        Jeder Pfad bekommt einen festen Seed (42 + Pfadnummer) - die Ergebnisse
+        sind also bei jedem Lauf gleich, egal welcher Kern welchen Pfad rechnet.
+        """
+        simulations = np.empty((num_simulations, forecast_days + 1))
+        n_positive = 0
+        n_up_10 = 0
+        n_down_10 = 0
+        for i in prange(num_simulations):
+            # Seed gilt in Numba pro Thread - deshalb pro Pfad neu setzen
+            np.random.seed(42 + i)
+            price = current_price
+            simulations[i, 0] = price
+            for t in range(1, forecast_days + 1):
+                price *= np.exp(drift + vol * np.random.standard_normal())
+                simulations[i, t] = price
+            # Reduktion: Numba summiert die Zähler aller Kerne korrekt auf
+            if price > current_price:
+                n_positive += 1
+            if price > current_price * 1.10:
+                n_up_10 += 1
+            if price < current_price * 0.90:
+                n_down_10 += 1
+        return simulations, n_positive, n_up_10, n_down_10
+
+
+# Ab so vielen Pfaden lohnt sich die GPU (darunter überwiegt der Kopieraufwand)
+GPU_MIN_SIMULATIONS = 10000
+
+
+def _simulate_gbm_gpu(current_price, drift, vol, forecast_days, num_simulations):
+    """
+    GPU-Variante: Zufallszahlen, cumsum und exp laufen komplett auf der Grafikkarte.
+    
+    Nur das Ergebnis wird am Ende einmal in den Arbeitsspeicher kopiert
+    (cp.asnumpy), weil der Chart die Pfade als NumPy-Array braucht.
+    """
+    rng = cp.random.default_rng(42)
+    log_returns = drift + vol * rng.standard_normal((num_simulations, forecast_days))
+    
+    simulations = cp.empty((num_simulations, forecast_days + 1))
+    simulations[:, 0] = current_price
+    simulations[:, 1:] = current_price * cp.exp(cp.cumsum(log_returns, axis=1))
+    
+    # Zähler ebenfalls auf der GPU berechnen - nur drei Zahlen werden kopiert
+    final_prices = simulations[:, -1]
+    n_positive = int(cp.count_nonzero(final_prices > current_price))
+    n_up_10 = int(cp.count_nonzero(final_prices > current_price * 1.10))
+    n_down_10 = int(cp.count_nonzero(final_prices < current_price * 0.90))
+    return cp.asnumpy(simulations), n_positive, n_up_10, n_down_10
+
+
+def simulate_gbm(current_price: float, mu: float, sigma: float, forecast_days: int,
+                 num_simulations: int, dt: float = 1.0):
+    """
+    Simuliert Kursverläufe mit Geometric Brownian Motion (GBM).
+    
+    Reihenfolge der Rechenwege:
+    1. GPU (CuPy) - bei sehr vielen Pfaden und vorhandener Grafikkarte
+    2. Numba - kompiliert und parallel auf allen CPU-Kernen
+    3. NumPy - vektorisiert
+    Alle Rechenwege nutzen feste Seeds, die Ergebnisse sind also reproduzierbar.
+    
+    Args:
+        current_price: Startkurs aller Pfade
+        mu: Tägliche Drift (Durchschnitt der Log-Renditen)
+        sigma: Tägliche Volatilität (Standardabweichung der Log-Renditen)
+        forecast_days: Anzahl simulierter Tage
+        num_simulations: Anzahl der Pfade
+        dt: Zeitschritt (1 = ein Tag)
+    
+    Returns:
+        tuple: (simulations, n_positive, n_up_10, n_down_10)
+               - simulations: Array (Pfade x Tage+1), Spalte 0 = Startkurs
+               - n_*: Anzahl Pfade, die über dem Start / >10% darüber / >10% darunter enden
+    """
+    # GBM Formel in Log-Form:
+    # ln(S(t)/S(t-1)) = (μ - 0.5*σ²)*dt + σ*√dt*Z
+    #
+    # - (μ - 0.5*σ²): "Drift-Korrektur" - verhindert systematische Überschätzung
+    # - σ*√dt*Z: Zufallskomponente, skaliert mit Volatilität
+    drift = (mu - 0.5 * sigma**2) * dt
+    vol = sigma * np.sqrt(dt)
+    
+    if CUPY_AVAILABLE and num_simulations >= GPU_MIN_SIMULATIONS:
+        try:
+            return _simulate_gbm_gpu(float(current_price), float(drift), float(vol),
+                                     int(forecast_days), int(num_simulations))
+        except Exception as e:
+            # Z.B. zu wenig Grafikspeicher -> auf der CPU weiterrechnen
+            print(f"[Monte-Carlo] GPU-Berechnung fehlgeschlagen ({e}), nutze CPU")
+    
+    if NUMBA_AVAILABLE:
+        return _simulate_gbm_numba(float(current_price), float(drift), float(vol),
+                                   int(forecast_days), int(num_simulations))
+    
+    # Zufallsgenerator initialisieren (fester Seed = reproduzierbare Ergebnisse)
+    # PCG64DXSM ist ein schneller, moderner Bit-Generator (empfohlen für
+    # große Simulationen, liefert unabhängige Ströme für parallele Worker)
+    rng = np.random.Generator(np.random.PCG64DXSM(42))
+    
+    # ALLE Zufallszahlen auf einmal ziehen statt Tag für Tag in einer Schleife
+    # Shape: (Anzahl Simulationen, Anzahl Tage) - eine Zahl aus N(0,1) pro Pfad und Tag
+    # Zufallszahlen als float32 (halber Speicher), gerechnet wird aber in float64 -
+    # wie bei Numba und GPU, sonst hinge die Rundung vom Rechenweg ab
+    normals = rng.standard_normal((num_simulations, forecast_days), dtype=np.float32)
+    
+    # cumsum summiert die Log-Renditen je Pfad auf -> exp ergibt den Kursverlauf
+    # S(t) = S(0) * exp(Summe der Log-Renditen bis t)
+    # Summe der Log-Renditen bis t = drift * t + vol * (Summe der Z bis t)
+    # Shape: (Anzahl Simulationen, Anzahl Tage + 1), Spalte 0 = aktueller Kurs
+    steps = np.arange(1, forecast_days + 1)
+    log_paths = drift * steps + vol * np.cumsum(normals, axis=1, dtype=np.float64)
+    simulations = np.empty((num_simulations, forecast_days + 1))
+    simulations[:, 0] = current_price
+    simulations[:, 1:] = current_price * np.exp(log_paths)
+    
+    final_prices = simulations[:, -1]
+    n_positive = int(np.count_nonzero(final_prices > current_price))
+    n_up_10 = int(np.count_nonzero(final_prices > current_price * 1.10))
+    n_down_10 = int(np.count_nonzero(final_prices < current_price * 0.90))
+    return simulations, n_positive, n_up_10, n_down_10
+
+
+@cache_analysis
 def analyze_monte_carlo(symbol: str, history_period: str = "1y", forecast_days: int = 30, num_simulations: int = 1000) -> dict:
     """
     Führt eine Monte-Carlo-Simulation für Kursprognosen durch.
@@ -1822,59 +2676,37 @@ def analyze_monte_carlo(symbol: str, history_period: str = "1y", forecast_days:
         # === SCHRITT 4: Monte-Carlo Simulation durchführen ===
         dt = 1  # Zeitschritt = 1 Tag
         
-        # Zufallsgenerator initialisieren (für reproduzierbare Ergebnisse)
-        np.random.seed(42)
-        
-        # Array für alle Simulationspfade erstellen
-        # Shape: (Anzahl Simulationen, Anzahl Tage + 1)
-        simulations = np.zeros((num_simulations, forecast_days + 1))
-        
-        # Alle Simulationen starten beim aktuellen Kurs
-        simulations[:, 0] = current_price
-        
-        # Für jeden Tag...
-        for t in range(1, forecast_days + 1):
-            # Zufallszahlen aus Normalverteilung N(0,1) ziehen
-            # Eine Zufallszahl pro Simulation
-            random_returns = np.random.normal(0, 1, num_simulations)
-            
-            # GBM Formel anwenden:
-            # S(t) = S(t-1) * exp((μ - 0.5*σ²)*dt + σ*√dt*Z)
-            #
-            # - (μ - 0.5*σ²): "Drift-Korrektur" - verhindert systematische Überschätzung
-            # - σ*√dt*Z: Zufallskomponente, skaliert mit Volatilität
-            simulations[:, t] = simulations[:, t-1] * np.exp(
-                (mu - 0.5 * sigma**2) * dt + sigma * np.sqrt(dt) * random_returns
-            )
+        # Alle Pfade auf einmal simulieren (Numba parallel oder NumPy vektorisiert)
+        # Shape: (Anzahl Simulationen, Anzahl Tage + 1), Spalte 0 = aktueller Kurs
+        simulations, n_positive, n_up_10, n_down_10 = simulate_gbm(
+            current_price, mu, sigma, forecast_days, num_simulations, dt
+        )
         
         # === SCHRITT 5: Statistiken aus den Simulationen berechnen ===
         # Endpreise aller Simulationen (letzter Tag)
         final_prices = simulations[:, -1]
         
         # Perzentile: "X% der Simulationen enden unter diesem Preis"
-        percentiles = {
-            "p5": np.percentile(final_prices, 5),    # 5% = Worst Case (fast)
-            "p10": np.percentile(final_prices, 10),
-            "p25": np.percentile(final_prices, 25),   # Unteres Quartil
-            "p50": np.percentile(final_prices, 50),   # Median = "typisches" Ergebnis
-            "p75": np.percentile(final_prices, 75),   # Oberes Quartil
-            "p90": np.percentile(final_prices, 90),
-            "p95": np.percentile(final_prices, 95),   # 95% = Best Case (fast)
-        }
+        # Alle Perzentile in EINEM Aufruf (die Daten werden nur einmal sortiert)
+        # - p5 = Worst Case (fast), p25 = Unteres Quartil, p50 = Median,
+        #   p75 = Oberes Quartil, p95 = Best Case (fast)
+        percentile_levels = [5, 10, 25, 50, 75, 90, 95]
+        percentile_values = np.percentile(final_prices, percentile_levels)
+        percentiles = {f"p{q}": v for q, v in zip(percentile_levels, percentile_values)}
         
         # Durchschnitt und Standardabweichung
         mean_price = np.mean(final_prices)
         std_price = np.std(final_prices)
         
-        # Wahrscheinlichkeiten berechnen
+        # Wahrscheinlichkeiten berechnen (Zähler kommen direkt aus der Simulation)
         # "In wie vielen Simulationen ist der Kurs gestiegen?"
-        prob_positive = np.sum(final_prices > current_price) / num_simulations * 100
+        prob_positive = n_positive / num_simulations * 100
         
         # "In wie vielen Simulationen ist der Kurs >10% gestiegen?"
-        prob_up_10 = np.sum(final_prices > current_price * 1.10) / num_simulations * 100
+        prob_up_10 = n_up_10 / num_simulations * 100
         
         # "In wie vielen Simulationen ist der Kurs >10% gefallen?"
-        prob_down_10 = np.sum(final_prices < current_price * 0.90) / num_simulations * 100
+        prob_down_10 = n_down_10 / num_simulations * 100
         
         # === SCHRITT 6: Prognose-Daten erstellen ===
         # Nur Werktage für die X-Achse
@@ -1953,23 +2785,31 @@ def create_monte_carlo_chart(symbol: str, hist_df, forecast_dates, simulations,
     )
     
     # Einige Simulationspfade anzeigen (max. 100 für Performance)
+    # Zufällige Auswahl statt der ersten 100 → repräsentativer Fächer
+    # Alle Pfade in EINER Linie (getrennt durch Lücken) statt 100 einzelner
+    # Traces - der Browser muss so nur ein Objekt zeichnen.
+    # Eine einzelne Linie addiert ihre Transparenz an Überlappungen nicht auf
+    # (anders als 100 Traces) - deshalb deutlich kräftiger als früher 0.05
     num_display = min(100, simulations.shape[0])
-    for i in range(num_display):
-        fig.add_trace(
-            go.Scatter(
-                x=forecast_dates,
-                y=simulations[i, :],
-                mode="lines",
-                line=dict(color="rgba(100, 100, 100, 0.05)", width=0.5),
-                showlegend=False,
-                hoverinfo="skip"
-            )
+    pick = np.random.default_rng(0).choice(simulations.shape[0], num_display, replace=False)
+    sample_paths = np.hstack([simulations[pick], np.full((num_display, 1), np.nan)])
+    fig.add_trace(
+        go.Scatter(
+            x=(list(forecast_dates) + [None]) * num_display,
+            y=sample_paths.ravel(),
+            mode="lines",
+            line=dict(color="rgba(100, 100, 100, 0.25)", width=0.5),
+            showlegend=False,
+            hoverinfo="skip"
         )
+    )
     
-    # Perzentil-Bänder (90% Konfidenzintervall)
-    p5_values = np.percentile(simulations, 5, axis=0)
-    p95_values = np.percentile(simulations, 95, axis=0)
+    # Alle Perzentile pro Tag in EINEM Aufruf (statt einzeln)
+    p5_values, p25_values, median_values, p75_values, p95_values = np.percentile(
+        simulations, [5, 25, 50, 75, 95], axis=0
+    )
     
+    # Perzentil-Bänder (90% Konfidenzintervall)
     fig.add_trace(
         go.Scatter(
             x=list(forecast_dates) + list(reversed(forecast_dates)),
@@ -1983,9 +2823,6 @@ def create_monte_carlo_chart(symbol: str, hist_df, forecast_dates, simulations,
     )
     
     # Perzentil-Bänder (50% Konfidenzintervall)
-    p25_values = np.percentile(simulations, 25, axis=0)
-    p75_values = np.percentile(simulations, 75, axis=0)
-    
     fig.add_trace(
         go.Scatter(
             x=list(forecast_dates) + list(reversed(forecast_dates)),
@@ -1999,7 +2836,6 @@ def create_monte_carlo_chart(symbol: str, hist_df, forecast_dates, simulations,
     )
     
     # Median-Linie
-    median_values = np.percentile(simulations, 50, axis=0)
     color_forecast = "#3b82f6"  # Blau für Prognose
     
     fig.add_trace(